@@ -0,0 +1,295 @@
+"""
+Session log analytics for 'The Line: A Border Journey'
+
+This module streams over the JSONL logs written by telemetry.py and
+aggregates them in constant memory:
+
+- ending funnel per role (sessions started, and how they ended)
+- deaths per location, relative to arrivals and turns spent there
+- MoralEvent choice distributions
+- AI command hit rate (turns resolved by embeddings / turns that tried)
+- latency percentiles per command intent
+- journey_stats totals per role
+
+Each log file is aggregated on its own, optionally in a process pool,
+and the per-file aggregates are merged at the end.
+
+Usage:
+    python analytics.py logs/ [more paths or globs] [--workers N] [--json]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from sketches import QuantileSketch
+from telemetry import JOURNEY_STAT_KEYS
+
+
+def _bump(counter, key, amount=1):
+    counter[key] = counter.get(key, 0) + amount
+
+
+def _merge_counts(target, source):
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _merge_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+class LogAggregate:
+    """Mergeable aggregate of session log records."""
+
+    def __init__(self):
+        """Initialize empty counters and sketches."""
+        self.records = 0
+        self.bad_lines = 0
+        self.started = {}         # role -> sessions started
+        self.endings = {}         # role -> {ending: sessions}
+        self.journey = {}         # role -> {journey stat: total}
+        self.arrivals = {}        # location -> arrivals
+        self.turns_at = {}        # location -> turns spent there
+        self.deaths = {}          # location -> deaths
+        self.choices = {}         # event -> {choice text: count}
+        self.ai_attempts = 0
+        self.ai_hits = 0
+        self.ai_hits_by_intent = {}  # intent -> hits
+        self.latency = {}         # intent -> QuantileSketch of command_ms
+        self.ai_latency = QuantileSketch()
+
+    def add(self, record):
+        """Fold one log record into the aggregate."""
+        self.records += 1
+        kind = record.get("type")
+        if kind == "turn":
+            self._add_turn(record)
+        elif kind == "session_start":
+            _bump(self.started, record.get("role") or "unknown")
+        elif kind == "session_end":
+            self._add_session_end(record)
+
+    def _add_turn(self, record):
+        location = record.get("location")
+        location_after = record.get("location_after")
+        if location:
+            _bump(self.turns_at, location)
+        if location_after and location_after != location:
+            _bump(self.arrivals, location_after)
+
+        choice = record.get("choice")
+        if choice:
+            _bump(self.choices.setdefault(choice.get("event"), {}), choice.get("text"))
+
+        if record.get("ai_command") is not None or record.get("score") is not None:
+            self.ai_attempts += 1
+            if record.get("source") == "ai":
+                self.ai_hits += 1
+                _bump(self.ai_hits_by_intent, record.get("intent") or "unknown")
+
+        timings = record.get("timings") or {}
+        intent = record.get("intent") or "unknown"
+        if "command_ms" in timings:
+            sketch = self.latency.get(intent)
+            if sketch is None:
+                sketch = self.latency[intent] = QuantileSketch()
+            sketch.add(timings["command_ms"])
+        if "ai_ms" in timings:
+            self.ai_latency.add(timings["ai_ms"])
+
+    def _add_session_end(self, record):
+        role = record.get("role") or "unknown"
+        ending = record.get("ending") or "unknown"
+        _bump(self.endings.setdefault(role, {}), ending)
+        if ending == "death" and record.get("location"):
+            _bump(self.deaths, record["location"])
+        stats = record.get("journey_stats") or {}
+        totals = self.journey.setdefault(role, {})
+        for key in JOURNEY_STAT_KEYS:
+            _bump(totals, key, stats.get(key, 0))
+
+    def merge(self, other):
+        """Add another aggregate into this one."""
+        self.records += other.records
+        self.bad_lines += other.bad_lines
+        for name in ("started", "endings", "journey", "arrivals", "turns_at",
+                     "deaths", "choices", "ai_hits_by_intent"):
+            _merge_counts(getattr(self, name), getattr(other, name))
+        self.ai_attempts += other.ai_attempts
+        self.ai_hits += other.ai_hits
+        for intent, sketch in other.latency.items():
+            if intent in self.latency:
+                self.latency[intent].merge(sketch)
+            else:
+                self.latency[intent] = sketch
+        self.ai_latency.merge(other.ai_latency)
+        return self
+
+    def report(self):
+        """Return the aggregate as a JSON-serializable dict."""
+        funnel = {}
+        for role in sorted(set(self.started) | set(self.endings)):
+            started = self.started.get(role, 0)
+            endings = self.endings.get(role, {})
+            ended = sum(endings.values())
+            funnel[role] = {
+                "started": started,
+                "ended": ended,
+                "unfinished": max(0, started - ended),
+                "endings": {ending: {"sessions": count, "share": count / ended if ended else 0.0}
+                            for ending, count in sorted(endings.items())},
+                "journey_stats_mean": {key: total / ended if ended else 0.0
+                                       for key, total in self.journey.get(role, {}).items()},
+            }
+
+        locations = {}
+        for location in sorted(set(self.turns_at) | set(self.arrivals) | set(self.deaths)):
+            deaths = self.deaths.get(location, 0)
+            arrivals = self.arrivals.get(location, 0)
+            turns = self.turns_at.get(location, 0)
+            locations[location] = {
+                "deaths": deaths,
+                "arrivals": arrivals,
+                "turns": turns,
+                "deaths_per_arrival": deaths / arrivals if arrivals else None,
+                "deaths_per_100_turns": 100 * deaths / turns if turns else None,
+            }
+
+        choices = {}
+        for event, counts in self.choices.items():
+            total = sum(counts.values())
+            choices[event] = {text: {"count": count, "share": count / total}
+                              for text, count in sorted(counts.items(), key=lambda item: -item[1])}
+
+        return {
+            "records": self.records,
+            "bad_lines": self.bad_lines,
+            "funnel": funnel,
+            "locations": locations,
+            "moral_choices": choices,
+            "ai": {
+                "attempts": self.ai_attempts,
+                "hits": self.ai_hits,
+                "hit_rate": self.ai_hits / self.ai_attempts if self.ai_attempts else None,
+                "hits_by_intent": dict(sorted(self.ai_hits_by_intent.items())),
+                "latency_ms": self.ai_latency.summary(),
+            },
+            "command_latency_ms": {intent: sketch.summary()
+                                   for intent, sketch in sorted(self.latency.items())},
+        }
+
+
+def open_log(path):
+    """Open a (possibly gzipped) log file for reading text."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def aggregate_file(path):
+    """Stream one log file into a fresh aggregate."""
+    aggregate = LogAggregate()
+    with open_log(path) as log_file:
+        for line in log_file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                aggregate.bad_lines += 1
+                continue
+            aggregate.add(record)
+    return aggregate
+
+
+def find_logs(paths):
+    """Expand files, directories and glob patterns into log file paths."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if ".jsonl" in name:
+                    found.append(os.path.join(path, name))
+        else:
+            found.extend(sorted(glob.glob(path)) or [path])
+    return found
+
+
+def analyze(paths, workers=1):
+    """Aggregate every log file, sharding files across worker processes."""
+    files = find_logs(paths)
+    total = LogAggregate()
+    if workers > 1 and len(files) > 1:
+        with Pool(min(workers, len(files))) as pool:
+            for aggregate in pool.imap_unordered(aggregate_file, files):
+                total.merge(aggregate)
+    else:
+        for path in files:
+            total.merge(aggregate_file(path))
+    return total
+
+
+def format_report(report):
+    """Return a human-readable version of a report."""
+    lines = [f"Records: {report['records']} (unreadable lines: {report['bad_lines']})", ""]
+
+    lines.append("ENDING FUNNEL")
+    for role, funnel in report["funnel"].items():
+        lines.append(f"  {role}: {funnel['started']} started, {funnel['ended']} ended, "
+                     f"{funnel['unfinished']} unfinished")
+        for ending, counts in funnel["endings"].items():
+            lines.append(f"    {ending:<10} {counts['sessions']:>8} ({counts['share']:.1%})")
+        for key, mean in funnel["journey_stats_mean"].items():
+            lines.append(f"    mean {key}: {mean:.2f}")
+
+    lines.append("")
+    lines.append("LOCATIONS")
+    for location, stats in report["locations"].items():
+        rate = stats["deaths_per_arrival"]
+        rate_text = f"{rate:.1%}" if rate is not None else "n/a"
+        lines.append(f"  {location:<20} deaths {stats['deaths']:>6}  arrivals {stats['arrivals']:>6}  "
+                     f"death rate {rate_text}")
+
+    lines.append("")
+    lines.append("MORAL CHOICES")
+    for event, choices in report["moral_choices"].items():
+        lines.append(f"  {event}")
+        for text, counts in choices.items():
+            lines.append(f"    {counts['share']:>6.1%}  {text}")
+
+    ai = report["ai"]
+    lines.append("")
+    hit_rate = f"{ai['hit_rate']:.1%}" if ai["hit_rate"] is not None else "n/a"
+    lines.append(f"AI COMMANDS: {ai['hits']}/{ai['attempts']} resolved by embeddings ({hit_rate})")
+
+    lines.append("")
+    lines.append("COMMAND LATENCY (ms)")
+    lines.append(f"  {'intent':<12}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for intent, summary in report["command_latency_ms"].items():
+        lines.append(f"  {intent:<12}{summary['count']:>8}{summary['p50']:>10.3f}"
+                     f"{summary['p95']:>10.3f}{summary['p99']:>10.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate game session logs")
+    parser.add_argument("paths", nargs="+", help="Log files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (one log file per task)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.paths, args.workers).report()
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
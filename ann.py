@@ -0,0 +1,182 @@
+"""
+Approximate nearest-neighbour index for 'The Line: A Border Journey'
+
+This module provides an inverted-file (IVF) index over unit-length
+embedding vectors, built on numpy alone. Vectors are grouped around
+k-means centroids; a query is only compared with the vectors of its
+n_probe nearest groups, so search time stops growing with the whole
+catalog. More probes give better recall at the cost of latency.
+
+Until a catalog is large enough to train on, the index searches it
+exhaustively. Vectors added after training go straight into their
+nearest group, and the index retrains itself once the catalog has
+doubled.
+"""
+
+from lazy_imports import load_numpy
+from vector_store import normalize_rows
+
+
+class _InvertedList:
+    """Keys and vectors assigned to one centroid, in a growable array."""
+
+    def __init__(self, dims):
+        np = load_numpy()
+        self.keys = []
+        self.vectors = np.empty((0, dims), dtype=np.float32)
+
+    def add(self, keys, vectors):
+        np = load_numpy()
+        size = len(self.keys)
+        if size + len(keys) > len(self.vectors):
+            capacity = max(16, size + len(keys), 2 * len(self.vectors))
+            grown = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[:size] = self.vectors[:size]
+            self.vectors = grown
+        self.vectors[size:size + len(keys)] = vectors
+        self.keys.extend(keys)
+
+    @property
+    def matrix(self):
+        return self.vectors[:len(self.keys)]
+
+
+class IVFIndex:
+    """Inverted-file index answering cosine-similarity queries approximately."""
+
+    def __init__(self, n_lists=None, n_probe=8, min_train_size=1024, seed=0):
+        """
+        Initialize an empty index.
+
+        Args:
+            n_lists (int): Number of k-means groups (default: about the
+                square root of the catalog size when training)
+            n_probe (int): Groups searched per query; higher means better
+                recall and slower queries
+            min_train_size (int): Catalog size from which groups are used;
+                smaller catalogs are searched exhaustively
+            seed (int): Seed for k-means initialization
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.seed = seed
+        self.centroids = None
+        self.lists = []
+        self.trained_size = 0
+        self._pending_keys = []     # Vectors added before training
+        self._pending_vectors = []
+
+    def __len__(self):
+        return len(self._pending_keys) + sum(len(inverted.keys) for inverted in self.lists)
+
+    @property
+    def trained(self):
+        return self.centroids is not None
+
+    def add(self, key, vector):
+        """Add one vector to the index."""
+        self.add_many([key], [vector])
+
+    def add_many(self, keys, vectors):
+        """Add several vectors to the index.
+
+        Args:
+            keys (list): Keys returned by search()
+            vectors (list): One vector per key (normalized on insert)
+        """
+        np = load_numpy()
+        if not keys:
+            return
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        if not self.trained:
+            self._pending_keys.extend(keys)
+            self._pending_vectors.append(vectors)
+            if len(self._pending_keys) >= self.min_train_size:
+                self.train()
+            return
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1)
+        for group in np.unique(assignments):
+            rows = np.nonzero(assignments == group)[0]
+            self.lists[group].add([keys[row] for row in rows], vectors[rows])
+        if len(self) >= 2 * self.trained_size:
+            self.train()
+
+    def train(self, iterations=10):
+        """(Re)build the groups with spherical k-means over every stored vector."""
+        np = load_numpy()
+        keys, vectors = self._all()
+        if len(keys) == 0:
+            return
+        n_lists = self.n_lists or max(1, int(len(keys) ** 0.5))
+        n_lists = min(n_lists, len(keys))
+        rng = np.random.default_rng(self.seed)
+
+        # Train on a sample; assigning every vector afterwards is cheap
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), 64 * n_lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            empty = ~sums.any(axis=1)
+            # Restart empty groups from random sample vectors
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        self.lists = [_InvertedList(vectors.shape[1]) for _ in range(n_lists)]
+        self._pending_keys = []
+        self._pending_vectors = []
+        self.trained_size = len(keys)
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        for group in range(n_lists):
+            rows = order[bounds[group]:bounds[group + 1]]
+            self.lists[group].add([keys[row] for row in rows], vectors[rows])
+
+    def search(self, query, k=1, n_probe=None):
+        """Return up to k approximate best (key, score) pairs for a query, best first.
+
+        Args:
+            query (list): Query vector
+            k (int): Number of results
+            n_probe (int): Groups to search (default: the index's n_probe)
+        """
+        np = load_numpy()
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        if not self.trained:
+            if not self._pending_keys:
+                return []
+            keys = self._pending_keys
+            scores = np.concatenate(self._pending_vectors) @ query
+        else:
+            n_probe = min(n_probe or self.n_probe, len(self.lists))
+            nearest = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+            probed = [self.lists[group] for group in nearest if self.lists[group].keys]
+            if not probed:
+                return []
+            keys = [key for inverted in probed for key in inverted.keys]
+            scores = np.concatenate([inverted.matrix @ query for inverted in probed])
+
+        k = min(k, len(keys))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(keys[i], float(scores[i])) for i in top]
+
+    def _all(self):
+        """Return every stored key and vector."""
+        np = load_numpy()
+        keys = list(self._pending_keys)
+        blocks = list(self._pending_vectors)
+        for inverted in self.lists:
+            keys.extend(inverted.keys)
+            blocks.append(inverted.matrix)
+        if not blocks:
+            return keys, np.empty((0, 0), dtype=np.float32)
+        return keys, np.concatenate(blocks)
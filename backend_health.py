@@ -0,0 +1,145 @@
+"""
+Embedding server health for 'The Line: A Border Journey'
+
+This module tracks whether the embedding server is answering, so a
+server that is slow to start, or goes away for a while, costs the game
+its natural language understanding only until it is back.
+
+After a failed request the backend is marked down and requests fail
+fast instead of each waiting for a timeout and printing an error. A
+background thread probes the server with exponential backoff (1 s, 2 s,
+4 s ... up to a minute); when a probe answers, the backend is marked up
+again and the registered recovery callbacks run, e.g. to build the
+embedding catalogs that could not be built earlier. Error messages are
+printed at most once per report interval, with a count of the ones
+that were held back.
+"""
+
+import random
+import threading
+import time
+
+
+class BackendHealth:
+    """Up/down state of the embedding server, with backoff probing and rate-limited error reports."""
+
+    def __init__(self, probe=None, initial_delay=1.0, max_delay=60.0, report_interval=60.0,
+                 output=print, clock=time.monotonic):
+        """
+        Initialize the state as up.
+
+        Args:
+            probe (callable): Sends one request even while the backend is down
+                and returns whether it was answered (default: no recovery thread)
+            initial_delay (float): Seconds before the first probe after a failure
+            max_delay (float): Longest wait between probes
+            report_interval (float): Seconds between printed error messages
+            output (callable): Where messages go
+            clock (callable): Monotonic time source
+        """
+        self.probe = probe
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.report_interval = report_interval
+        self.output = output
+        self.clock = clock
+        self.healthy = True
+        self.failures = 0      # Consecutive failed requests and probes
+        self.retry_at = 0.0    # When the next probe is due
+        self._recovered = []   # Callbacks run once a probe succeeds
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._last_report = None
+        self._suppressed = 0
+
+    def on_recovered(self, callback):
+        """Run callback (in the probing thread) each time the backend comes back up."""
+        self._recovered.append(callback)
+
+    def remove_recovered(self, callback):
+        """Stop running a callback registered with on_recovered()."""
+        if callback in self._recovered:
+            self._recovered.remove(callback)
+
+    def record_success(self):
+        """Note an answered request."""
+        with self._lock:
+            recovered = not self.healthy
+            self.healthy = True
+            self.failures = 0
+            if recovered:
+                self._suppressed = 0
+        if recovered:
+            self.report("Embedding server is answering again.", force=True)
+
+    def record_failure(self, error):
+        """Note a failed request: mark the backend down and schedule a probe.
+
+        Args:
+            error: Exception or message describing the failure
+        """
+        with self._lock:
+            went_down = self.healthy
+            self.healthy = False
+            self.failures += 1
+            delay = min(self.max_delay, self.initial_delay * 2 ** (self.failures - 1))
+            # Jitter keeps many sessions from probing in lockstep
+            self.retry_at = self.clock() + delay * random.uniform(0.8, 1.2)
+            start = self.probe is not None and self._thread is None and not self._stopped.is_set()
+            if start:
+                self._thread = threading.Thread(target=self._recover, name="embeddings-health", daemon=True)
+        # Going down is always reported; repeated failures while down are rate-limited
+        self.report(f"Embedding server unavailable: {error}", force=went_down)
+        if start:
+            self._thread.start()
+
+    def report(self, message, force=False):
+        """Print a message unless one was printed within the report interval (or force is set)."""
+        with self._lock:
+            now = self.clock()
+            if not force and self._last_report is not None and now - self._last_report < self.report_interval:
+                self._suppressed += 1
+                return
+            suppressed, self._suppressed = self._suppressed, 0
+            self._last_report = now
+        if suppressed:
+            message += f" ({suppressed} similar messages suppressed)"
+        self.output(message)
+
+    def stop(self):
+        """Stop probing (the thread exits at its next wake-up)."""
+        self._stopped.set()
+
+    def _recover(self):
+        """Probe with backoff until the backend answers and every recovery callback succeeded."""
+        while True:
+            with self._lock:
+                if self.healthy or self._stopped.is_set():
+                    self._thread = None
+                    return
+                wait = self.retry_at - self.clock()
+            if wait > 0 and self._stopped.wait(wait):
+                continue
+            with self._lock:
+                failures = self.failures
+            error = "no answer"
+            try:
+                answered = self.probe()
+            except Exception as e:
+                answered, error = False, e
+            if not answered:
+                # Push the next probe back unless the failed request already did
+                with self._lock:
+                    pushed_back = self.failures != failures
+                if not pushed_back:
+                    self.record_failure(error)
+                continue
+            # The probe may not have gone through a request that records it
+            self.record_success()
+            for callback in list(self._recovered):
+                try:
+                    callback()
+                except Exception as e:
+                    self.record_failure(e)
+                    break
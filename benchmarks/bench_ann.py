@@ -0,0 +1,94 @@
+"""
+Approximate search benchmark for 'The Line: A Border Journey'
+
+Measures the IVF index from ann.py against exact search on a large
+synthetic catalog: clustered random unit vectors standing in for the
+embeddings of a generated world, queried with noisy copies of catalog
+entries. For each n_probe setting it reports recall@1 and recall@10
+against exact search and the time per query, plus the build time.
+
+Usage:
+    python benchmarks/bench_ann.py [--size 50000] [--dims 256] [--queries 200] [--probes 1 2 4 8 16 32]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from ann import IVFIndex
+from vector_store import EmbeddingTable, normalize_rows
+
+
+SEED = 1234
+
+
+def synthetic_catalog(size, dims, clusters=None, seed=SEED):
+    """Return (keys, unit vectors) grouped around random topic directions."""
+    rng = np.random.default_rng(seed)
+    clusters = clusters or max(1, size // 200)
+    topics = normalize_rows(rng.standard_normal((clusters, dims)).astype(np.float32))
+    noise = rng.standard_normal((size, dims)).astype(np.float32) * (2.0 / np.sqrt(dims))
+    vectors = topics[rng.integers(0, clusters, size)] + noise
+    return [f"entity {i}" for i in range(size)], normalize_rows(vectors)
+
+
+def noisy_queries(vectors, count, seed=SEED):
+    """Return queries close to (but not equal to) random catalog vectors."""
+    rng = np.random.default_rng(seed + 1)
+    picked = vectors[rng.integers(0, len(vectors), count)]
+    noise = rng.standard_normal(picked.shape).astype(np.float32) * 1.0 / np.sqrt(picked.shape[1])
+    return normalize_rows(picked + noise)
+
+
+def evaluate(size=50000, dims=256, queries=200, probes=(1, 2, 4, 8, 16, 32), n_lists=None):
+    """Return build time and, per n_probe, recall@1, recall@10 and ms per query."""
+    keys, vectors = synthetic_catalog(size, dims)
+    query_vectors = noisy_queries(vectors, queries)
+
+    exact = EmbeddingTable(keys, vectors)
+    started = time.perf_counter()
+    truth = [[key for key, _ in exact.search(query, k=10)] for query in query_vectors]
+    exact_ms = (time.perf_counter() - started) * 1000 / queries
+
+    started = time.perf_counter()
+    index = IVFIndex(n_lists=n_lists, min_train_size=min(1024, size))
+    index.add_many(keys, vectors)
+    build_s = time.perf_counter() - started
+
+    rows = []
+    for n_probe in probes:
+        started = time.perf_counter()
+        found = [[key for key, _ in index.search(query, k=10, n_probe=n_probe)] for query in query_vectors]
+        ms = (time.perf_counter() - started) * 1000 / queries
+        recall1 = sum(result[:1] == expected[:1] for result, expected in zip(found, truth)) / queries
+        recall10 = sum(len(set(result) & set(expected)) for result, expected in zip(found, truth)) / (10 * queries)
+        rows.append({"n_probe": n_probe, "recall@1": recall1, "recall@10": recall10, "ms": ms})
+    return {"size": size, "dims": dims, "n_lists": len(index.lists), "build_s": build_s,
+            "exact_ms": exact_ms, "probes": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF recall and latency against exact search")
+    parser.add_argument("--size", type=int, default=50000, help="Catalog size")
+    parser.add_argument("--dims", type=int, default=256, help="Vector dimensionality")
+    parser.add_argument("--queries", type=int, default=200, help="Queries to run")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="n_probe values")
+    parser.add_argument("--lists", type=int, default=None, help="k-means groups (default: sqrt(size))")
+    args = parser.parse_args()
+
+    result = evaluate(args.size, args.dims, args.queries, args.probes, args.lists)
+    print(f"{result['size']} vectors x {result['dims']} dims, {result['n_lists']} groups, "
+          f"built in {result['build_s']:.2f} s; exact search {result['exact_ms']:.3f} ms/query")
+    print(f"{'n_probe':>8}{'recall@1':>10}{'recall@10':>11}{'ms/query':>10}{'speedup':>9}")
+    for row in result["probes"]:
+        print(f"{row['n_probe']:>8}{row['recall@1']:>10.1%}{row['recall@10']:>11.1%}{row['ms']:>10.3f}"
+              f"{result['exact_ms'] / row['ms']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
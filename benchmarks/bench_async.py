@@ -0,0 +1,136 @@
+"""
+Async API benchmark for 'The Line: A Border Journey'
+
+Runs thousands of concurrent command lookups from one asyncio event
+loop against the stand-in server from ollama_stub.py: calling the
+blocking find_best_command() from the loop, awaiting
+afind_best_command(), and awaiting arank_intents() (the lookup the game
+itself makes). For each it reports the total time, lookups per
+second, backend requests and the longest time the loop was blocked (a
+ticker task measures how late it wakes up). It also times initializing
+a game world's catalogs with the initialize_* methods and with
+ainitialize(), and checks that both ways give the same results.
+
+Usage:
+    python benchmarks/bench_async.py [--lookups 2000] [--unique 300] [--latency 20] [--workers 32]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_engine import new_engine
+from embeddings import EmbeddingsEngine
+from intent_eval import load_corpus
+from ollama_stub import start_stub
+
+
+SEED = 1234
+TICK = 0.001
+
+
+def lookup_texts(count, unique, seed=SEED):
+    """Return count player commands drawn from unique distinct phrasings."""
+    rng = random.Random(seed)
+    corpus = [example["text"] for example in load_corpus()]
+    phrasings = [f"{rng.choice(corpus)} {i}" if i >= len(corpus) else corpus[i] for i in range(unique)]
+    return [rng.choice(phrasings) for _ in range(count)]
+
+
+async def max_loop_lag(done):
+    """Return the longest delay (ms) past a 1 ms sleep until done is set."""
+    worst = 0.0
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        worst = max(worst, time.perf_counter() - started - TICK)
+    return worst * 1000
+
+
+async def blocking_lookup(engine, text):
+    return engine.find_best_command(text, threshold=0.0)[0]
+
+
+async def async_lookup(engine, text):
+    return (await engine.afind_best_command(text, threshold=0.0))[0]
+
+
+async def async_rank(engine, text):
+    return (await engine.arank_intents(text, k=1))[0][0][0]
+
+
+LOOKUPS = {"blocking": blocking_lookup, "async": async_lookup, "async rank": async_rank}
+
+
+async def run_lookups(engine, texts, lookup):
+    """Look up every text concurrently and return (commands, seconds, max loop lag ms)."""
+    done = asyncio.Event()
+    ticker = asyncio.create_task(max_loop_lag(done))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(lookup(engine, text) for text in texts))
+    elapsed = time.perf_counter() - started
+    done.set()
+    return results, elapsed, await ticker
+
+
+def world_catalogs():
+    """Return (locations, characters, items) of a seeded game world."""
+    game = new_engine()
+    characters = [character for location in game.world.values() for character in location.characters]
+    return game.world, characters + [game.player], game.items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking versus async embedding lookups on an event loop")
+    parser.add_argument("--lookups", type=int, default=2000, help="Concurrent lookups")
+    parser.add_argument("--unique", type=int, default=300, help="Distinct texts among them")
+    parser.add_argument("--latency", type=float, default=20.0, help="Server latency per request (ms)")
+    parser.add_argument("--workers", type=int, default=32, help="async_workers of the engine")
+    args = parser.parse_args()
+
+    server = start_stub(latency=args.latency / 1000)
+    url = f"{server.url}/api/embeddings"
+    texts = lookup_texts(args.lookups, args.unique)
+    print(f"{args.lookups} lookups of {args.unique} distinct texts, server latency {args.latency:.0f} ms, "
+          f"{args.workers} async workers")
+    print(f"{'mode':<12}{'seconds':>9}{'lookups/s':>11}{'requests':>10}{'max loop lag ms':>17}")
+    results = {}
+    for mode, lookup in LOOKUPS.items():
+        engine = EmbeddingsEngine(api_url=url, async_workers=args.workers)
+        engine.initialize_command_embeddings()
+        engine.initialize_intent_index()
+        requests_before = server.config.requests
+        results[mode], elapsed, lag = asyncio.run(run_lookups(engine, texts, lookup))
+        print(f"{mode:<12}{elapsed:>9.2f}{len(texts) / elapsed:>11.0f}"
+              f"{server.config.requests - requests_before:>10}{lag:>17.1f}")
+    print(f"Same commands: {'yes' if results['blocking'] == results['async'] else 'NO'}")
+
+    locations, characters, items = world_catalogs()
+    engines = {}
+    for mode in ("blocking", "async"):
+        engine = engines[mode] = EmbeddingsEngine(api_url=url, async_workers=args.workers)
+        started = time.perf_counter()
+        if mode == "async":
+            if not asyncio.run(engine.ainitialize(locations, characters, items)):
+                print("Async initialization could not embed every description")
+        else:
+            engine.initialize_command_embeddings()
+            engine.initialize_location_embeddings(locations)
+            engine.initialize_character_embeddings(characters)
+            engine.initialize_item_embeddings(items)
+            engine.initialize_intent_index()
+        print(f"Initialize world catalogs ({mode}): {time.perf_counter() - started:.2f} s")
+    same = engines["blocking"].intent_index.keys == engines["async"].intent_index.keys and all(
+        engines["blocking"].rank_intents(text, k=3) == engines["async"].rank_intents(text, k=3) for text in texts[:50])
+    print(f"Same intent index: {'yes' if same else 'NO'}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Request coalescing benchmark for 'The Line: A Border Journey'
+
+Simulates many game sessions sharing one EmbeddingsEngine in a server:
+in every round each session sends one player command at the same
+moment, drawn from the labeled corpus with a skew towards common
+phrasings. The stand-in server from ollama_stub.py answers with a fixed
+latency and counts the requests and texts it sees. The run is repeated
+without coalescing and with several coalescing windows, and for each it
+reports backend requests and texts per round, lookup latency and
+whether every session got the vector the server computes for its text.
+
+Usage:
+    python benchmarks/bench_coalesce.py [--sessions 32] [--rounds 20] [--latency 20] [--windows 0.002 0.005 0.01]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embeddings import EmbeddingsEngine
+from intent_eval import load_corpus
+from ollama_stub import fake_embedding, start_stub
+from sketches import QuantileSketch
+
+
+SEED = 1234
+
+
+def session_commands(sessions, rounds, seed=SEED):
+    """Return rounds x sessions commands, with common phrasings repeated across sessions."""
+    texts = [example["text"] for example in load_corpus()]
+    rng = random.Random(seed)
+    # Zipf-like popularity: a few phrasings account for most of the traffic
+    weights = [1.0 / (rank + 1) for rank in range(len(texts))]
+    return [rng.choices(texts, weights, k=sessions) for _ in range(rounds)]
+
+
+def run(commands, latency, window=None):
+    """Send every round's commands concurrently and return counts, latency and vectors."""
+    server = start_stub(latency=latency)
+    engine = EmbeddingsEngine(api_url=f"{server.url}/api/embeddings", coalesce_window=window)
+    sessions = len(commands[0])
+    barrier = threading.Barrier(sessions)
+    latencies = QuantileSketch()
+    vectors = {}  # text -> a vector a session received for it
+    lock = threading.Lock()
+
+    def play(session):
+        for round_commands in commands:
+            barrier.wait()
+            started = time.perf_counter()
+            vector = engine.get_embedding(round_commands[session])
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.add(elapsed)
+                if vectors.get(round_commands[session], vector) == vector:
+                    vectors[round_commands[session]] = vector
+                else:
+                    vectors[round_commands[session]] = None  # Sessions disagreed
+
+    threads = [threading.Thread(target=play, args=(session,)) for session in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - started
+    server.shutdown()
+    rounds = len(commands)
+    return {"requests": server.config.requests / rounds, "texts": server.config.texts / rounds,
+            "p50": latencies.quantile(0.5), "p99": latencies.quantile(0.99),
+            "seconds": total, "vectors": vectors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend load with and without request coalescing")
+    parser.add_argument("--sessions", type=int, default=32, help="Concurrent sessions")
+    parser.add_argument("--rounds", type=int, default=20, help="Commands per session")
+    parser.add_argument("--latency", type=float, default=20.0, help="Server latency per request (ms)")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0.002, 0.005, 0.01],
+                        help="Coalescing windows to try (seconds)")
+    args = parser.parse_args()
+
+    commands = session_commands(args.sessions, args.rounds)
+    unique = sum(len(set(round_commands)) for round_commands in commands) / args.rounds
+    print(f"{args.sessions} sessions x {args.rounds} rounds, {unique:.1f} unique texts per round, "
+          f"server latency {args.latency:.0f} ms")
+    print(f"{'window':<10}{'requests/round':>16}{'texts/round':>13}{'p50 ms':>9}{'p99 ms':>9}{'total s':>9}  same")
+    for window in [None] + args.windows:
+        result = run(commands, args.latency / 1000, window)
+        same = all(vector == fake_embedding(text) for text, vector in result["vectors"].items())
+        label = "off" if window is None else f"{window * 1000:g} ms"
+        print(f"{label:<10}{result['requests']:>16.1f}{result['texts']:>13.1f}{result['p50']:>9.1f}"
+              f"{result['p99']:>9.1f}{result['seconds']:>9.2f}  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
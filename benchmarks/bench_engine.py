@@ -0,0 +1,345 @@
+"""
+Engine benchmarks for 'The Line: A Border Journey'
+
+Times the hot paths of the game with fixed seeds and the fake embedding
+backend from fake_backend.py, so results do not depend on a running
+Ollama server or on luck:
+
+- process_command on the keyword and natural-language paths, and over
+  HTTP against the stand-in server from ollama_stub.py
+- EmbeddingsEngine.find_best_match over catalogs of 10, 1k and 100k entries
+- recall and query time of the IVF index from ann.py on a 50k catalog
+- Location.describe on a crowded location, memoized and rebuilt
+- GameEngine.load_events on a large generated world
+- complete headless journeys per second
+- memory retained by one game session
+
+Results can be saved as a baseline; --check compares against it and
+exits with status 1 if any metric got worse by more than the threshold.
+Changes smaller than a metric's noise floor (an absolute amount, 0.2 us
+by default for microsecond timings) never count as regressions, so
+sub-microsecond metrics do not fail on timer jitter.
+
+Usage:
+    python benchmarks/bench_engine.py [--only NAME ...] [--save-baseline] [--check]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backend import FakeEmbeddingsEngine, STUB_INTENT_THRESHOLD, fake_embedding
+from character import Migrant
+from embeddings import EmbeddingsEngine
+from location import Desert, Border, Settlement
+from game_engine import GameEngine
+from replay import SessionRecording, Playback, EndOfRecording, quiet
+from story import Story
+from telemetry import NULL_TELEMETRY
+from ollama_stub import start_stub
+from bench_ann import evaluate as evaluate_ann
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 1234
+
+# Default noise floor per unit: smaller absolute changes are not regressions
+NOISE_FLOORS = {"us": 0.2}
+
+KEYWORD_COMMANDS = ["look", "status", "help", "inventory", "examine", "dance wildly"]
+NATURAL_COMMANDS = ["examine my surroundings", "check my health and stats", "show the commands",
+                    "what is around me", "observe the area carefully", "how am i doing"]
+
+# Input script for headless journeys; "1" doubles as the answer to moral choices
+JOURNEY_SCRIPT = ["look", "west", "1", "status", "north", "1", "use water bottle", "north", "1",
+                  "look", "north", "1"] * 4
+
+
+def measure(function, repeat=5):
+    """Return the best time per call of function in seconds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def new_engine(seed=SEED, embeddings=None, role="migrant", intent_threshold=STUB_INTENT_THRESHOLD):
+    """Create a set-up game session without printing anything.
+
+    The intent threshold defaults to the stub's, since every benchmark
+    backend serves the stub's vectors; None keeps the game's default.
+    """
+    with quiet(io.StringIO()):
+        engine = GameEngine(Story(), telemetry=NULL_TELEMETRY, seed=seed)
+        engine.embeddings_engine = embeddings
+        if intent_threshold is not None:
+            engine.intent_threshold = intent_threshold
+        if role == "migrant":
+            engine.setup("Ana", "migrant", origin="Oaxaca", motivation="Work")
+        else:
+            engine.setup("Bo", "patrol", years_of_service=7)
+        engine.initialize_embeddings()
+    return engine
+
+
+def metric(value, unit, better="lower", noise=None):
+    """Return a result; noise overrides the unit's noise floor."""
+    result = {"value": value, "unit": unit, "better": better}
+    if noise is not None:
+        result["noise"] = noise
+    return result
+
+
+def bench_process_command():
+    """Time per command on the keyword path and the natural-language path."""
+    results = {}
+    # The keyword path varies by about a microsecond between runs on a busy host
+    for name, commands, embeddings, noise in (
+        ("keyword", KEYWORD_COMMANDS, None, 1.0),
+        ("natural", NATURAL_COMMANDS, FakeEmbeddingsEngine(), None),
+    ):
+        engine = new_engine(embeddings=embeddings)
+
+        def run():
+            for command in commands:
+                engine.process_command(command)
+
+        with quiet(io.StringIO()):
+            seconds = measure(run)
+        results[f"process_command.{name}"] = metric(seconds / len(commands) * 1e6, "us", noise=noise)
+    return results
+
+
+def bench_http_backend():
+    """Time per natural-language command with embeddings served over local HTTP."""
+    server = start_stub()
+    try:
+        engine = new_engine(embeddings=EmbeddingsEngine(api_url=f"{server.url}/api/embeddings"))
+
+        def run():
+            for command in NATURAL_COMMANDS:
+                engine.process_command(command)
+
+        with quiet(io.StringIO()):
+            seconds = measure(run, repeat=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {"process_command.natural_http": metric(seconds / len(NATURAL_COMMANDS) * 1e6, "us")}
+
+
+def bench_find_best_match(sizes=(10, 1000, 100000), dims=768):
+    """Time one query against entity catalogs of several sizes."""
+    engine = FakeEmbeddingsEngine(dims)
+    # Distinct vectors for up to 1000 entities, shared beyond that to bound memory
+    pool = [fake_embedding(f"entity {i} object number {i}", dims) for i in range(min(max(sizes), 1000))]
+    results = {}
+    for size in sizes:
+        catalog = {f"entity {i}": pool[i % len(pool)] for i in range(size)}
+        seconds = measure(lambda: engine.find_best_match("entity 42 object", catalog, threshold=0.0),
+                          repeat=2 if size >= 100000 else 5)
+        results[f"find_best_match.{size}"] = metric(seconds * 1e3, "ms")
+    return results
+
+
+def bench_ann(n_probe=8):
+    """Recall against exact search and time per query of the IVF index."""
+    result = evaluate_ann(probes=(n_probe,))
+    row = result["probes"][0]
+    return {
+        "ann.recall@10": metric(row["recall@10"] * 100, "%", better="higher"),
+        f"ann.query.{result['size']}": metric(row["ms"], "ms"),
+    }
+
+
+def bench_describe(crowd=5000):
+    """Time describing a location crowded with characters."""
+    location = Settlement("Plaza", "A crowded plaza.", population=100000)
+    for service in ("food", "shelter", "medical"):
+        location.add_service(service)
+    for i in range(crowd):
+        location.add_character(Migrant(f"Migrant {i}", "A traveler.", "Oaxaca", "Work."))
+    location.add_item("Water Bottle", 3)
+
+    def rebuild():
+        location.invalidate("characters")
+        return location.describe(detailed=True)
+
+    return {
+        "describe.memoized": metric(measure(lambda: location.describe(detailed=True)) * 1e6, "us"),
+        "describe.rebuilt": metric(measure(rebuild) * 1e6, "us"),
+    }
+
+
+def generated_world(size=2000):
+    """Return {id: location} for a large world of mixed location types."""
+    rng = random.Random(SEED)
+    world = {}
+    previous = None
+    for i in range(size):
+        kind = rng.choice((Desert, Border, Settlement))
+        location = kind(f"Place {i}", "A generated place.")
+        if previous is not None:
+            location.add_connection("south", previous)
+            previous.add_connection("north", location)
+        world[f"place_{i}"] = location
+        previous = location
+    return world
+
+
+def bench_load_events(size=2000):
+    """Time loading the event catalog into a large generated world."""
+    engine = new_engine()
+
+    def load():
+        engine.world = generated_world(size)
+        engine.load_events()
+
+    world_seconds = measure(lambda: generated_world(size), repeat=3)
+    seconds = measure(load, repeat=3) - world_seconds
+    return {f"load_events.{size}": metric(seconds * 1e3, "ms")}
+
+
+def play_journey(seed):
+    """Play one scripted journey headlessly; return the number of turns played."""
+    recording = SessionRecording()
+    recording.begin(seed, "Ana", "migrant", {"origin": "Oaxaca", "motivation": "Work"})
+    recording.entries = [{"input": command} for command in JOURNEY_SCRIPT]
+
+    engine = GameEngine(Story(), telemetry=NULL_TELEMETRY, seed=seed)
+    engine.embeddings_engine = None
+    engine.playback = Playback(recording)
+    engine.setup("Ana", "migrant", origin="Oaxaca", motivation="Work")
+    try:
+        engine.main_loop()
+    except EndOfRecording:
+        pass
+    return engine.turn_count
+
+
+def bench_journeys(journeys=20):
+    """Complete headless journeys per second over a fixed set of seeds."""
+    def run():
+        for seed in range(journeys):
+            play_journey(seed)
+
+    with quiet(io.StringIO()):
+        seconds = measure(run, repeat=3)
+    return {"journeys_per_sec": metric(journeys / seconds, "journeys/s", better="higher")}
+
+
+def bench_session_memory():
+    """Memory retained by one set-up session, with and without AI embeddings."""
+    new_engine(embeddings=FakeEmbeddingsEngine())  # Warm up imports and class-level caches
+    results = {}
+    for name, embeddings in (("no_ai", None), ("ai", FakeEmbeddingsEngine())):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        engine = new_engine(embeddings=embeddings)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del engine
+        results[f"session_memory.{name}"] = metric((after - before) / 1024, "KiB")
+    return results
+
+
+BENCHMARKS = {
+    "process_command": bench_process_command,
+    "http_backend": bench_http_backend,
+    "find_best_match": bench_find_best_match,
+    "ann": bench_ann,
+    "describe": bench_describe,
+    "load_events": bench_load_events,
+    "journeys": bench_journeys,
+    "session_memory": bench_session_memory,
+}
+
+
+def run(names=None):
+    """Run the selected benchmarks (all by default) and return their metrics."""
+    results = {}
+    for name in names or BENCHMARKS:
+        random.seed(SEED)
+        results.update(BENCHMARKS[name]())
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """Return (metric, change) for every metric worse than baseline by more than threshold.
+
+    A metric is only compared when it moved by more than its noise floor.
+    """
+    failed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            continue
+        noise = result.get("noise", NOISE_FLOORS.get(result["unit"], 0.0))
+        if abs(result["value"] - base["value"]) <= noise:
+            continue
+        change = (result["value"] - base["value"]) / base["value"]
+        worse = change if result["better"] == "lower" else -change
+        if worse > threshold:
+            failed.append((name, change))
+    return failed
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["metrics"]
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    data = {"python": platform.python_version(), "machine": platform.machine(), "metrics": results}
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(data, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine hot path benchmarks")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown before a metric counts as regressed")
+    args = parser.parse_args()
+
+    results = run(args.only)
+    baseline = load_baseline(args.baseline)
+
+    print(f"{'metric':<28}{'value':>14}  {'unit':<12}{'baseline':>12}{'change':>9}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        base_text = f"{base['value']:>12.2f}" if base else f"{'-':>12}"
+        change_text = f"{(result['value'] - base['value']) / base['value']:>+9.1%}" if base and base["value"] else ""
+        print(f"{name:<28}{result['value']:>14.2f}  {result['unit']:<12}{base_text}{change_text}")
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        save_baseline(merged, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if args.check:
+        failed = regressions(results, baseline, args.threshold)
+        if failed:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for name, change in failed:
+                print(f"  {name}: {change:+.1%}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Memory benchmark for 'The Line: A Border Journey'
+
+Measures the memory cost of each character and location object, as
+allocated by Python, by building many instances under tracemalloc.
+
+Each type is measured twice: as the slotted class, and as a dict-backed
+equivalent holding the same state the way the classes did before they
+declared __slots__ (attributes in an instance __dict__, and a fresh
+story flag dict and observer/family lists per object instead of shared
+empty placeholders).
+
+Usage:
+    python benchmarks/bench_memory.py [--count N]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from character import Character, Migrant, BorderPatrol, NO_FLAGS
+from inventory import Inventory
+from location import Location, Desert, Border, Settlement
+
+
+# Type -> (name prefix, factory taking a prebuilt name)
+FACTORIES = {
+    "Character": ("Local", lambda name: Character(name, "A local resident.")),
+    "Migrant": ("Migrant", lambda name: Migrant(name, "A traveler.", "Oaxaca", "Work.")),
+    "BorderPatrol": ("Agent", lambda name: BorderPatrol(name, "An agent.", years_of_service=3)),
+    "Location": ("Place", lambda name: Location(name, "Somewhere.")),
+    "Desert": ("Desert", lambda name: Desert(name, "Sand.")),
+    "Border": ("Border", lambda name: Border(name, "A wall.")),
+    "Settlement": ("Town", lambda name: Settlement(name, "A town.", population=500)),
+}
+
+CONTAINERS = (dict, list, set, Inventory)
+
+
+class DictBacked:
+    """Holds an object's attributes in an instance __dict__, as unslotted classes do."""
+
+
+def slot_state(obj):
+    """Return (attribute, value) pairs for every slot an object has set."""
+    state = []
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if hasattr(obj, name):
+                state.append((name, getattr(obj, name)))
+    return state
+
+
+def dict_backed(state):
+    """Build the dict-backed equivalent of an object from its slot_state()."""
+    obj = DictBacked()
+    for name, value in state:
+        if value is NO_FLAGS:
+            value = {}
+        elif type(value) is tuple and not value:
+            value = []
+        elif isinstance(value, CONTAINERS):
+            # Containers are still empty right after construction
+            value = type(value)()
+        setattr(obj, name, value)
+    return obj
+
+
+def bytes_per_object(build, arguments):
+    """Return the average number of bytes allocated by build(argument).
+
+    Arguments are prepared before tracing starts, so only the objects
+    themselves (and the containers they own) are counted.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(argument) for argument in arguments]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of their cost
+    return (after - before - sys.getsizeof(objects)) / len(arguments)
+
+
+def run(count=10000):
+    """Measure every factory and return {name: (dict-backed bytes, slotted bytes) per object}."""
+    results = {}
+    for name, (prefix, factory) in FACTORIES.items():
+        names = [f"{prefix} {i}" for i in range(count)]
+        slotted = bytes_per_object(factory, names)
+        states = [slot_state(factory(object_name)) for object_name in names]
+        results[name] = (bytes_per_object(dict_backed, states), slotted)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-object memory benchmark")
+    parser.add_argument("--count", type=int, default=10000, help="Objects built per type")
+    args = parser.parse_args()
+
+    print(f"{'Type':<14}{'dict-backed':>13}{'slotted':>10}{'saved':>8}   (bytes/object)")
+    for name, (unslotted, slotted) in run(args.count).items():
+        print(f"{name:<14}{unslotted:>13.0f}{slotted:>10.0f}{1 - slotted / unslotted:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Shared catalog benchmark for 'The Line: A Border Journey'
+
+Runs a pool of worker processes that each search a large embedding
+catalog, once with every worker building its own copy and once with
+the workers attached to one copy published through shared_catalog.py.
+For each mode it reports the memory private to each worker and its
+proportional share of shared pages (PSS, from /proc; Linux only), the
+time a worker needs to get a usable catalog, and whether the shared
+catalog gives the same results. A second publish checks that attached
+workers pick up the new version.
+
+Usage:
+    python benchmarks/bench_shared.py [--workers 4] [--size 50000] [--dims 384]
+"""
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ann import synthetic_catalog, noisy_queries
+from embeddings import EmbeddingsEngine
+from shared_catalog import CatalogPublisher
+from vector_store import CompactEmbeddings
+
+
+QUERIES = 20
+
+
+def memory_mb():
+    """Return (private, proportional) resident memory of this process in MB."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return private / 1024, fields.get("Pss", 0) / 1024
+
+
+def worker(mode, name, size, dims):
+    """Get a catalog the given way, search it and report memory and timings."""
+    started = time.perf_counter()
+    engine = EmbeddingsEngine()
+    if mode == "shared":
+        engine.attach_catalogs(name)
+    else:
+        keys, vectors = synthetic_catalog(size, dims)
+        engine.item_embeddings = CompactEmbeddings.from_vectors(dict(zip(keys, vectors)), precision="float32")
+    ready = time.perf_counter() - started
+
+    _, vectors = synthetic_catalog(min(size, 1000), dims)
+    results = [engine.item_embeddings.search(query, k=3) for query in noisy_queries(vectors, QUERIES)]
+    private, pss = memory_mb()
+    return {"ready_s": ready, "private_mb": private, "pss_mb": pss,
+            "results": [[key for key, _ in found] for found in results],
+            "version": engine.shared_catalog.version if engine.shared_catalog else None}
+
+
+def refreshed_version(name):
+    """Attach, wait for a newer version and return (first, refreshed) version numbers."""
+    engine = EmbeddingsEngine()
+    engine.attach_catalogs(name)
+    first = engine.shared_catalog.version
+    while not engine.refresh_catalogs():
+        time.sleep(0.01)
+    return first, engine.shared_catalog.version
+
+
+def run(workers=4, size=50000, dims=384):
+    """Run both modes and return their per-worker results."""
+    keys, vectors = synthetic_catalog(size, dims)
+    catalog = CompactEmbeddings.from_vectors(dict(zip(keys, vectors)), precision="float32")
+    name = f"the-line-bench-{os.getpid()}"
+    publisher = CatalogPublisher(name)
+    report = {"catalog_mb": catalog.nbytes / 2 ** 20}
+    try:
+        publisher.publish({"item": catalog})
+        del keys, vectors, catalog
+        # A fresh pool per mode, so neither measurement sees the other's leftovers
+        for mode in ("copy", "shared"):
+            with get_context("spawn").Pool(workers) as pool:
+                report[mode] = pool.starmap(worker, [(mode, name, size, dims)] * workers)
+        with get_context("spawn").Pool(1) as pool:
+            waiting = pool.apply_async(refreshed_version, (name,))
+            time.sleep(1.0)
+            keys, vectors = synthetic_catalog(size // 2, dims, seed=99)
+            publisher.publish({"item": CompactEmbeddings.from_vectors(dict(zip(keys, vectors)),
+                                                                      precision="float32")})
+            report["refresh"] = waiting.get(timeout=60)
+    finally:
+        publisher.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory with copied and shared catalogs")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--size", type=int, default=50000, help="Catalog size")
+    parser.add_argument("--dims", type=int, default=384, help="Vector dimensionality")
+    args = parser.parse_args()
+
+    report = run(args.workers, args.size, args.dims)
+    print(f"{args.workers} workers, catalog of {args.size} x {args.dims} float32 ({report['catalog_mb']:.0f} MB)")
+    print(f"{'mode':<8}{'private MB':>12}{'PSS MB':>10}{'ready s':>10}")
+    for mode in ("copy", "shared"):
+        rows = report[mode]
+        print(f"{mode:<8}{sum(row['private_mb'] for row in rows) / len(rows):>12.0f}"
+              f"{sum(row['pss_mb'] for row in rows) / len(rows):>10.0f}"
+              f"{sum(row['ready_s'] for row in rows) / len(rows):>10.2f}")
+    same = all(copy["results"] == shared["results"] for copy, shared in zip(report["copy"], report["shared"]))
+    print(f"Same search results: {'yes' if same else 'NO'}")
+    print(f"Refresh: attached to version {report['refresh'][0]}, switched to version {report['refresh'][1]}")
+
+
+if __name__ == "__main__":
+    main()
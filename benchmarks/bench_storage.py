@@ -0,0 +1,112 @@
+"""
+Embedding storage benchmark for 'The Line: A Border Journey'
+
+Compares the ways EmbeddingsEngine can keep a large catalog: plain
+Python lists, float32/float16 arrays, per-vector-scaled int8 arrays and
+PCA-reduced versions of those. For each format it reports bytes per
+entity, time to scan the catalog for one query, and how well the
+ranking agrees with exact float32 search (top-1 agreement and overlap
+of the top 10).
+
+The catalog is synthetic but shaped like text embeddings: variance
+falls off as 1/rank over the principal directions and every vector
+shares a common offset. (On isotropic random vectors no projection can
+keep the ranking, so PCA rows would say nothing about real catalogs.)
+Python lists are measured on a sample and scaled up, since a full
+catalog of them would not fit in memory comfortably.
+
+Usage:
+    python benchmarks/bench_storage.py [--size 50000] [--dims 768] [--queries 100] [--pca 128]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bench_ann import noisy_queries
+from fake_backend import FakeEmbeddingsEngine
+from vector_store import CompactEmbeddings, EmbeddingTable, normalize_rows
+
+
+SEED = 1234
+LIST_SAMPLE = 2000
+
+
+def embedding_like_catalog(size, dims, seed=SEED):
+    """Return (keys, unit vectors) with a 1/rank variance spectrum and a shared offset."""
+    rng = np.random.default_rng(seed)
+    basis = np.linalg.qr(rng.standard_normal((dims, dims)))[0].astype(np.float32)
+    spectrum = 1.0 / np.arange(1, dims + 1, dtype=np.float32)
+    offset = normalize_rows(rng.standard_normal((1, dims)).astype(np.float32)) * 0.3
+    vectors = (rng.standard_normal((size, dims)).astype(np.float32) * spectrum) @ basis.T + offset
+    return [f"entity {i}" for i in range(size)], normalize_rows(vectors)
+
+
+def list_storage(keys, vectors, queries):
+    """Bytes per entity and scan ms (scaled to the full catalog) for list storage."""
+    sample = min(LIST_SAMPLE, len(keys))
+    tracemalloc.start()
+    catalog = {keys[i]: vectors[i].tolist() for i in range(sample)}
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    engine = FakeEmbeddingsEngine(vectors.shape[1])
+    engine.get_embedding = lambda text: query.tolist()
+    started = time.perf_counter()
+    for query in queries[:3]:
+        engine.find_best_match("query", catalog, threshold=0.0)
+    ms = (time.perf_counter() - started) * 1000 / 3 * len(keys) / sample
+    return size / sample, ms
+
+
+def evaluate(size=50000, dims=768, queries=100, pca_dims=128):
+    """Return one result row per storage format."""
+    keys, vectors = embedding_like_catalog(size, dims)
+    query_vectors = noisy_queries(vectors, queries)
+    exact = EmbeddingTable(keys, vectors)
+    truth = [[key for key, _ in exact.search(query, k=10)] for query in query_vectors]
+
+    list_bytes, list_ms = list_storage(keys, vectors, query_vectors)
+    rows = [{"format": "list", "bytes": list_bytes, "ms": list_ms, "top1": 1.0, "top10": 1.0}]
+    catalog = dict(zip(keys, vectors))
+    for precision in ("float32", "float16", "int8"):
+        for reduced in (None, pca_dims):
+            compact = CompactEmbeddings.from_vectors(catalog, precision=precision, pca_dims=reduced)
+            started = time.perf_counter()
+            found = [[key for key, _ in compact.search(query, k=10)] for query in query_vectors]
+            ms = (time.perf_counter() - started) * 1000 / queries
+            rows.append({
+                "format": precision + (f"+pca{reduced}" if reduced else ""),
+                "bytes": compact.nbytes / size,
+                "ms": ms,
+                "top1": sum(result[0] == expected[0] for result, expected in zip(found, truth)) / queries,
+                "top10": sum(len(set(result) & set(expected)) for result, expected in zip(found, truth)) / (10 * queries),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory, scan time and ranking agreement of embedding storage formats")
+    parser.add_argument("--size", type=int, default=50000, help="Catalog size")
+    parser.add_argument("--dims", type=int, default=768, help="Vector dimensionality")
+    parser.add_argument("--queries", type=int, default=100, help="Queries to run")
+    parser.add_argument("--pca", type=int, default=128, help="Reduced dimensionality for the PCA rows")
+    args = parser.parse_args()
+
+    rows = evaluate(args.size, args.dims, args.queries, args.pca)
+    base = rows[0]
+    print(f"{args.size} vectors x {args.dims} dims")
+    print(f"{'format':<16}{'bytes/entity':>14}{'smaller':>9}{'ms/query':>10}{'faster':>9}{'top-1':>8}{'top-10':>8}")
+    for row in rows:
+        print(f"{row['format']:<16}{row['bytes']:>14.0f}{base['bytes'] / row['bytes']:>8.1f}x{row['ms']:>10.2f}"
+              f"{base['ms'] / row['ms']:>8.1f}x{row['top1']:>8.0%}{row['top10']:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
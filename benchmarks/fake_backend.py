@@ -0,0 +1,43 @@
+"""
+Fake embedding backend for the benchmarks of 'The Line: A Border Journey'
+
+This module replaces the Ollama API with the deterministic vectors of
+ollama_stub.py, computed in-process, so the AI command path can be
+benchmarked offline without HTTP overhead.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embeddings import EmbeddingsEngine
+from ollama_stub import fake_embedding
+
+
+# Intent threshold for the stub's hashed bag-of-words vectors, whose
+# similarities run far below a real model's (see intent_eval.py --sweep).
+# Only meaningful for this backend and ollama_stub.py, never for Ollama.
+STUB_INTENT_THRESHOLD = 0.15
+
+
+class FakeEmbeddingsEngine(EmbeddingsEngine):
+    """EmbeddingsEngine whose vectors come from fake_embedding()."""
+
+    def __init__(self, dims=768):
+        """
+        Initialize the fake engine.
+
+        Args:
+            dims (int): Vector dimensionality
+        """
+        super().__init__()
+        self.dims = dims
+
+    def get_embedding(self, text):
+        self.calls += 1
+        return fake_embedding(text, self.dims)
+
+    def get_embeddings(self, texts):
+        self.calls += 1
+        return [fake_embedding(text, self.dims) for text in texts]
@@ -0,0 +1,230 @@
+"""
+Intent-resolution evaluation for 'The Line: A Border Journey'
+
+Runs a labeled corpus of player inputs through the game's full intent
+pipeline (GameEngine.resolve_intent: AI command matching, keyword
+fallback and entity matching) and reports:
+
+- accuracy overall and per expected action
+- confusion between actions (what each action was resolved as)
+- mean and p99 resolution latency
+- embedding backend calls per input
+
+With --sweep, the intent threshold (for the joint command+entity index)
+and the entity similarity threshold are varied over a grid (embeddings are memoized, so the sweep stays fast while
+still counting every logical backend call) and the best operating points
+are listed: most accurate first, then fewest backend calls.
+
+The fake in-process backend is used by default; --url points the
+evaluation at an Ollama server or the stand-in from ollama_stub.py.
+The fake backend is evaluated at the stub's intent threshold and a URL
+at the game's default, unless --intent-threshold says otherwise.
+
+Usage:
+    python benchmarks/intent_eval.py [--corpus PATH] [--url URL] [--no-ai] [--sweep]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backend import FakeEmbeddingsEngine, STUB_INTENT_THRESHOLD
+from bench_engine import new_engine
+from embeddings import EmbeddingsEngine
+from items import ITEMS
+from sketches import QuantileSketch
+
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_corpus.jsonl")
+NOT_UNDERSTOOD = "none"
+
+
+def load_corpus(path=CORPUS_PATH):
+    """Read labeled examples: one {"text", "action", "target"} object per line."""
+    with open(path, "r", encoding="utf-8") as corpus_file:
+        return [json.loads(line) for line in corpus_file if line.strip()]
+
+
+def character_names(engine):
+    """Return the names of every character in the engine's world."""
+    return [character.name for location in engine.world.values() for character in location.characters]
+
+
+def canonical(action, target, names):
+    """Return a comparable (action, target) pair.
+
+    Items are reduced to their display name and characters to the full
+    name the game would match, the way interact() looks them up.
+    """
+    if target is None:
+        return action, None
+    target = target.lower()
+    if action in ("take", "use"):
+        item = ITEMS.get(target)
+        return action, item.name.lower() if item else target
+    if action == "talk":
+        for name in names:
+            if target in name.lower():
+                return action, name.lower()
+    return action, target
+
+
+def evaluate(engine, corpus):
+    """Resolve every example and return the evaluation results.
+
+    Args:
+        engine (GameEngine): Set-up game session to resolve commands with
+        corpus (list): Labeled examples from load_corpus()
+
+    Returns:
+        dict: accuracy, per_action, confusion, latency_ms and calls_per_input
+    """
+    names = character_names(engine)
+    backend = engine.embeddings_engine
+    latency = QuantileSketch()
+    per_action = {}
+    confusion = {}
+    correct = 0
+    calls_before = backend.calls if backend else 0
+
+    for example in corpus:
+        started = time.perf_counter()
+        intent = engine.resolve_intent(example["text"].lower().strip())
+        latency.add((time.perf_counter() - started) * 1000)
+
+        expected = canonical(example["action"], example["target"], names)
+        actual = canonical(intent.action, intent.target, names) if intent else (NOT_UNDERSTOOD, None)
+        hit = expected == actual
+        correct += hit
+
+        counts = per_action.setdefault(expected[0], [0, 0])
+        counts[0] += hit
+        counts[1] += 1
+        row = confusion.setdefault(expected[0], {})
+        row[actual[0]] = row.get(actual[0], 0) + 1
+
+    calls = (backend.calls - calls_before) if backend else 0
+    return {
+        "examples": len(corpus),
+        "accuracy": correct / len(corpus) if corpus else 0.0,
+        "per_action": {action: hits / total for action, (hits, total) in per_action.items()},
+        "confusion": confusion,
+        "latency_ms": latency.summary((0.5, 0.99)),
+        "calls_per_input": calls / len(corpus) if corpus else 0.0,
+    }
+
+
+def memoize(backend):
+    """Cache a backend's embeddings while still counting every logical call."""
+    fetch = backend.get_embedding
+    fetch_many = backend.get_embeddings
+    cache = {}
+
+    def get_embedding(text):
+        if text in cache:
+            backend.calls += 1
+            return cache[text]
+        cache[text] = fetch(text)
+        return cache[text]
+
+    def get_embeddings(texts):
+        missing = list(dict.fromkeys(text for text in texts if text not in cache))
+        if not missing:
+            # One batch request, as the uncached call would have made
+            backend.calls += 1
+            return [cache[text] for text in texts]
+        embeddings = fetch_many(missing)
+        if embeddings is None:
+            return None
+        cache.update(zip(missing, embeddings))
+        return [cache[text] for text in texts]
+
+    backend.get_embedding = get_embedding
+    backend.get_embeddings = get_embeddings
+    return backend
+
+
+def sweep(engine, corpus, grid):
+    """Evaluate every (intent, entity) threshold pair in grid.
+
+    Returns:
+        list: (intent_threshold, entity_threshold, results), best first
+    """
+    memoize(engine.embeddings_engine)
+    points = []
+    for intent_threshold in grid:
+        for entity_threshold in grid:
+            engine.intent_threshold = intent_threshold
+            engine.entity_threshold = entity_threshold
+            points.append((intent_threshold, entity_threshold, evaluate(engine, corpus)))
+    points.sort(key=lambda point: (-point[2]["accuracy"], point[2]["calls_per_input"], -point[0], -point[1]))
+    return points
+
+
+def format_results(results):
+    """Return a readable report of evaluate() results."""
+    latency = results["latency_ms"]
+    lines = [
+        f"Examples:        {results['examples']}",
+        f"Accuracy:        {results['accuracy']:.1%}",
+        f"Latency:         mean {latency['mean']:.3f} ms, p99 {latency['p99']:.3f} ms",
+        f"Backend calls:   {results['calls_per_input']:.2f} per input",
+        "",
+        "Accuracy by action:",
+    ]
+    for action, accuracy in sorted(results["per_action"].items()):
+        lines.append(f"  {action:<12}{accuracy:>7.1%}")
+
+    columns = sorted({actual for row in results["confusion"].values() for actual in row})
+    lines += ["", "Confusion (rows: expected, columns: resolved as):",
+              "  " + f"{'':<12}" + "".join(f"{column:>12}" for column in columns)]
+    for expected in sorted(results["confusion"]):
+        row = results["confusion"][expected]
+        lines.append("  " + f"{expected:<12}" + "".join(f"{row.get(column, 0) or '.':>12}" for column in columns))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent-resolution accuracy and latency")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Labeled corpus (JSON lines)")
+    parser.add_argument("--url", help="Embedding API URL (default: in-process fake backend)")
+    parser.add_argument("--no-ai", action="store_true", help="Evaluate the keyword parser alone")
+    parser.add_argument("--intent-threshold", type=float, default=None,
+                        help="Intent threshold (default: the stub's for the fake backend, else the game's)")
+    parser.add_argument("--sweep", action="store_true", help="Search the threshold grid for the best operating point")
+    parser.add_argument("--step", type=float, default=0.05, help="Threshold grid step for --sweep")
+    parser.add_argument("--top", type=int, default=5, help="Operating points to list with --sweep")
+    args = parser.parse_args()
+
+    intent_threshold = args.intent_threshold
+    if args.no_ai:
+        backend = None
+    elif args.url:
+        backend = EmbeddingsEngine(api_url=args.url)
+    else:
+        backend = FakeEmbeddingsEngine()
+        if intent_threshold is None:
+            intent_threshold = STUB_INTENT_THRESHOLD
+    engine = new_engine(embeddings=backend, intent_threshold=intent_threshold)
+    corpus = load_corpus(args.corpus)
+
+    print(f"Thresholds: intent {engine.intent_threshold:.2f}, entity {engine.entity_threshold:.2f}")
+    print(format_results(evaluate(engine, corpus)))
+
+    if args.sweep and backend is not None:
+        steps = int(round(1 / args.step))
+        grid = [round(i * args.step, 4) for i in range(steps + 1)]
+        points = sweep(engine, corpus, grid)
+        print(f"\nBest operating points ({len(points)} evaluated):")
+        print(f"  {'intent':>8}{'entity':>8}{'accuracy':>10}{'calls/input':>13}")
+        for intent_threshold, entity_threshold, results in points[:args.top]:
+            print(f"  {intent_threshold:>8.2f}{entity_threshold:>8.2f}{results['accuracy']:>10.1%}"
+                  f"{results['calls_per_input']:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
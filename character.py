@@ -6,11 +6,28 @@ including the base Character class and specialized character types.
 """
 
 import random
+from types import MappingProxyType
+from inventory import Inventory
+
+# Shared read-only placeholder until a character gets its first story flag
+NO_FLAGS = MappingProxyType({})
 
 
 class Character:
     """Base character class for all game characters."""
     
+    # Slotted to keep NPC-heavy worlds small; subclasses add their own slots
+    __slots__ = ("name", "description", "health", "inventory", "location",
+                 "story_flags", "flag_observers")
+    
+    # Capabilities, checked instead of probing attributes with hasattr
+    role = "local"
+    tracks_supplies = False  # water and food
+    tracks_hope = False
+    tracks_stress = False
+    tracks_morality = False  # moral compass
+    carries_money = False
+    
     def __init__(self, name, description, health=100):
         """Initialize a character with basic attributes.
         
@@ -22,29 +39,44 @@ class Character:
         self.name = name
         self.description = description
         self.health = health
-        self.inventory = []
+        self.inventory = Inventory()
         self.location = None
-        self.story_flags = {}
+        self.story_flags = NO_FLAGS
+        self.flag_observers = ()  # Callbacks notified when a story flag changes
     
     def describe(self):
         """Return a description of the character."""
         return f"{self.name}: {self.description}"
     
-    def add_to_inventory(self, item):
-        """Add an item to the character's inventory."""
-        self.inventory.append(item)
+    def add_to_inventory(self, item, quantity=1):
+        """Add an item (or several of it) to the character's inventory."""
+        self.inventory.add(item, quantity)
         return f"{self.name} acquired {item}."
     
-    def remove_from_inventory(self, item):
+    def remove_from_inventory(self, item, quantity=1):
         """Remove an item from the character's inventory if present."""
-        if item in self.inventory:
-            self.inventory.remove(item)
+        if self.inventory.remove(item, quantity):
             return f"{self.name} no longer has {item}."
         return f"{self.name} doesn't have {item}."
     
     def set_flag(self, flag_name, value):
-        """Set a story flag for this character."""
+        """Set a story flag for this character and notify observers of changes."""
+        old_value = self.story_flags.get(flag_name, False)
+        if self.story_flags is NO_FLAGS:
+            self.story_flags = {}
         self.story_flags[flag_name] = value
+        if old_value != value:
+            for observer in self.flag_observers:
+                observer(self, flag_name)
+    
+    def add_flag_observer(self, observer):
+        """Register a callback(character, flag_name) for story flag changes."""
+        if observer not in self.flag_observers:
+            self.flag_observers += (observer,)
+    
+    def remove_flag_observer(self, observer):
+        """Unregister a story flag callback."""
+        self.flag_observers = tuple(o for o in self.flag_observers if o != observer)
     
     def has_flag(self, flag_name):
         """Check if a story flag exists and is True."""
@@ -54,6 +86,13 @@ class Character:
 class Migrant(Character):
     """Class representing a migrant character."""
     
+    __slots__ = ("origin", "motivation", "water", "food", "hope", "money", "family_ties")
+    
+    role = "migrant"
+    tracks_supplies = True
+    tracks_hope = True
+    carries_money = True
+    
     def __init__(self, name, description, origin, motivation, health=100):
         """Initialize a migrant character.
         
@@ -71,7 +110,7 @@ class Migrant(Character):
         self.food = 100   # Food level (0-100)
         self.hope = 100   # Hope level (0-100)
         self.money = 100  # Starting money
-        self.family_ties = []  # List of family members
+        self.family_ties = ()  # Family members, grown on demand
         
     def describe(self):
         """Return a detailed description of the migrant."""
@@ -124,12 +163,21 @@ class Migrant(Character):
     
     def add_family_tie(self, name, relationship):
         """Add a family member with their relationship."""
-        self.family_ties.append({"name": name, "relationship": relationship})
+        self.family_ties += ({"name": name, "relationship": relationship},)
 
 
 class BorderPatrol(Character):
     """Class representing a border patrol agent."""
     
+    __slots__ = ("years_of_service", "moral_compass", "stress", "encounters",
+                 "money", "water", "food")
+    
+    role = "patrol"
+    tracks_supplies = True
+    tracks_stress = True
+    tracks_morality = True
+    carries_money = True
+    
     def __init__(self, name, description, years_of_service=0, health=100):
         """Initialize a border patrol agent character.
         
@@ -0,0 +1,111 @@
+"""
+Request coalescing for 'The Line: A Border Journey'
+
+This module merges the embedding requests of concurrent game sessions
+before they reach the embedding server. Sessions that ask for a text
+already waiting or in flight share its single request (singleflight),
+and distinct texts that arrive within a short window are sent together
+as one batch request. Backend load then follows the number of unique
+texts per window instead of the number of sessions.
+
+The first caller in a window waits for the window to close (or for the
+batch to fill up) and sends the batch on behalf of everyone who joined;
+the others just wait for their results.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+
+class RequestCoalescer:
+    """Thread-safe singleflight and micro-batching in front of a batch fetch function."""
+
+    def __init__(self, fetch, window=0.005, max_batch=64):
+        """
+        Initialize the coalescer.
+
+        Args:
+            fetch (callable): Takes a list of texts and returns one result per
+                text, or None if the request failed
+            window (float): Seconds the first caller waits for others to join
+            max_batch (int): Most texts sent in one request; a full batch is
+                sent without waiting for the window to close
+        """
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self.requests = 0         # Texts asked for
+        self.backend_calls = 0    # Batch requests sent
+        self.backend_texts = 0    # Texts in those requests
+        self._lock = threading.Lock()
+        self._batch_full = threading.Condition(self._lock)
+        self._in_flight = {}      # text -> Future, from queueing until its result is in
+        self._queue = []          # Texts waiting for the next batch
+        self._collecting = False  # Whether a caller is holding the current window open
+
+    def get(self, text):
+        """Return the result for one text (None if its request failed)."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts):
+        """Return one result per text, sharing requests with concurrent callers."""
+        futures = []
+        with self._lock:
+            self.requests += len(texts)
+            for text in texts:
+                future = self._in_flight.get(text)
+                if future is None:
+                    future = self._in_flight[text] = Future()
+                    self._queue.append(text)
+                futures.append(future)
+            lead = bool(self._queue) and not self._collecting
+            if lead:
+                self._collecting = True
+            elif len(self._queue) >= self.max_batch:
+                self._batch_full.notify()
+        if lead:
+            self._send_batches()
+        return [future.result() for future in futures]
+
+    def _send_batches(self):
+        """Hold the window open, then send everything queued in batches."""
+        deadline = time.monotonic() + self.window
+        with self._lock:
+            while len(self._queue) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._batch_full.wait(remaining)
+            queued, self._queue = self._queue, []
+            # Texts queued from now on start a new window with a new leader
+            self._collecting = False
+
+        sent = 0
+        try:
+            while sent < len(queued):
+                batch = queued[sent:sent + self.max_batch]
+                try:
+                    results = self.fetch(batch)
+                except Exception:
+                    results = None
+                with self._lock:
+                    self.backend_calls += 1
+                    self.backend_texts += len(batch)
+                self._resolve(batch, results)
+                sent += len(batch)
+        finally:
+            # If the leader is interrupted (KeyboardInterrupt, SystemExit), the
+            # texts it did not finish fail instead of leaving their callers,
+            # and everyone asking for them later, waiting forever
+            if sent < len(queued):
+                self._resolve(queued[sent:], None)
+
+    def _resolve(self, texts, results):
+        """Hand each text's result (None for all if results is unusable) to its waiters."""
+        if results is None or len(results) != len(texts):
+            results = [None] * len(texts)
+        with self._lock:
+            futures = [self._in_flight.pop(text) for text in texts]
+        for future, result in zip(futures, results):
+            future.set_result(result)
@@ -6,31 +6,124 @@ to create vector representations of game content and enable more natural
 interactions through semantic search.
 """
 
-import json
-import requests
-import numpy as np
+import os
+import weakref
+from itertools import islice
 from typing import List, Dict, Any, Tuple, Optional
+from items import ITEMS
+from intents import ENTITY_ACTIONS
+from backend_health import BackendHealth
+from lazy_imports import load_numpy, load_requests
 
+DEFAULT_API_URL = "http://localhost:11434/api/embeddings"
+CATALOGS = ("command", "location", "character", "item")  # The <name>_embeddings catalogs
+
+
+class EmbeddingDict(dict):
+    """{key: vector} dict that counts its changes, so indexes built from it can tell when they are stale."""
+    
+    version = 0
+    
+    def __setitem__(self, key, vector):
+        super().__setitem__(key, vector)
+        self.version += 1
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def pop(self, key, *default):
+        self.version += 1
+        return super().pop(key, *default)
+    
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+    
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super().setdefault(key, default)
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+    
+    def clear(self):
+        super().clear()
+        self.version += 1
 
 
 class EmbeddingsEngine:
     """Handles embeddings generation and semantic search using Ollama's API."""
     
-    def __init__(self, model_name="nomic-embed-text", api_url="http://localhost:11434/api/embeddings"):
+    def __init__(self, model_name="nomic-embed-text", api_url=None, timeout=10.0,
+                 ann_min_size=None, ann_probe=8, storage="list", pca_dims=None,
+                 coalesce_window=None, coalesce_batch=64, async_workers=32):
         """
         Initialize the embeddings engine.
         
         Args:
             model_name (str): Name of the embedding model to use
             api_url (str): URL of the Ollama API endpoint
+                (default: $THE_LINE_OLLAMA_URL or the local Ollama server)
+            timeout (float): Seconds to wait for the server before giving up
+            ann_min_size (int): Catalog size from which find_best_* search an
+                approximate IVF index instead of every entry (default: never)
+            ann_probe (int): IVF groups searched per query; raise for recall,
+                lower for speed
+            storage (str): How catalog vectors are kept: 'list' (plain
+                Python lists) or 'float32', 'float16' or 'int8' arrays
+            pca_dims (int): With array storage, reduce large catalogs to this
+                many dimensions (default: keep all)
+            coalesce_window (float): Seconds to gather concurrent requests into
+                one batch, merging identical texts; for engines shared by many
+                sessions (default: send every request straight away)
+            coalesce_batch (int): Most texts per coalesced batch request
+            async_workers (int): Most requests the async methods have open
+                at once; further lookups wait their turn
         """
         self.model_name = model_name
-        self.api_url = api_url
-        self.command_embeddings = {}
-        self.location_embeddings = {}
-        self.character_embeddings = {}
-        self.item_embeddings = {}
+        self.api_url = api_url or os.environ.get("THE_LINE_OLLAMA_URL", DEFAULT_API_URL)
+        self.timeout = timeout
+        self.calls = 0  # Embedding requests made, for benchmarks and evaluation
+        self.command_embeddings = EmbeddingDict()
+        self.location_embeddings = EmbeddingDict()
+        self.character_embeddings = EmbeddingDict()
+        self.item_embeddings = EmbeddingDict()
+        self.intent_index = None  # Joint command+entity EmbeddingTable
+        self.storage = storage
+        self.pca_dims = pca_dims
+        self.ann_min_size = ann_min_size
+        self.ann_probe = ann_probe
+        self._ann_indexes = {}  # id(embedding dict) -> (embedding dict, its version, IVFIndex)
+        self.shared_catalog = None  # SharedCatalog the catalogs are read from, if attached
+        self.health = BackendHealth(probe=self.probe)  # Up/down state of the server
+        self.batch_supported = True  # False once the batch endpoint turned out to be missing
+        self.coalescer = None
+        if coalesce_window is not None:
+            from coalescer import RequestCoalescer
+            self.coalescer = RequestCoalescer(self._request_embeddings, coalesce_window, coalesce_batch)
+        self.async_workers = async_workers
+        self._executor = None  # Thread pool behind the async methods, created on first use
+        # Event loop -> {text: future of an aget_embedding() request}; futures
+        # belong to one loop, and a loop's entry goes away with the loop
+        self._async_in_flight = weakref.WeakKeyDictionary()
         
+    def _store(self, embeddings):
+        """Return a catalog in the configured storage format."""
+        if self.storage == "list":
+            return embeddings if isinstance(embeddings, EmbeddingDict) else EmbeddingDict(embeddings)
+        if not embeddings:
+            return embeddings
+        from vector_store import CompactEmbeddings
+        if isinstance(embeddings, CompactEmbeddings):
+            return embeddings
+        return CompactEmbeddings.from_vectors(embeddings, precision=self.storage, pca_dims=self.pca_dims)
+    
     def get_embedding(self, text: str) -> Optional[List[float]]:
         """
         Get embedding vector for a text using Ollama's API.
@@ -41,23 +134,98 @@ class EmbeddingsEngine:
         Returns:
             List[float] or None: Embedding vector or None if request failed
         """
+        if self.coalescer is not None:
+            return self.coalescer.get(text)
+        return self._request_embedding(text)
+    
+    def _request_embedding(self, text: str, force: bool = False) -> Optional[List[float]]:
+        """Send one text to the single-text endpoint (unless the backend is down and force is off)."""
+        if not (force or self.health.healthy):
+            return None
+        self.calls += 1
         try:
             payload = {
                 "model": self.model_name,
                 "prompt": text
             }
-            response = requests.post(self.api_url, json=payload)
+            response = load_requests().post(self.api_url, json=payload, timeout=self.timeout)
             
             if response.status_code == 200:
                 result = response.json()
+                self.health.record_success()
                 return result.get("embedding")
             else:
-                print(f"Error getting embedding: {response.status_code}")
-                print(f"Response: {response.text}")
+                self.health.record_failure(f"HTTP {response.status_code}: {response.text}")
                 return None
         except Exception as e:
-            print(f"Exception when calling Ollama API: {e}")
+            self.health.record_failure(e)
+            return None
+    
+    def probe(self) -> bool:
+        """
+        Send one small request even while the backend is marked down.
+        
+        Returns:
+            bool: True if the embedding server answered
+        """
+        return self._request_embedding("ping", force=True) is not None
+    
+    @property
+    def available(self) -> bool:
+        """Whether requests are currently being sent to the embedding server."""
+        return self.health.healthy
+    
+    def get_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Get embedding vectors for several texts with one request to Ollama's batch API.
+        
+        Falls back to one request per text if the batch endpoint is unavailable.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            List[List[float]] or None: One vector per text, or None if any request failed
+        """
+        if self.coalescer is not None:
+            embeddings = self.coalescer.get_many(texts)
+            return embeddings if all(embeddings) else None
+        return self._request_embeddings(texts)
+    
+    def _request_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Send several texts to the batch endpoint (or one by one if it is missing)."""
+        if not self.health.healthy:
             return None
+        if self.batch_supported:
+            self.calls += 1
+            try:
+                payload = {
+                    "model": self.model_name,
+                    "input": list(texts)
+                }
+                response = load_requests().post(self.batch_url, json=payload, timeout=self.timeout)
+                
+                if response.status_code == 200:
+                    embeddings = response.json().get("embeddings")
+                    if embeddings and len(embeddings) == len(texts):
+                        self.health.record_success()
+                        return embeddings
+                elif response.status_code == 404:
+                    # Don't pay for the missing endpoint again on every batch
+                    self.batch_supported = False
+            except Exception as e:
+                self.health.record_failure(e)
+                return None
+        
+        # Older Ollama versions only have the single-text endpoint
+        embeddings = [self._request_embedding(text) for text in texts]
+        return embeddings if all(embeddings) else None
+    
+    @property
+    def batch_url(self) -> str:
+        """URL of the batch endpoint (/api/embed) next to the configured one."""
+        base, _, _ = self.api_url.rpartition("/api/")
+        return f"{base}/api/embed" if base else self.api_url
     
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """
@@ -70,6 +238,7 @@ class EmbeddingsEngine:
         Returns:
             float: Cosine similarity (-1 to 1, higher is more similar)
         """
+        np = load_numpy()
         vec1 = np.array(vec1)
         vec2 = np.array(vec2)
         return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
@@ -78,7 +247,11 @@ class EmbeddingsEngine:
         """
         Initialize embeddings for standard game commands.
         """
-        commands = {
+        self.command_embeddings = self._embed_catalog(self.command_embeddings, self._command_descriptions())
+    
+    def _command_descriptions(self):
+        """Return {command: description} for the standard game commands."""
+        return {
             "look": "examine surroundings, check environment, see what's around, observe area",
             "status": "check health, view inventory, see stats, character status, personal condition",
             "talk": "speak to character, converse with person, chat with npc, communicate",
@@ -91,11 +264,14 @@ class EmbeddingsEngine:
             "help": "show commands, display help, list options, assistance",
             "quit": "exit game, end session, stop playing, leave game"
         }
-        
-        for cmd, description in commands.items():
+    
+    def _embed_catalog(self, embeddings, descriptions):
+        """Add an embedding for each described key that could be embedded and return the stored catalog."""
+        for key, description in descriptions.items():
             embedding = self.get_embedding(description)
             if embedding:
-                self.command_embeddings[cmd] = embedding
+                embeddings[key] = embedding
+        return self._store(embeddings)
     
     def initialize_location_embeddings(self, locations):
         """
@@ -104,6 +280,12 @@ class EmbeddingsEngine:
         Args:
             locations (dict): Dictionary of location objects
         """
+        self.location_embeddings = self._embed_catalog(self.location_embeddings,
+                                                       self._location_descriptions(locations))
+    
+    def _location_descriptions(self, locations):
+        """Return {location id: description} for locations."""
+        descriptions = {}
         for location_id, location in locations.items():
             # Create rich description for embedding
             description = f"{location.name}: {location.description}"
@@ -118,9 +300,8 @@ class EmbeddingsEngine:
                 if hasattr(location, 'services') and location.services:
                     description += f" Services available: {', '.join(location.services)}."
             
-            embedding = self.get_embedding(description)
-            if embedding:
-                self.location_embeddings[location_id] = embedding
+            descriptions[location_id] = description
+        return descriptions
     
     def initialize_character_embeddings(self, characters):
         """
@@ -129,6 +310,12 @@ class EmbeddingsEngine:
         Args:
             characters (list): List of character objects
         """
+        self.character_embeddings = self._embed_catalog(self.character_embeddings,
+                                                        self._character_descriptions(characters))
+    
+    def _character_descriptions(self, characters):
+        """Return {lowercase name: description} for characters."""
+        descriptions = {}
         for character in characters:
             # Create rich description for embedding
             description = f"{character.name}: {character.description}"
@@ -139,9 +326,8 @@ class EmbeddingsEngine:
             if hasattr(character, 'years_of_service'):
                 description += f" {character.years_of_service} years of service in border patrol."
             
-            embedding = self.get_embedding(description)
-            if embedding:
-                self.character_embeddings[character.name.lower()] = embedding
+            descriptions[character.name.lower()] = description
+        return descriptions
     
     def initialize_item_embeddings(self, items):
         """
@@ -150,25 +336,183 @@ class EmbeddingsEngine:
         Args:
             items (list): List of item names
         """
-        item_descriptions = {
-            "water bottle": "container for drinking water, hydration, liquid container",
-            "canned food": "preserved food, nutrition, sustenance, meal",
-            "blanket": "cloth for warmth, covering, protection from cold",
-            "map": "navigation tool, directions, guide, area layout",
-            "flashlight": "portable light, torch, illumination tool",
-            "first aid kit": "medical supplies, bandages, treatment, health items",
-            "compass": "navigation tool, direction finder, orientation device",
-            "family photo": "picture of loved ones, personal memento, memory",
-            "money": "currency, cash, funds, financial resource",
-            "id papers": "identification documents, passport, legal papers"
+        self.item_embeddings = self._embed_catalog(self.item_embeddings, self._item_descriptions(items))
+    
+    def _item_descriptions(self, items):
+        """Return {lowercase name: description} for item names."""
+        return {item.lower(): ITEMS.description_for(item) for item in items}
+    
+    def initialize_intent_index(self):
+        """
+        Build the joint command+entity index from the command, character and item embeddings.
+        
+        Every command is one entry, keyed (command, None); talk, take and use
+        are instead paired with each character or item they can target, keyed
+        e.g. ("talk", "manuel"). A paired entry is the mean of the unit command
+        and entity vectors, so it scores the mean of the two similarities.
+        """
+        self.intent_index = self._intent_index(self.command_embeddings, self.character_embeddings,
+                                               self.item_embeddings)
+    
+    def _intent_index(self, command_embeddings, character_embeddings, item_embeddings):
+        """Return the joint index of initialize_intent_index() for the given catalogs."""
+        from vector_store import EmbeddingTable
+        np = load_numpy()
+        commands = EmbeddingTable.from_vectors(command_embeddings)
+        entities = {
+            "character": EmbeddingTable.from_vectors(character_embeddings),
+            "item": EmbeddingTable.from_vectors(item_embeddings),
         }
+        keys = []
+        rows = []
+        for command, command_vector in zip(commands.keys, commands.matrix):
+            kind = ENTITY_ACTIONS.get(command)
+            if kind is None:
+                keys.append((command, None))
+                rows.append(command_vector)
+                continue
+            table = entities[kind]
+            for entity, entity_vector in zip(table.keys, table.matrix):
+                keys.append((command, entity))
+                rows.append((command_vector + entity_vector) / 2)
+        return EmbeddingTable(keys, np.asarray(rows, dtype=np.float32)) if rows else None
+    
+    def _descriptions(self, locations, characters, items):
+        """Return {catalog name: {key: description}} for the game content."""
+        return {
+            "command": self._command_descriptions(),
+            "location": self._location_descriptions(locations),
+            "character": self._character_descriptions(characters),
+            "item": self._item_descriptions(items),
+        }
+    
+    def build_catalogs(self, locations, characters, items) -> Optional[Dict[str, Any]]:
+        """
+        Embed the game content into new catalogs, leaving the current ones untouched.
         
-        for item in items:
-            item_lower = item.lower()
-            description = item_descriptions.get(item_lower, item)
-            embedding = self.get_embedding(description)
-            if embedding:
-                self.item_embeddings[item_lower] = embedding
+        Args:
+            locations (dict): Dictionary of location objects
+            characters (list): List of character objects
+            items (list): List of item names
+            
+        Returns:
+            Dict[str, Any] or None: The 'command', 'location', 'character' and
+                'item' catalogs and the 'intent' index for use_catalogs(), or
+                None if any description could not be embedded
+        """
+        descriptions = self._descriptions(locations, characters, items)
+        catalogs = {}
+        for name, catalog_descriptions in descriptions.items():
+            catalogs[name] = self._embed_catalog({}, catalog_descriptions)
+            if len(catalogs[name]) < len(catalog_descriptions):
+                return None
+        catalogs["intent"] = self._intent_index(catalogs["command"], catalogs["character"], catalogs["item"])
+        return catalogs
+    
+    def use_catalogs(self, catalogs: Dict[str, Any]):
+        """
+        Switch to a complete set of catalogs, such as build_catalogs() returns.
+        
+        Each catalog is replaced by a single assignment, so lookups running
+        meanwhile see either the old or the new one, never a half-built one.
+        
+        Args:
+            catalogs (Dict[str, Any]): Catalogs by name, and the 'intent' index
+        """
+        for name in CATALOGS:
+            setattr(self, f"{name}_embeddings", catalogs.get(name, EmbeddingDict()))
+        self.intent_index = catalogs.get("intent")
+        self._ann_indexes = {}
+    
+    def catalogs(self) -> Dict[str, Any]:
+        """
+        Return the engine's catalogs in array form, for CatalogPublisher.
+        
+        Returns:
+            Dict[str, Any]: A CompactEmbeddings per non-empty catalog ('command',
+                'location', 'character', 'item') and the intent index ('intent')
+        """
+        from vector_store import CompactEmbeddings
+        catalogs = {}
+        for name in CATALOGS:
+            embeddings = getattr(self, f"{name}_embeddings")
+            if not embeddings:
+                continue
+            if not isinstance(embeddings, CompactEmbeddings):
+                embeddings = CompactEmbeddings.from_vectors(embeddings, precision="float32")
+            catalogs[name] = embeddings
+        if self.intent_index is not None:
+            catalogs["intent"] = self.intent_index
+        return catalogs
+    
+    def attach_catalogs(self, name: str):
+        """
+        Search catalogs published by another process instead of building them.
+        
+        The catalogs are read-only views of shared memory; changing one
+        gives this engine a private copy of it.
+        
+        Args:
+            name (str): Name the catalogs were published under
+        """
+        from shared_catalog import SharedCatalog
+        self.shared_catalog = SharedCatalog(name)
+        self.use_catalogs(self.shared_catalog.catalogs)
+    
+    def refresh_catalogs(self) -> bool:
+        """
+        Switch to a newer published version of the attached catalogs, if any.
+        
+        Returns:
+            bool: True if the catalogs changed
+        """
+        if self.shared_catalog is None or not self.shared_catalog.refresh():
+            return False
+        self.use_catalogs(self.shared_catalog.catalogs)
+        return True
+    
+    def rank_intents(self, user_input: str, k: int = 5,
+                     threshold: Optional[float] = None) -> List[Tuple[Tuple[str, Optional[str]], float]]:
+        """
+        Rank complete intents for user input with a single embedding request.
+        
+        Args:
+            user_input (str): User's input text
+            k (int): Number of intents to return
+            threshold (float): Minimum score to include an intent (optional)
+            
+        Returns:
+            List[Tuple[Tuple[str, str], float]]: ((command, entity), score) pairs,
+                best first; entity is None for commands without a target
+        """
+        if not self.intent_index:
+            return []
+            
+        input_embedding = self.get_embedding(user_input)
+        if not input_embedding:
+            return []
+        return self.intent_index.search(input_embedding, k, threshold)
+    
+    def rank_intents_batch(self, texts: List[str], k: int = 5,
+                           threshold: Optional[float] = None) -> List[List[Tuple[Tuple[str, Optional[str]], float]]]:
+        """
+        Rank complete intents for several inputs with one batched embedding request.
+        
+        Args:
+            texts (List[str]): Input texts
+            k (int): Number of intents to return per text
+            threshold (float): Minimum score to include an intent (optional)
+            
+        Returns:
+            List: A rank_intents() result per text (empty lists if embedding failed)
+        """
+        if not self.intent_index or not texts:
+            return [[] for _ in texts]
+            
+        input_embeddings = self.get_embeddings(texts)
+        if not input_embeddings:
+            return [[] for _ in texts]
+        return self.intent_index.search_many(input_embeddings, k, threshold)
     
     def find_best_command(self, user_input: str, threshold: float = 0.7) -> Tuple[Optional[str], float]:
         """
@@ -184,22 +528,12 @@ class EmbeddingsEngine:
         if not self.command_embeddings:
             return None, 0
             
-        input_embedding = self.get_embedding(user_input)
-        if not input_embedding:
-            return None, 0
-            
-        best_command = None
-        best_score = 0
-        
-        for command, cmd_embedding in self.command_embeddings.items():
-            similarity = self.cosine_similarity(input_embedding, cmd_embedding)
-            if similarity > best_score:
-                best_score = similarity
-                best_command = command
-        
-        if best_score >= threshold:
-            return best_command, best_score
-        return None, 0
+        return self._best_command(self.get_embedding(user_input), threshold)
+    
+    def _best_command(self, input_embedding, threshold):
+        """Return find_best_command()'s result for an already computed input embedding."""
+        # Scored like any catalog, so compact command catalogs are searched in compact form
+        return self._best_match(input_embedding, self.command_embeddings, threshold)
     
     def find_best_match(self, user_input: str, embedding_dict: Dict[str, List[float]], 
                        threshold: float = 0.7) -> Tuple[Optional[str], float]:
@@ -217,9 +551,25 @@ class EmbeddingsEngine:
         if not embedding_dict:
             return None, 0
             
-        input_embedding = self.get_embedding(user_input)
+        return self._best_match(self.get_embedding(user_input), embedding_dict, threshold)
+    
+    def _best_match(self, input_embedding, embedding_dict, threshold):
+        """Return find_best_match()'s result for an already computed input embedding."""
         if not input_embedding:
             return None, 0
+        
+        # Compact catalogs are scored in their compact form
+        from vector_store import CompactEmbeddings
+        if isinstance(embedding_dict, CompactEmbeddings):
+            results = embedding_dict.search(input_embedding, k=1, threshold=threshold)
+            return results[0] if results else (None, 0)
+        
+        index = self._ann_index(embedding_dict)
+        if index is not None:
+            results = index.search(input_embedding, k=1, n_probe=self.ann_probe)
+            if results and results[0][1] >= threshold:
+                return results[0]
+            return None, 0
             
         best_entity = None
         best_score = 0
@@ -234,38 +584,167 @@ class EmbeddingsEngine:
             return best_entity, best_score
         return None, 0
     
-    def find_best_location(self, description: str) -> Tuple[Optional[str], float]:
+    def _ann_index(self, embedding_dict):
+        """
+        Return the IVF index kept in step with a large embedding dict, or None.
+        
+        The index is rebuilt whenever the version of an EmbeddingDict has
+        changed since it was built (any entry added, replaced or removed).
+        Plain dicts carry no version: entries added to them since the last
+        search are inserted, and the index is rebuilt if entries were removed.
+        """
+        if self.ann_min_size is None or len(embedding_dict) < self.ann_min_size:
+            return None
+        from ann import IVFIndex
+        version = getattr(embedding_dict, "version", None)
+        entry = self._ann_indexes.get(id(embedding_dict))
+        if (entry is None or entry[0] is not embedding_dict or entry[1] != version
+                or len(entry[2]) > len(embedding_dict)):
+            entry = (embedding_dict, version, IVFIndex(n_probe=self.ann_probe, min_train_size=self.ann_min_size))
+            self._ann_indexes[id(embedding_dict)] = entry
+        index = entry[2]
+        if len(index) < len(embedding_dict):
+            keys = list(islice(embedding_dict, len(index), None))
+            index.add_many(keys, [embedding_dict[key] for key in keys])
+        return index
+    
+    def find_best_location(self, description: str, threshold: float = 0.7) -> Tuple[Optional[str], float]:
         """
         Find the best matching location for a description.
         
         Args:
             description (str): Location description
+            threshold (float): Minimum similarity threshold to consider a match
             
         Returns:
             Tuple[str, float]: Best matching location ID and similarity score
         """
-        return self.find_best_match(description, self.location_embeddings)
+        return self.find_best_match(description, self.location_embeddings, threshold)
     
-    def find_best_character(self, description: str) -> Tuple[Optional[str], float]:
+    def find_best_character(self, description: str, threshold: float = 0.7) -> Tuple[Optional[str], float]:
         """
         Find the best matching character for a description.
         
         Args:
             description (str): Character description
+            threshold (float): Minimum similarity threshold to consider a match
             
         Returns:
             Tuple[str, float]: Best matching character name and similarity score
         """
-        return self.find_best_match(description, self.character_embeddings)
+        return self.find_best_match(description, self.character_embeddings, threshold)
     
-    def find_best_item(self, description: str) -> Tuple[Optional[str], float]:
+    def find_best_item(self, description: str, threshold: float = 0.7) -> Tuple[Optional[str], float]:
         """
         Find the best matching item for a description.
         
         Args:
             description (str): Item description
+            threshold (float): Minimum similarity threshold to consider a match
             
         Returns:
             Tuple[str, float]: Best matching item name and similarity score
         """
-        return self.find_best_match(description, self.item_embeddings)
\ No newline at end of file
+        return self.find_best_match(description, self.item_embeddings, threshold)
+    
+    # Async counterparts, for servers running many sessions on one event loop.
+    # Requests run in a bounded thread pool, so the loop never blocks on HTTP;
+    # scoring is done on the loop, as it takes microseconds.
+    
+    def _async_executor(self):
+        """Return the thread pool the async methods send requests from."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.async_workers,
+                                                thread_name_prefix="embeddings")
+        return self._executor
+    
+    async def aget_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Async counterpart of get_embedding().
+        
+        Concurrent lookups of the same text share one request.
+        
+        Args:
+            text (str): Text to embed
+            
+        Returns:
+            List[float] or None: Embedding vector or None if request failed
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        in_flight = self._async_in_flight.setdefault(loop, {})
+        future = in_flight.get(text)
+        if future is None:
+            future = loop.run_in_executor(self._async_executor(), self.get_embedding, text)
+            in_flight[text] = future
+            future.add_done_callback(lambda _: in_flight.pop(text, None))
+        # A cancelled caller must not cancel the request for the others
+        return await asyncio.shield(future)
+    
+    async def aget_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Async counterpart of get_embeddings(): one batch request for several texts.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            List[List[float]] or None: One vector per text, or None if any request failed
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._async_executor(), self.get_embeddings, list(texts))
+    
+    async def ainitialize(self, locations, characters, items) -> bool:
+        """
+        Async counterpart of build_catalogs() followed by use_catalogs().
+        
+        Every description is embedded concurrently. The catalogs are built
+        aside and only swapped in if all of them are complete.
+        
+        Args:
+            locations (dict): Dictionary of location objects
+            characters (list): List of character objects
+            items (list): List of item names
+            
+        Returns:
+            bool: True if the new catalogs are in use, False if any
+                description could not be embedded (the current ones are kept)
+        """
+        import asyncio
+        descriptions = self._descriptions(locations, characters, items)
+        embedded = await asyncio.gather(*(self.aget_embedding(description)
+                                          for catalog_descriptions in descriptions.values()
+                                          for description in catalog_descriptions.values()))
+        if not all(embedded):
+            return False
+        embedded = iter(embedded)
+        catalogs = {name: self._store(EmbeddingDict(zip(catalog_descriptions, embedded)))
+                    for name, catalog_descriptions in descriptions.items()}
+        catalogs["intent"] = self._intent_index(catalogs["command"], catalogs["character"], catalogs["item"])
+        self.use_catalogs(catalogs)
+        return True
+    
+    async def arank_intents(self, user_input: str, k: int = 5,
+                            threshold: Optional[float] = None) -> List[Tuple[Tuple[str, Optional[str]], float]]:
+        """Async counterpart of rank_intents()."""
+        if not self.intent_index:
+            return []
+        input_embedding = await self.aget_embedding(user_input)
+        if not input_embedding:
+            return []
+        return self.intent_index.search(input_embedding, k, threshold)
+    
+    async def afind_best_command(self, user_input: str, threshold: float = 0.7) -> Tuple[Optional[str], float]:
+        """Async counterpart of find_best_command()."""
+        if not self.command_embeddings:
+            return None, 0
+        return self._best_command(await self.aget_embedding(user_input), threshold)
+    
+    async def afind_best_match(self, user_input: str, embedding_dict: Dict[str, List[float]],
+                               threshold: float = 0.7) -> Tuple[Optional[str], float]:
+        """Async counterpart of find_best_match()."""
+        if not embedding_dict:
+            return None, 0
+        return self._best_match(await self.aget_embedding(user_input), embedding_dict, threshold)
@@ -11,7 +11,7 @@ import random
 class Event:
     """Base class for all game events."""
     
-    def __init__(self, name, description, location_types=None):
+    def __init__(self, name, description, location_types=None, preconditions=None):
         """
         Initialize an event.
         
@@ -19,10 +19,13 @@ class Event:
             name (str): Name of the event
             description (str): Description of the event
             location_types (list): Types of locations where this event can occur
+            preconditions (dict): Optional requirements checked by the rule engine:
+                'flags' {flag: value}, 'stats' {stat: (min, max)}, 'locations' [names]
         """
         self.name = name
         self.description = description
         self.location_types = location_types or []
+        self.preconditions = preconditions or {}
         
     def can_occur(self, location):
         """Check if this event can occur at the given location."""
@@ -50,7 +53,7 @@ class Event:
 class EncounterEvent(Event):
     """An event where the character encounters someone or something."""
     
-    def __init__(self, name, description, encounter_type, location_types=None):
+    def __init__(self, name, description, encounter_type, location_types=None, preconditions=None):
         """
         Initialize an encounter event.
         
@@ -59,8 +62,9 @@ class EncounterEvent(Event):
             description (str): Description of the event
             encounter_type (str): Type of encounter ('migrant', 'patrol', 'local')
             location_types (list): Types of locations where this event can occur
+            preconditions (dict): Optional rule engine requirements (see Event)
         """
-        super().__init__(name, description, location_types)
+        super().__init__(name, description, location_types, preconditions)
         self.encounter_type = encounter_type
         
     def execute(self, game, character):
@@ -68,17 +72,17 @@ class EncounterEvent(Event):
         base_result = super().execute(game, character)
         
         # Different outcomes based on encounter type
-        if self.encounter_type == 'patrol' and hasattr(character, 'hope'):
+        if self.encounter_type == 'patrol' and character.tracks_hope:
             # Migrants lose hope when encountering patrol
             character.hope = max(0, character.hope - 20)
             return f"{base_result}\n{character.name}'s hope diminishes."
             
-        elif self.encounter_type == 'migrant' and hasattr(character, 'stress'):
+        elif self.encounter_type == 'migrant' and character.tracks_stress:
             # Border patrol agents gain stress when encountering migrants
             character.stress = min(100, character.stress + 10)
             return f"{base_result}\n{character.name}'s stress increases."
             
-        elif self.encounter_type == 'local' and hasattr(character, 'hope'):
+        elif self.encounter_type == 'local' and character.tracks_hope:
             # Migrants gain hope when encountering helpful locals
             character.hope = min(100, character.hope + 10)
             return f"{base_result}\n{character.name} feels more hopeful."
@@ -89,7 +93,7 @@ class EncounterEvent(Event):
 class ResourceEvent(Event):
     """An event related to finding or losing resources."""
     
-    def __init__(self, name, description, resource_type, amount, location_types=None):
+    def __init__(self, name, description, resource_type, amount, location_types=None, preconditions=None):
         """
         Initialize a resource event.
         
@@ -99,8 +103,9 @@ class ResourceEvent(Event):
             resource_type (str): Type of resource ('water', 'food', 'health', 'item')
             amount (int): Amount gained (positive) or lost (negative)
             location_types (list): Types of locations where this event can occur
+            preconditions (dict): Optional rule engine requirements (see Event)
         """
-        super().__init__(name, description, location_types)
+        super().__init__(name, description, location_types, preconditions)
         self.resource_type = resource_type
         self.amount = amount
         
@@ -108,14 +113,14 @@ class ResourceEvent(Event):
         """Execute the resource event."""
         base_result = super().execute(game, character)
         
-        if self.resource_type == 'water' and hasattr(character, 'water'):
+        if self.resource_type == 'water' and character.tracks_supplies:
             character.water = max(0, min(100, character.water + self.amount))
             if self.amount > 0:
                 return f"{base_result}\n{character.name} found water."
             else:
                 return f"{base_result}\n{character.name} lost water."
                 
-        elif self.resource_type == 'food' and hasattr(character, 'food'):
+        elif self.resource_type == 'food' and character.tracks_supplies:
             character.food = max(0, min(100, character.food + self.amount))
             if self.amount > 0:
                 return f"{base_result}\n{character.name} found food."
@@ -134,23 +139,22 @@ class ResourceEvent(Event):
                 # Add a random item from game's item pool
                 item = random.choice(game.items)
                 character.add_to_inventory(item)
+                if item == 'Money':
+                    character.set_flag("has_money", True)
                 return f"{base_result}\n{character.name} found {item}."
             elif self.amount < 0 and character.inventory:
                 # Remove a random item from inventory
-                item = random.choice(character.inventory)
+                item = character.inventory.random_item()
                 character.remove_from_inventory(item)
                 return f"{base_result}\n{character.name} lost {item}."
-        
-        elif self.resource_type == 'item' and item == 'Money':
-            self.player.set_flag("has_money", True)
-                
+
         return base_result
 
 
 class MoralEvent(Event):
     """An event that presents a moral choice to the character."""
     
-    def __init__(self, name, description, choices, consequences, location_types=None):
+    def __init__(self, name, description, choices, consequences, location_types=None, preconditions=None):
         """
         Initialize a moral event.
         
@@ -160,8 +164,9 @@ class MoralEvent(Event):
             choices (list): List of possible choices
             consequences (list): List of consequences for each choice
             location_types (list): Types of locations where this event can occur
+            preconditions (dict): Optional rule engine requirements (see Event)
         """
-        super().__init__(name, description, location_types)
+        super().__init__(name, description, location_types, preconditions)
         self.choices = choices
         self.consequences = consequences
         
@@ -182,7 +187,7 @@ class MoralEvent(Event):
         while True:
             try:
                 # Modified the prompt text slightly for clarity
-                choice_input = input(f"Enter choice (1-{len(self.choices)}): ")
+                choice_input = game.read_input(f"Enter choice (1-{len(self.choices)}): ")
                 choice_index = int(choice_input) - 1
                 if 0 <= choice_index < len(self.choices):
                     break
@@ -192,14 +197,15 @@ class MoralEvent(Event):
                 print("Invalid input. Please enter a number.")
                 
         consequence = self.consequences[choice_index]
+        game.note_choice(self, choice_index)
         
         # Apply the consequence based on character type
-        if hasattr(character, 'moral_compass'):
+        if character.tracks_morality:
             # Border patrol moral compass adjustment
             moral_impact = consequence.get('moral_impact', 0)
             character.moral_compass = max(0, min(100, character.moral_compass + moral_impact))
             
-        if hasattr(character, 'hope'):
+        if character.tracks_hope:
             # Migrant hope adjustment
             hope_impact = consequence.get('hope_impact', 0)
             character.hope = max(0, min(100, character.hope + hope_impact))
@@ -291,6 +297,44 @@ def create_common_events():
                 {"description": "Authorities investigate but your status is now known.", "hope_impact": -15, "moral_impact": 5}
             ],
             [Settlement]
+        ),
+
+        # Follow-up events gated on story flags and stats
+        EncounterEvent(
+            "Word of the Alarm",
+            "News of the alarm at the wall has spread. A patrol truck idles at the edge of town, its driver studying every face.",
+            "patrol", [Settlement],
+            preconditions={'flags': {'crossed_border': True}}
+        ),
+        ResourceEvent(
+            "Startled Wildlife",
+            "The animals you disturbed with your diversion are still restless. A javelina charges from the brush.",
+            "health", -10, [Desert, Border],
+            preconditions={'flags': {'created_diversion': True}}
+        ),
+        ResourceEvent(
+            "A Child's Thirst",
+            "The child walking beside you asks for water again. You cannot say no.",
+            "water", -10, [Desert, Border],
+            preconditions={'flags': {'has_child': True}}
+        ),
+        EncounterEvent(
+            "Reunited Family",
+            "A woman recognizes you from the crossing - the family you searched for made it here. She presses your hands in thanks.",
+            "local", [Settlement],
+            preconditions={'flags': {'helped_family': True}}
+        ),
+        ResourceEvent(
+            "Payday",
+            "The work was hard, but the foreman pays what he promised. You buy a real meal.",
+            "food", 20, [Settlement],
+            preconditions={'flags': {'employed': True}}
+        ),
+        ResourceEvent(
+            "Humanitarian Water Drop",
+            "Blue flags mark jugs of water left by volunteers, found just when you need them most.",
+            "water", 25, [Desert],
+            preconditions={'stats': {'water': (None, 30)}}
         )
     ]
 
@@ -0,0 +1,146 @@
+"""
+Fuzzy name matching for 'The Line: A Border Journey'
+
+This module corrects typos in character and item names ("manul",
+"flashlite", "hernandes") locally, before the game falls back to an
+embedding request. Names and aliases are indexed by their trigrams; a
+name typed with k typos still shares most of its trigrams with the real
+one, so only a handful of candidates need an edit distance check.
+"""
+
+
+def edit_distance(a, b, limit=None):
+    """Return the Levenshtein distance between two strings: the number of
+    single-character insertions, deletions and substitutions between them.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        limit (int): Give up as soon as the distance is known to be larger
+            than this, returning some value above limit (optional)
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    if not b:
+        return len(a)
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        left = i
+        for j, char_b in enumerate(b, 1):
+            if char_a == char_b:
+                left = previous[j - 1]
+            else:
+                left = min(previous[j], left, previous[j - 1]) + 1
+            current.append(left)
+        # Distances never shrink from one row to the next
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def trigrams(text):
+    """Return the set of three-character substrings of a padded string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def typo_budget(text):
+    """Return how many edits a name of this length may contain and still be recognized."""
+    if len(text) <= 3:
+        return 0
+    if len(text) <= 5:
+        return 1
+    if len(text) <= 7:
+        return 2
+    return 3
+
+
+class NameIndex:
+    """Typo-tolerant lookup from names and aliases to canonical names."""
+
+    def __init__(self, names=()):
+        """
+        Initialize the index.
+
+        Args:
+            names (iterable): (alias, canonical name) pairs
+        """
+        self.canonical = {}  # lowercase alias -> canonical name
+        self.grams = {}      # trigram -> aliases containing it
+        self.gram_counts = {}  # alias -> number of distinct trigrams
+        for alias, name in names:
+            self.add(alias, name)
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def add(self, alias, name):
+        """Make a name findable by an alias (and by the alias's typos)."""
+        alias = alias.lower()
+        if alias in self.canonical:
+            return
+        self.canonical[alias] = name
+        grams = trigrams(alias)
+        self.gram_counts[alias] = len(grams)
+        for gram in grams:
+            self.grams.setdefault(gram, []).append(alias)
+
+    def candidates(self, text, budget):
+        """Return the aliases that could be within budget edits of text."""
+        grams = trigrams(text)
+        # Each edit changes at most three trigrams
+        needed = len(grams) - 3 * budget
+        if needed <= 0:
+            return [alias for alias in self.canonical if abs(len(alias) - len(text)) <= budget]
+        shared = {}
+        for gram in grams:
+            for alias in self.grams.get(gram, ()):
+                shared[alias] = shared.get(alias, 0) + 1
+        return [alias for alias, count in shared.items()
+                if count >= max(needed, self.gram_counts[alias] - 3 * budget)]
+
+    def match(self, text, k=3):
+        """Return up to k (canonical name, distance) pairs for a name, closest first.
+
+        Args:
+            text (str): Name as the player typed it
+            k (int): Maximum number of matches
+
+        Returns:
+            list: Exact matches have distance 0; an empty list means no
+                known name is within the typo budget
+        """
+        text = text.lower().strip()
+        if text in self.canonical:
+            return [(self.canonical[text], 0)]
+        budget = typo_budget(text)
+        if not budget:
+            return []
+        found = sorted((distance, alias) for alias in self.candidates(text, budget)
+                       for distance in (edit_distance(text, alias, budget),) if distance <= budget)
+        matches = []
+        seen = set()
+        for distance, alias in found:
+            name = self.canonical[alias]
+            if name not in seen:
+                seen.add(name)
+                matches.append((name, distance))
+                if len(matches) == k:
+                    break
+        return matches
+
+    def best(self, text):
+        """Return the closest canonical name for a name, or None."""
+        matches = self.match(text, k=2)
+        if not matches:
+            return None
+        # Two different names equally close to a typo are ambiguous
+        if len(matches) > 1 and matches[1][1] == matches[0][1] and matches[0][1] > 0:
+            return None
+        return matches[0][0]
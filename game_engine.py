@@ -5,41 +5,75 @@ This module handles the core game mechanics, player interactions,
 and gameplay flow for the narrative experience.
 """
 
+import copy
 import random
 import time
 import sys
-from unittest import result
-from character import Character, Migrant, BorderPatrol
+from character import Character, Migrant, BorderPatrol, NO_FLAGS
 from location import Location, Desert, Border, Settlement
 from events import Event, create_common_events
+from rules import RuleEngine
+from simulation import NPCSimulation
 from embeddings import EmbeddingsEngine
+from items import ITEMS
+from intents import (Intent, DIRECTION_SHORTCUTS, ENTITY_ACTIONS, FIXED_COMMANDS,
+                     may_chain, parse_keywords, split_clauses)
+from fuzzy import NameIndex
+from telemetry import open_telemetry, new_session_id, stat_snapshot, stat_deltas, JOURNEY_STAT_KEYS
+from profiler import NULL_PROFILER, spanned
+from replay import NOT_RECORDED
 
 
 class GameEngine:
     """Main game engine that manages the game state and mechanics."""
     
-    def __init__(self, story):
+    # Attributes holding everything a turn can change (see snapshot())
+    SNAPSHOT_FIELDS = ("story", "player", "world", "current_location", "events", "rule_engine",
+                       "npc_simulation", "turn_count", "game_over", "ending", "ending_type")
+    
+    def __init__(self, story, telemetry=None, seed=None, recording=None, profiler=None, phrase_cache=None):
         """Initialize the game engine.
         
         Args:
             story: The Story instance containing narrative elements
+            telemetry: Session log sink (default: $THE_LINE_TELEMETRY or disabled)
+            seed (int): Random seed for the session (default: a random one)
+            recording: SessionRecording that captures the session's inputs
+            profiler: Profiler timing the phases of each turn (default: disabled)
+            phrase_cache: PhraseCache answering familiar phrasings without the AI engine
         """
         self.story = story
+        self.telemetry = telemetry or open_telemetry()
+        self.profiler = profiler or NULL_PROFILER
+        self.session_id = new_session_id()
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.recording = recording
+        self.phrase_cache = phrase_cache
+        self.playback = None  # Playback feeding recorded inputs instead of input()
+        self._turn = {}  # Telemetry fields gathered during the current turn
         self.player = None
         self.world = {}
         self.current_location = None
         self.events = []
-        self.items = [
-            "Water Bottle", "Canned Food", "Blanket", "Map", "Flashlight",
-            "First Aid Kit", "Compass", "Family Photo", "Money", "ID Papers", "Radio"
-        ]
+        self.rule_engine = None
+        self.npc_simulation = None
+        self.items = ITEMS.names()
+        self.name_index = {}  # "character"/"item" -> NameIndex for typo-tolerant targets
         self.turn_count = 0
         self.game_over = False
+        self.action_succeeded = False  # Whether the last move() or interact() did what was asked
+        # Minimum score for the AI engine to accept an intent from the joint index.
+        # nomic-embed-text scores unrelated text well above 0.5, so this stays
+        # conservative. The benchmarks' hashed stub vectors score far lower and
+        # use STUB_INTENT_THRESHOLD (benchmarks/fake_backend.py) instead.
+        self.intent_threshold = 0.7
+        self.entity_threshold = 0.7
         self.ending = None
         self.ending_type = None  # Track the type of ending the player reaches
         
         # Initialize AI embeddings engine
         self.embeddings_engine = None
+        self.ai_ready = True  # False until the engine's catalogs have been built
         try:
             self.embeddings_engine = EmbeddingsEngine()
             print("AI embeddings engine initialized successfully.")
@@ -165,11 +199,27 @@ class GameEngine:
         fellow_migrant.water = 60
         fellow_migrant.food = 50
         
-        # Add characters to locations
-        self.world["nogales_mx"].add_character(coyote)
-        self.world["border_fence"].add_character(agent)
-        self.world["sonoran_desert"].add_character(fellow_migrant)
-        
+        # Add characters to locations and hand them to the NPC simulation
+        self.npc_simulation = NPCSimulation(self.world, detention_center=self.world.get("detention_center"))
+        self.npc_simulation.add_npc(coyote, self.world["nogales_mx"])
+        self.npc_simulation.add_npc(agent, self.world["border_fence"])
+        self.npc_simulation.add_npc(fellow_migrant, self.world["sonoran_desert"])
+    
+    def simulate_npcs(self):
+        """Advance the NPCs by one turn and report what the player can see."""
+        if not self.npc_simulation:
+            return ""
+        if self.playback is not None:
+            # Re-run exactly as many NPC steps as the recorded tick managed
+            messages = self.npc_simulation.tick(watch=self.current_location,
+                                                limit=self.playback.next_tick())
+        else:
+            messages = self.npc_simulation.tick(watch=self.current_location)
+            if self.recording is not None:
+                self.recording.record_tick(self.npc_simulation.last_tick_processed)
+        if len(messages) > 5:
+            messages = messages[:5] + [f"...and {len(messages) - 5} more comings and goings."]
+        return "\n".join(messages)
 
     # game_engine.py - create_player method
     def create_player(self, name, character_type="migrant", **kwargs):
@@ -201,41 +251,113 @@ class GameEngine:
     def load_events(self):
         """Load events into the game."""
         self.events = create_common_events()
+        self.rule_engine = RuleEngine()
         
         # Add events to appropriate locations
         for event in self.events:
-            for location in self.world.values():
-                if event.can_occur(location):
-                    location.add_event(event)
+            if not event.preconditions:
+                for location in self.world.values():
+                    if event.can_occur(location):
+                        location.add_event(event)
+            self.rule_engine.add_event(event, self.world.values())
+        
+        # Track the player's story flags so gated events unlock as they change
+        if self.player:
+            self.rule_engine.bind(self.player)
                     
+    @property
+    def ai_available(self):
+        """Whether commands can be sent to the AI engine right now."""
+        return bool(self.embeddings_engine) and self.ai_ready and self.embeddings_engine.available
+    
     def initialize_embeddings(self):
-        """Initialize the embeddings engine with game content."""
+        """Initialize the embeddings engine with game content.
+        
+        If the embedding server does not answer, the game starts with basic
+        command processing; the engine probes the server in the background
+        and the embeddings are built as soon as it answers.
+        """
         if not self.embeddings_engine:
             return
-            
+        if self.embeddings_engine.shared_catalog is not None:
+            # Catalogs published by another process are used as they are
+            self.embeddings_engine.refresh_catalogs()
+            return
+        
+        # Copied now: a build in the background must not walk the live world
+        all_characters = []
+        for location in self.world.values():
+            all_characters.extend(location.characters)
+        if self.player:
+            all_characters.append(self.player)
+        content = (dict(self.world), all_characters, list(self.items))
+        
+        # Registered before building: the failure that stops the build starts
+        # the probing, and a probe may succeed before the build returns
+        health = self.embeddings_engine.health
+        recover = lambda: self.ai_ready or self._hot_enable(content)
+        self.ai_ready = False
+        health.on_recovered(recover)
         try:
-            # Initialize command embeddings
-            self.embeddings_engine.initialize_command_embeddings()
-            
-            # Initialize location embeddings
-            self.embeddings_engine.initialize_location_embeddings(self.world)
-            
-            # Initialize character embeddings
-            all_characters = []
-            for location in self.world.values():
-                all_characters.extend(location.characters)
-            if self.player:
-                all_characters.append(self.player)
-            self.embeddings_engine.initialize_character_embeddings(all_characters)
-            
-            # Initialize item embeddings
-            self.embeddings_engine.initialize_item_embeddings(self.items)
-            
-            print("AI embeddings initialized with game content.")
+            built = self._build_embeddings(*content)
         except Exception as e:
-            print(f"Warning: Error initializing embeddings with game content: {e}")
-            print("Game will fall back to basic command processing.")
-            self.embeddings_engine = None
+            # Retried with backoff like an unreachable server
+            health.record_failure(e)
+            built = False
+        
+        if built:
+            health.remove_recovered(recover)
+            print("AI embeddings initialized with game content.")
+        elif not self.ai_ready:
+            print("AI embeddings are unavailable; using basic command processing for now.")
+            print("Natural language commands will be enabled once it is back.")
+    
+    def _build_embeddings(self, world, characters, items):
+        """Build the AI engine's catalogs; return whether every description was embedded.
+        
+        The catalogs are built aside and swapped in complete, and the AI
+        path is only enabled after that, so commands resolved meanwhile
+        (e.g. while the probing thread builds them) never see partial ones.
+        """
+        # Pairs commands with their possible targets for single-call matching, too
+        catalogs = self.embeddings_engine.build_catalogs(world, characters, items)
+        if catalogs is None:
+            return False
+        self.embeddings_engine.use_catalogs(catalogs)
+        self.ai_ready = True
+        return True
+    
+    def _hot_enable(self, content):
+        """Build the catalogs after the server came back (runs in the probing thread)."""
+        if not self._build_embeddings(*content):
+            # Keeps the probing going, to try again once the server answers
+            raise RuntimeError("embedding catalogs are incomplete")
+        print("\nNatural language commands are now enabled.")
+    
+    def setup(self, name, character_type="migrant", **extra_info):
+        """Seed the session and build the world, NPCs, player and events."""
+        random.seed(self.seed)
+        if self.recording is not None:
+            self.recording.begin(self.seed, name, character_type, extra_info)
+        self.create_world()
+        self.create_characters()
+        self.create_player(name, character_type, **extra_info)
+        self.load_events()
+        self.build_name_index()
+    
+    def build_name_index(self):
+        """Index every character and item name (and alias) for typo-tolerant matching."""
+        characters = NameIndex()
+        for location in self.world.values():
+            for character in location.characters:
+                if character is self.player:
+                    continue
+                characters.add(character.name, character.name)
+                # "hernandez" finds Agent Hernandez too
+                for word in character.name.split():
+                    if len(word) > 3:
+                        characters.add(word, character.name)
+        self.name_index = {"character": characters, "item": ITEMS.name_index()}
     
     def start(self):
         """Start the game."""
@@ -243,10 +365,7 @@ class GameEngine:
         name, character_type, extra_info = self.story.get_player_info()
         
         # Initialize game world
-        self.create_world()
-        self.create_characters()
-        self.create_player(name, character_type, **extra_info)
-        self.load_events()
+        self.setup(name, character_type, **extra_info)
         
         # Initialize AI embeddings with game content
         self.initialize_embeddings()
@@ -255,7 +374,13 @@ class GameEngine:
         self.story.display_intro(self.current_location.name)
         
         # Main game loop
-        self.main_loop()
+        self.log_session_start()
+        try:
+            self.main_loop()
+        finally:
+            self.log_session_end()
+            if self.recording is not None:
+                self.recording.save()
         
         # Display journey summary and ending
         if self.game_over:
@@ -274,47 +399,53 @@ class GameEngine:
 
         # Main loop
         while not self.game_over:
-            # --- CHANGE START ---
-            # Display effects from the previous turn or location entry FIRST
-            location_effect_msg = ""
-            if hasattr(self.current_location, "apply_effects"):
-                 # Get passive description of location effect without applying resource drain here
-                 location_effect_msg = self.current_location.apply_effects(self.player)
-                 if location_effect_msg: print("\n" + location_effect_msg)
-
-            # Apply per-turn resource consumption for Migrants
-            resource_msg = ""
-            # In game_engine.py - modify the main_loop() method
-            if isinstance(self.player, Migrant):
-                base_water_consumption = 5
-                base_food_consumption = 5
-                # Modify consumption based on location type
-                if isinstance(self.current_location, Desert):
-                    base_water_consumption += self.current_location.water_scarcity // 2
-                    base_food_consumption += 2
-                elif isinstance(self.current_location, Settlement) and self.current_location.has_service("food"):
-                    base_food_consumption = max(0, base_food_consumption - 3)
-                
-                resource_msg = self.player.consume_resources(base_water_consumption, base_food_consumption)
-                
-            elif isinstance(self.player, BorderPatrol):
-                # Border Patrol consumes resources at a slower rate
-                base_water_consumption = 3  # Reduced from 5 for migrants
-                base_food_consumption = 3   # Reduced from 5 for migrants
-                
-                # Still affected by desert conditions, but less severely
-                if isinstance(self.current_location, Desert):
-                    base_water_consumption += self.current_location.water_scarcity // 3  # Less impact than migrants
-                    base_food_consumption += 1  # Less impact than migrants
-                    
-                resource_msg = self.player.consume_resources(base_water_consumption, base_food_consumption)
+            if not self.play_turn():
+                self.story.graceful_exit(self.player)
+                return
+    
+    def play_turn(self):
+        """Play one turn: advance the world, read one command and carry it out.
+        
+        Returns:
+            bool: False if the player confirmed quitting, otherwise True
+        """
+        with self.profiler.span("turn"):
+            return self._play_turn()
+    
+    def _play_turn(self):
+        logging = self.telemetry.enabled
+        span = self.profiler.span
+        if logging:
+            turn_started = time.perf_counter()
+            stats_before = stat_snapshot(self.player)
+            self._turn = {"location": self.current_location.name, "events": []}
+
+        # --- CHANGE START ---
+        # Display effects from the previous turn or location entry FIRST
+        location_effect_msg = ""
+        if hasattr(self.current_location, "apply_effects"):
+            with span("effects"):
+                # Get passive description of location effect without applying resource drain here
+                location_effect_msg = self.current_location.apply_effects(self.player)
+            if location_effect_msg: print("\n" + location_effect_msg)
+
+        # Apply per-turn resource consumption for Migrants
+        with span("resources"):
+            resource_msg = self.consume_turn_resources()
+
+        # Let the rest of the world move on as well
+        with span("npcs"):
+            npc_msg = self.simulate_npcs()
+        if npc_msg: print("\n" + npc_msg)
 
-            # Check for game over AFTER resource consumption (as health might drop)
+        # Check for game over AFTER resource consumption (as health might drop)
+        with span("game_over"):
             self.check_game_over()
-            if self.game_over:
-                print("\n" + self.get_ending_message())
-                break # Exit loop immediately if game over
+        if self.game_over:
+            print("\n" + self.get_ending_message())
+            return True # End the turn immediately if game over
 
+        with span("narrative"):
             # Trigger random narrative event (e.g., 15% chance each turn)
             if random.random() < 0.15:
                 player_type = "migrant" if isinstance(self.player, Migrant) else "patrol"
@@ -322,171 +453,411 @@ class GameEngine:
                 if narrative_event:
                     self.story.update_journey_stats("event", narrative_event)
 
-
             # Trigger trauma event occasionally (e.g., 5% chance, maybe less often)
             if random.random() < 0.05:
                  trauma = self.story.trigger_trauma_event()
                  if trauma:
                      self.story.update_journey_stats("trauma_experienced")
                      # Optional: Could affect hope/stress
-                     if hasattr(self.player, 'hope'): self.player.change_hope(-10)
-                     if hasattr(self.player, 'stress'): self.player.stress = min(100, self.player.stress + 15)
+                     if self.player.tracks_hope: self.player.change_hope(-10)
+                     if self.player.tracks_stress: self.player.stress = min(100, self.player.stress + 15)
+                     if logging: self._turn["events"].append("trauma")
 
-            # Get player command
-            command = input("\n> ").strip() # Added strip() here
-            if not command: # Handle empty input
-                print("Please enter a command. Type 'help' for assistance.")
-                continue
+        # Get player command
+        if logging:
+            input_started = time.perf_counter()
+        command = self.read_input("\n> ").strip() # Added strip() here
+        if not command: # Handle empty input
+            print("Please enter a command. Type 'help' for assistance.")
+            return True
 
+        if logging:
+            command_started = time.perf_counter()
+        with span("command"):
             result = self.process_command(command)
+        if logging:
+            self.log_turn(command, stats_before, {
+                "pre_ms": (input_started - turn_started) * 1000,
+                "input_ms": (command_started - input_started) * 1000,
+                "command_ms": (time.perf_counter() - command_started) * 1000,
+            })
 
-            if result.upper() == "QUIT":
-                if input("Are you sure you want to quit? (y/n): ").lower().startswith("y"):
-                    self.story.graceful_exit(self.player)
-                    return
-                continue
+        if result.upper() == "QUIT":
+            return not self.read_input("Are you sure you want to quit? (y/n): ").lower().startswith("y")
 
-            print("\n" + result)
+        print("\n" + result)
 
-            # --- MOVED game over check AFTER command processing & resource drain ---
-            # Check if game is over after command processing potentially triggered events or state changes
-            # (The check after resource drain handles health/timeout, this handles event/action based endings)
-            if not self.game_over: # Avoid double printing ending message
+        # --- MOVED game over check AFTER command processing & resource drain ---
+        # Check if game is over after command processing potentially triggered events or state changes
+        # (The check after resource drain handles health/timeout, this handles event/action based endings)
+        if not self.game_over: # Avoid double printing ending message
+            with span("game_over"):
                 self.check_game_over()
-                if self.game_over:
-                    print("\n" + self.get_ending_message())
+            if self.game_over:
+                print("\n" + self.get_ending_message())
+        return True
     
-    def process_command(self, command):
-        """Process a player command."""
-        original_command = command
-        command = command.lower().strip()
+    def consume_turn_resources(self):
+        """Apply the player's per-turn water and food consumption.
         
-        # Empty command
-        if not command:
-            return "Please enter a command. Type 'help' for assistance."
+        Returns:
+            str: Message about the player's condition, if any
+        """
+        resource_msg = ""
+        # In game_engine.py - modify the main_loop() method
+        if isinstance(self.player, Migrant):
+            base_water_consumption = 5
+            base_food_consumption = 5
+            # Modify consumption based on location type
+            if isinstance(self.current_location, Desert):
+                base_water_consumption += self.current_location.water_scarcity // 2
+                base_food_consumption += 2
+            elif isinstance(self.current_location, Settlement) and self.current_location.has_service("food"):
+                base_food_consumption = max(0, base_food_consumption - 3)
+            
+            resource_msg = self.player.consume_resources(base_water_consumption, base_food_consumption)
+            
+        elif isinstance(self.player, BorderPatrol):
+            # Border Patrol consumes resources at a slower rate
+            base_water_consumption = 3  # Reduced from 5 for migrants
+            base_food_consumption = 3   # Reduced from 5 for migrants
+            
+            # Still affected by desert conditions, but less severely
+            if isinstance(self.current_location, Desert):
+                base_water_consumption += self.current_location.water_scarcity // 3  # Less impact than migrants
+                base_food_consumption += 1  # Less impact than migrants
+                
+            resource_msg = self.player.consume_resources(base_water_consumption, base_food_consumption)
+        return resource_msg
+    
+    def read_input(self, prompt):
+        """Read one line of player input (or the next recorded one during replay)."""
+        if self.playback is not None:
+            return self.playback.next_input(prompt)
+        with self.profiler.span("input"):
+            text = input(prompt)
+        if self.recording is not None:
+            self.recording.record_input(text)
+        return text
+    
+    def resolve_intent(self, command):
+        """Work out what a command asks for.
+        
+        Familiar phrasings are answered by the phrase cache, and commands in
+        the basic syntax naming a known character or item (typos allowed)
+        are parsed locally. Otherwise the AI engine gets the first try; the
+        basic command syntax is the fallback, with character and item names
+        refined by the AI engine when it is available. During replay the recorded intent is used
+        instead, so the embedding server is never called.
+        
+        Args:
+            command (str): Lowercased, stripped player input
+            
+        Returns:
+            Intent or None: The resolved intent, or None if not understood
+        """
+        if self.playback is not None:
+            recorded = self.playback.next_resolution()
+            if recorded is not NOT_RECORDED:
+                return Intent(*recorded, source="replay") if recorded else None
+            return parse_keywords(command)
         
-        # Try to use AI embeddings to understand natural language commands
-        if self.embeddings_engine:
+        intent = self._resolve_locally(command)
+        local = intent is not None
+        if intent is None and self.ai_available:
             try:
-                # First try to match the command type
-                best_command, score = self.embeddings_engine.find_best_command(command)
-                
-                if best_command and score > 0.7:
-                    # If it's a movement command, extract the direction
-                    if best_command.startswith("move "):
-                        direction = best_command.split(" ", 1)[1]
-                        return self.move(direction)
-                    
-                    # If it's a talk command, try to find the character
-                    elif best_command == "talk":
-                        # Extract potential character name from input
-                        potential_target = command.replace("talk", "").replace("to", "").replace("with", "").strip()
-                        if potential_target:
-                            best_character, char_score = self.embeddings_engine.find_best_character(potential_target)
-                            if best_character and char_score > 0.6:
-                                return self.interact("talk", best_character)
-                    
-                    # If it's a take command, try to find the item
-                    elif best_command == "take":
-                        potential_item = command.replace("take", "").replace("get", "").replace("pick up", "").strip()
-                        if potential_item:
-                            best_item, item_score = self.embeddings_engine.find_best_item(potential_item)
-                            if best_item and item_score > 0.6:
-                                return self.interact("take", best_item)
-                    
-                    # If it's a use command, try to find the item
-                    elif best_command == "use":
-                        potential_item = command.replace("use", "").strip()
-                        if potential_item:
-                            best_item, item_score = self.embeddings_engine.find_best_item(potential_item)
-                            if best_item and item_score > 0.6:
-                                return self.interact("use", best_item)
-                    
-                    # For simple commands, just execute them
-                    elif best_command in ["look", "status", "help"]:
-                        return self.interact(best_command)
-                    
-                    elif best_command == "quit":
-                        return "QUIT"
+                with self.profiler.span("ai"):
+                    intent = self._match_with_embeddings(command)
             except Exception as e:
-                print(f"Error in AI command processing: {e}")
+                self.embeddings_engine.health.report(f"Error in AI command processing: {e}")
                 # Fall back to traditional command processing
         
-        # Traditional command processing as fallback
+        if intent is None:
+            if self.telemetry.enabled:
+                self._turn["source"] = "keyword"
+            intent = parse_keywords(command)
+            if intent:
+                self._refine_target(intent)
         
-        # Movement commands
-        if command.startswith("move ") or command.startswith("go "):
-            parts = command.split(" ", 1)
-            if len(parts) > 1:
-                direction = parts[1]
-                return self.move(direction)
-            else:
-                return "Move where? Try 'move north', 'move south', etc."
-        
-        # Direction shortcuts
-        if command in ["north", "south", "east", "west", "n", "s", "e", "w"]:
-            # Convert single letter directions to full words
-            if command == "n": command = "north"
-            elif command == "s": command = "south"
-            elif command == "e": command = "east"
-            elif command == "w": command = "west"
-            
-            return self.move(command)
-        
-        # Talk command
-        if command.startswith("talk ") or command.startswith("speak "):
-            parts = command.split(" ", 1)
-            if len(parts) > 1:
-                target = parts[1]
-                return self.interact("talk", target)
-            else:
-                return "Talk to whom? Try 'talk [character name]'."
-        
-        # Take command
-        if command.startswith("take ") or command.startswith("get "):
-            parts = command.split(" ", 1)
-            if len(parts) > 1:
-                target = parts[1]
-                return self.interact("take", target)
-            else:
-                return "Take what? Try 'take [item name]'."
-        
-        # Use Service command
-        if command.startswith("use service "):
-            parts = command.split(" ", 2)
-            if len(parts) > 2:
-                service = parts[2]
-                return self.interact("use_service", service)
-            else:
-                return "Use which service? Try 'use service [food/shelter/medical]'"
-        
-        # Use command
-        if command.startswith("use "):
-            parts = command.split(" ", 1)
-            if len(parts) > 1:
-                target = parts[1]
-                return self.interact("use", target)
-            else:
-                return "Use what? Try 'use [item name]'."
+        if not local:
+            self._learn_phrase(command, intent)
+        if self.recording is not None:
+            self.recording.record_resolution(intent.as_tuple() if intent else None)
+        return intent
+    
+    def resolve_intents(self, clauses):
+        """Work out what each clause of a compound command asks for.
         
-        # Other commands
-        if command == "look" or command == "examine":
-            return self.interact("look")
+        Like resolve_intent(), but all clauses are embedded together in a
+        single batched request to the AI engine.
         
-        if command == "status" or command == "inventory":
-            return self.interact("status")
+        Args:
+            clauses (list): Lowercased, stripped commands
+            
+        Returns:
+            list: An Intent, or None if not understood, per clause
+        """
+        if self.playback is not None:
+            recorded = self.playback.next_resolutions()
+            if recorded is not NOT_RECORDED:
+                return [Intent(*resolution, source="replay") if resolution else None for resolution in recorded]
+            return [parse_keywords(clause) for clause in clauses]
+        
+        intents = [self._resolve_locally(clause) for clause in clauses]
+        unknown = [index for index, intent in enumerate(intents) if intent is None]
+        if unknown and self.ai_available:
+            try:
+                with self.profiler.span("ai"):
+                    ai_started = time.perf_counter()
+                    rankings = self.embeddings_engine.rank_intents_batch(
+                        [clauses[index] for index in unknown], k=1, threshold=self.intent_threshold)
+                    if self.telemetry.enabled:
+                        self._turn["ai_ms"] = (time.perf_counter() - ai_started) * 1000
+                for index, ranked in zip(unknown, rankings):
+                    if ranked:
+                        (best_command, entity), score = ranked[0]
+                        intents[index] = Intent.from_command(best_command, entity, score)
+            except Exception as e:
+                self.embeddings_engine.health.report(f"Error in AI command processing: {e}")
+        
+        for index in unknown:
+            if intents[index] is None:
+                intents[index] = parse_keywords(clauses[index])
+                if intents[index]:
+                    self._refine_target(intents[index])
+            self._learn_phrase(clauses[index], intents[index])
+        
+        if self.recording is not None:
+            self.recording.record_resolutions([intent.as_tuple() if intent else None for intent in intents])
+        return intents
+    
+    def _resolve_locally(self, command):
+        """Return the intent of a command if no embedding request is needed to know it, else None.
+        
+        That is the case for phrasings the phrase cache knows, and for the
+        basic syntax when any target is a direction or a known (possibly
+        misspelled) character or item name.
+        """
+        fixed = FIXED_COMMANDS.get(command)
+        if fixed is not None:
+            # Nothing to match or correct, and nothing the phrase cache could add
+            if self.telemetry.enabled:
+                self._turn["source"] = "keyword"
+            return Intent(*fixed)
+        
+        if self.phrase_cache is not None:
+            intent = self.phrase_cache.lookup(command)
+            if intent is not None:
+                if self.telemetry.enabled:
+                    self._turn["source"] = "cache"
+                return intent
+        
+        intent = parse_keywords(command)
+        if intent is None:
+            return None
+        kind = ENTITY_ACTIONS.get(intent.action)
+        if kind is not None:
+            name = self._correct_name(kind, intent.target)
+            if name is None:
+                return None
+            intent.target = name
+        elif intent.action == "move" and intent.target not in DIRECTION_SHORTCUTS:
+            return None
+        if self.telemetry.enabled:
+            self._turn["source"] = "keyword"
+        return intent
+    
+    def _correct_name(self, kind, text):
+        """Return the character or item name text refers to, fixing typos, or None."""
+        index = self.name_index.get(kind)
+        return index.best(text) if index is not None and text else None
+    
+    def _learn_phrase(self, command, intent):
+        """Count a fresh resolution of a command in the phrase cache."""
+        if self.phrase_cache is not None and intent is not None:
+            self.phrase_cache.observe(command, intent.as_tuple())
+    
+    def _find_entity(self, kind, description):
+        """Return (name, score) of the best matching character or item."""
+        if kind == "character":
+            return self.embeddings_engine.find_best_character(description, threshold=self.entity_threshold)
+        return self.embeddings_engine.find_best_item(description, threshold=self.entity_threshold)
+    
+    def _match_with_embeddings(self, command):
+        """Match a command against the joint command+entity index in one embedding request."""
+        if self.telemetry.enabled:
+            ai_started = time.perf_counter()
+            ranked = self.embeddings_engine.rank_intents(command, k=1, threshold=self.intent_threshold)
+            self._turn["ai_ms"] = (time.perf_counter() - ai_started) * 1000
+        else:
+            ranked = self.embeddings_engine.rank_intents(command, k=1, threshold=self.intent_threshold)
         
-        if command == "help":
-            return self.interact("help")
+        if not ranked:
+            if self.telemetry.enabled:
+                self._turn["ai_command"] = None
+                self._turn["score"] = 0
+            return None
         
-        if command == "quit" or command == "exit":
-            return "QUIT"
+        (best_command, entity), score = ranked[0]
+        if self.telemetry.enabled:
+            self._turn["ai_command"] = best_command
+            self._turn["score"] = round(score, 4)
+        return Intent.from_command(best_command, entity, score)
+    
+    def _refine_target(self, intent):
+        """Replace a keyword intent's target with the best matching character or item."""
+        kind = ENTITY_ACTIONS.get(intent.action)
+        if not kind or not intent.target:
+            return
+        name = self._correct_name(kind, intent.target)
+        if name is not None:
+            intent.target = name
+            return
+        if not self.ai_available:
+            return
+        try:
+            entity, score = self._find_entity(kind, intent.target)
+        except Exception as e:
+            self.embeddings_engine.health.report(f"Error in AI {kind} matching: {e}")
+            return
+        if entity:
+            intent.target = entity
+            intent.score = score
+    
+    def execute_intent(self, intent):
+        """Carry out a resolved intent.
         
-        # Unknown command
-        return f"I don't understand '{original_command}'. Type 'help' for assistance."
+        Returns:
+            tuple: (result text, whether the action was carried out)
+        """
+        if intent.action == "quit":
+            return "QUIT", True
+        self.action_succeeded = False
+        if intent.action == "move":
+            result = self.move(intent.target)
+        else:
+            result = self.interact(intent.action, intent.target)
+        return result, self.action_succeeded
     
+    def process_command(self, command):
+        """Process a player command."""
+        original_command = command
+        command = command.lower().strip()
+        
+        # Empty command
+        if not command:
+            return "Please enter a command. Type 'help' for assistance."
+        
+        if may_chain(command):
+            clauses = split_clauses(command)
+            if len(clauses) > 1:
+                return self.process_compound(clauses)
+            command = clauses[0]
+        
+        intent = self.resolve_intent(command)
+        if intent is None:
+            # Unknown command
+            return f"I don't understand '{original_command}'. Type 'help' for assistance."
+        return self.execute_intent(intent)[0]
+    
+    def process_compound(self, clauses):
+        """Run the clauses of a compound command ("take map, then use map") in order.
+        
+        Execution stops at the first clause that is not understood or does
+        not succeed, or when the game ends.
+        
+        Args:
+            clauses (list): Lowercased, stripped commands
+            
+        Returns:
+            str: Each executed step's result, and which steps were skipped
+        """
+        intents = self.resolve_intents(clauses)
+        reports = []
+        for step, (clause, intent) in enumerate(zip(clauses, intents), 1):
+            header = f"[{step}/{len(clauses)}] {clause}"
+            if intent is None:
+                reports.append(f"{header}\nI don't understand '{clause}'.")
+                break
+            if intent.action == "quit":
+                reports.append(f"{header}\nTo quit, enter 'quit' on its own.")
+                break
+            result, succeeded = self.execute_intent(intent)
+            reports.append(f"{header}\n{result}")
+            if self.game_over or not succeeded:
+                break
+        if step < len(clauses):
+            reports.append("Skipped: " + ", ".join(clauses[step:]))
+        return "\n\n".join(reports)
+    
+    def log_session_start(self):
+        """Record the start of a session."""
+        if not self.telemetry.enabled:
+            return
+        self.telemetry.emit({
+            "type": "session_start",
+            "session": self.session_id,
+            "role": self.player.role,
+            "seed": self.seed,
+            "location": self.current_location.name,
+        })
+    
+    def log_turn(self, command, stats_before, timings):
+        """Record one turn: the command, how it was understood and what it changed."""
+        turn = self._turn
+        record = {
+            "type": "turn",
+            "session": self.session_id,
+            "turn": self.turn_count,
+            "command": command,
+            "intent": turn.get("intent"),
+            "target": turn.get("target"),
+            "source": turn.get("source") or ("ai" if "ai_command" in turn else "keyword"),
+            "score": turn.get("score"),
+            "ai_command": turn.get("ai_command"),
+            "location": turn.get("location"),
+            "location_after": self.current_location.name,
+            "events": turn.get("events", []),
+            "choice": turn.get("choice"),
+            "deltas": stat_deltas(stats_before, stat_snapshot(self.player)),
+            "timings": {name: round(ms, 3) for name, ms in timings.items()},
+        }
+        if "ai_ms" in turn:
+            record["timings"]["ai_ms"] = round(turn["ai_ms"], 3)
+        self.telemetry.emit(record)
+    
+    def log_session_end(self):
+        """Record how a session ended and flush the log."""
+        if not self.telemetry.enabled:
+            return
+        stats = self.story.journey_stats
+        self.telemetry.emit({
+            "type": "session_end",
+            "session": self.session_id,
+            "role": self.player.role if self.player else None,
+            "ending": self.ending if self.game_over else "quit",
+            "turns": self.turn_count,
+            "location": self.current_location.name if self.current_location else None,
+            "journey_stats": {key: stats[key] for key in JOURNEY_STAT_KEYS},
+        })
+        self.telemetry.flush()
+    
+    def note_intent(self, intent, target=None):
+        """Remember how the current command was understood (for telemetry)."""
+        if self.telemetry.enabled:
+            self._turn["intent"] = intent
+            self._turn["target"] = target
+    
+    def note_choice(self, event, choice_index):
+        """Remember a moral choice made during the current turn (for telemetry)."""
+        if self.telemetry.enabled:
+            self._turn["choice"] = {"event": event.name, "index": choice_index,
+                                    "text": event.choices[choice_index]}
+    
+    @spanned("move")
     def move(self, direction):
         """Move the player in the specified direction."""
+        self.note_intent("move", direction)
         if not self.current_location:
             return "You are nowhere."
 
@@ -508,6 +879,7 @@ class GameEngine:
         # --- CHANGE START ---
         # Increment turn counter AFTER successfully moving
         self.turn_count += 1
+        self.action_succeeded = True
         self.story.update_journey_stats("distance_traveled", 10) # Example: Add 10 miles per move
 
         # Get the description of the new location
@@ -527,7 +899,7 @@ class GameEngine:
                 self.story.update_journey_stats("lives_impacted")
                 # Only add unique encounter events
                 if not self.story.journey_stats["key_events"] or event_desc != self.story.journey_stats["key_events"][-1]:
-                    self.story.update_journey_stats("event", narrative_event)
+                    self.story.update_journey_stats("event", event_desc)
 
 
         # Check game over conditions AFTER moving and potential events
@@ -553,13 +925,19 @@ class GameEngine:
         if not force and random.random() > 0.3:
             return None
             
-        # Get a random event from the current location
-        event = self.current_location.get_random_event()
+        # Get a random event whose preconditions hold at the current location
+        if self.rule_engine:
+            event = self.rule_engine.pick_event(self.current_location, self.player)
+        else:
+            event = self.current_location.get_random_event()
         if not event:
             return None
             
         # Execute the event
-        return event.execute(self, self.player)
+        if self.telemetry.enabled:
+            self._turn.setdefault("events", []).append(event.name)
+        with self.profiler.span("event"):
+            return event.execute(self, self.player)
     
     def check_game_over(self):
         """Check if game over conditions have been met."""
@@ -570,7 +948,7 @@ class GameEngine:
             return True
             
         # Check if water reached 0 (for migrants)
-        if hasattr(self.player, 'water') and self.player.water <= 0:
+        if self.player.tracks_supplies and self.player.water <= 0:
             self.game_over = True
             self.ending = "death"
             return True
@@ -622,28 +1000,61 @@ class GameEngine:
         status += f"Location: {self.current_location.name}\n"
         status += f"Health: {self.player.health}\n"
         
-        if hasattr(self.player, 'water'):
+        if self.player.tracks_supplies:
             status += f"Water: {self.player.water}\n"
             
-        if hasattr(self.player, 'food'):
+        if self.player.tracks_supplies:
             status += f"Food: {self.player.food}\n"
             
-        if hasattr(self.player, 'money'):
+        if self.player.carries_money:
             status += f"Money: ${self.player.money}\n"
             
-        if hasattr(self.player, 'hope'):
+        if self.player.tracks_hope:
             status += f"Hope: {self.player.hope}\n"
             
-        if hasattr(self.player, 'moral_compass'):
+        if self.player.tracks_morality:
             status += f"Moral Compass: {self.player.moral_compass}\n"
             
-        if hasattr(self.player, 'stress'):
+        if self.player.tracks_stress:
             status += f"Stress: {self.player.stress}\n"
             
-        status += f"Inventory: {', '.join(self.player.inventory) if self.player.inventory else 'Empty'}\n"
+        status += f"Inventory: {self.player.inventory.display() if self.player.inventory else 'Empty'}\n"
         
         return status
     
+    def snapshot(self):
+        """Return a copy of the game state, including the random number generator.
+        
+        Returns:
+            dict: State that restore() can load any number of times
+        """
+        state = {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS}
+        # Shared immutable placeholders must stay identical after copying
+        state = copy.deepcopy(state, {id(NO_FLAGS): NO_FLAGS})
+        state["random"] = random.getstate()
+        return state
+    
+    def restore(self, snapshot):
+        """Load a state returned by snapshot()."""
+        state = copy.deepcopy(snapshot, {id(NO_FLAGS): NO_FLAGS})
+        random.setstate(state.pop("random"))
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    def consume_item(self, item):
+        """Spend one use of a consumable item from the player's inventory.
+        
+        Returns:
+            str: A note to append when a unit was used up, otherwise ''
+        """
+        if not self.player.inventory.use_charge(item):
+            return ""
+        remaining = self.player.inventory.count(item)
+        if remaining:
+            return f" ({remaining} {item} left.)"
+        return f" That was your last {item}."
+    
+    @spanned("interact")
     def interact(self, action, target=None):
         """Perform an interaction in the game.
         
@@ -656,8 +1067,11 @@ class GameEngine:
         """
         if self.game_over:
             return "The game is over."
+        
+        self.note_intent(action, target)
             
         if action == "look":
+            self.action_succeeded = True
             base_desc = self.current_location.describe(detailed=True)
 
             thematic_quotes = self.story.get_location_description(type(self.current_location), self.current_location.name)
@@ -667,24 +1081,17 @@ class GameEngine:
             return base_desc
             
         elif action == "status":
+            self.action_succeeded = True
             return self.get_status()
             
         elif action == "talk" and target:
-            # Try to use AI embeddings to find the character if available
             original_target = target
-            if self.embeddings_engine:
-                try:
-                    best_character, score = self.embeddings_engine.find_best_character(target)
-                    if best_character and score > 0.6:
-                        target = best_character
-                except Exception as e:
-                    print(f"Error in AI character matching: {e}")
-                    
             # Find character in current location
             for character in self.current_location.characters:
                 if character != self.player and target.lower() in character.name.lower():
                     # Increment turn counter
                     self.turn_count += 1
+                    self.action_succeeded = True
                     
                     # Generate dialogue based on character type with deeper narrative
                     if isinstance(character, Migrant):
@@ -714,30 +1121,15 @@ class GameEngine:
             return f"There is no one named {original_target} here."
             
         elif action == "take" and target:
-            # Try to use AI embeddings to find the item if available
             original_target = target
-            if self.embeddings_engine:
-                try:
-                    best_item, score = self.embeddings_engine.find_best_item(target)
-                    if best_item and score > 0.6:
-                        target = best_item
-                except Exception as e:
-                    print(f"Error in AI item matching: {e}")
-
-            # Check if item is in location
-            item_found = None
-            for item in self.current_location.items:
-                # More robust matching (check start, end, exact match)
-                item_lower = item.lower()
-                target_lower = target.lower()
-                if item_lower == target_lower or item_lower.startswith(target_lower) or item_lower.endswith(target_lower):
-                    item_found = item
-                    break # Found the item
+            # Check if item is in location (exact name or word prefix)
+            item_found = self.current_location.items.resolve(target)
 
             if item_found:
                 self.current_location.remove_item(item_found)
                 self.player.add_to_inventory(item_found)
                 self.turn_count += 1
+                self.action_succeeded = True
                 return f"You take the {item_found}." # Use the actual item name found
 
             # If loop finishes without finding item
@@ -745,126 +1137,37 @@ class GameEngine:
         
         elif action == "use_service":
             if isinstance(self.current_location, Settlement):
+                money_before = self.player.money if self.player.carries_money else None
                 result = self.current_location.provide_shelter(target, self.player)
                 self.turn_count += 1
+                # A service was provided only if it was paid for
+                self.action_succeeded = money_before is not None and self.player.money < money_before
                 return result
             else:
                 return "This location doesn't have services."
             
         elif action == "use" and target:
-            # Try to use AI embeddings to find the item if available
             original_target = target
-            if self.embeddings_engine:
-                try:
-                    best_item, score = self.embeddings_engine.find_best_item(target)
-                    if best_item and score > 0.6:
-                        target = best_item
-                except Exception as e:
-                    print(f"Error in AI item matching: {e}")
-
-            # Check if item is in inventory
-            item_to_use = None
-            for item in self.player.inventory:
-                 # More robust matching
-                 item_lower = item.lower()
-                 target_lower = target.lower()
-                 if item_lower == target_lower or item_lower.startswith(target_lower) or item_lower.endswith(target_lower):
-                     item_to_use = item
-                     break # Found item
+            # Check if item is in inventory (exact name or word prefix)
+            item_to_use = self.player.inventory.resolve(target)
 
             if item_to_use:
-                item_lower = item_to_use.lower() # Use the actual found item name
+                # The item is used even if it has no effect for this player
                 self.turn_count += 1
+                self.action_succeeded = True
 
-                # Apply item effects
-                if "water bottle" in item_lower:
-                    if hasattr(self.player, 'water'):
-                        self.player.water = min(100, self.player.water + 30)
-                        # self.player.remove_from_inventory(item_to_use)
-                        return "You drink from the water bottle, restoring some hydration."
-                    else:
-                        return "You drink from the water bottle, but it doesn't seem to affect you much."
-
-                elif "canned food" in item_lower:
-                    if hasattr(self.player, 'food'):
-                        self.player.food = min(100, self.player.food + 40)
-                        # self.player.remove_from_inventory(item_to_use)
-                        return "You eat the canned food, satisfying your hunger."
-                    else:
-                        return "You eat the canned food, but it doesn't seem to affect you much."
-
-                elif "first aid kit" in item_lower:
-                    self.player.health = min(100, self.player.health + 25)
-                    # self.player.remove_from_inventory(item_to_use)
-                    return "You use the first aid kit, treating some wounds."
-
-                elif "map" in item_lower:
-                     # Maybe reveal connections or provide more detail?
-                     connections_desc = ", ".join([f"{direction} ({loc.name})" for direction, loc in self.current_location.connections.items()])
-                     return f"You consult the map. Paths lead to: {connections_desc if connections_desc else 'Unknown'}."
-
-                elif "flashlight" in item_lower:
-                    # Could be useful in specific dark locations or events (requires adding flags/checks)
-                    return "You turn on the flashlight. Its beam cuts through the ambient light."
-
-                elif "compass" in item_lower:
-                    # Could provide narrative confirmation or help if player is 'lost' (requires adding flags/checks)
-                    return "You check the compass. It confirms the cardinal directions."
-
-                elif "family photo" in item_lower:
-                    if hasattr(self.player, 'hope'):
-                        hope_change = self.player.change_hope(15) # Use the method from character.py
-                        return f"You look at the photo of your family. {hope_change}"
-                    else:
-                        return "You look at the photo, feeling a mix of emotions."
-
-                # Added effects for previously unused items
-                elif "blanket" in item_lower:
-                    # Could provide warmth effect (e.g., negate cold penalty at night - requires time/weather system)
-                    return "You wrap the blanket around yourself. It provides some comfort against the elements."
-
-                elif "money" in item_lower:
-                    # Could be used in specific interactions (e.g., bribing, buying supplies - requires event/dialogue changes)
-                    return "You count the money. It might be useful if you encounter the right people."
-
-                elif "id papers" in item_lower:
-                    # Could be crucial for certain events or endings (requires event/dialogue changes)
-                    return "You check your ID papers. Having them feels important, potentially risky."
-                
-                # game_engine.py - interact method additions
-                elif "radio" in item_lower and isinstance(self.player, BorderPatrol):
-                    # Random chance to get useful information
-                    if random.random() < 0.3:
-                        intel = random.choice([
-                            "Radio reports suspicious activity to the north.",
-                            "Dispatch mentions a group crossing near your location.",
-                            "Another agent reports finding abandoned supplies."
-                        ])
-                        return f"You use the radio. {intel}"
-                    return "You use the radio but hear only static."
-
-                elif "radio" in item_lower:
-                     # Useful mainly for Border Patrol character type
-                     if isinstance(self.player, BorderPatrol):
-                         # Could trigger a random report or allow calling for backup (requires event system enhancements)
-                         radio_chatter = random.choice([
-                             "Static crackles...",
-                             "A garbled voice mentions activity near Sector 4.",
-                             "Control asks for a sit-rep (situation report).",
-                             "Silence."
-                         ])
-                         return f"You use the radio. {radio_chatter}"
-                     else:
-                         return "You fiddle with the radio, but can't make sense of the transmissions."
-
-                else:
+                # Apply item effects from the item registry's dispatch table
+                result = ITEMS.use(self, item_to_use)
+                if result is None:
                     return f"You use the {item_to_use}, but nothing special happens."
+                return result
 
             # If loop finishes without finding item in inventory
             return f"You don't have {original_target} in your inventory."
 
             
         elif action == "help":
+            self.action_succeeded = True
             help_text = "\nAvailable commands: \n"
             help_text += "- look: Examine your surroundings\n"
             help_text += "- status: Check your current status\n"
@@ -875,9 +1178,10 @@ class GameEngine:
             help_text += "- move [direction]: Move in a direction (north, south, east, west)\n"
             help_text += "- help: Show this help text\n"
             help_text += "- quit: Exit the game\n"
+            help_text += "\nChain several commands with commas, 'then' or 'and': take map, then use map\n"
             
             # Add information about AI natural language processing if available
-            if self.embeddings_engine:
+            if self.ai_available:
                 help_text += "\nThis game features AI-powered natural language understanding.\n"
                 help_text += "You can use more natural phrases like:\n"
                 help_text += "- 'check my health' instead of 'status'\n"
@@ -0,0 +1,155 @@
+"""
+Intents for 'The Line: A Border Journey'
+
+This module defines what a player command resolves to - an action and
+its target - and the keyword parser used for the basic command syntax
+when the AI engine is off or unsure.
+"""
+
+import re
+
+# Single words and letters that mean "move in this direction"
+DIRECTION_SHORTCUTS = {
+    "north": "north", "south": "south", "east": "east", "west": "west",
+    "n": "north", "s": "south", "e": "east", "w": "west",
+}
+
+# Words that start a new action after "and" or a period ("take map and use
+# map"); an "and" followed by anything else stays inside the clause ("health
+# and stats")
+ACTION_VERBS = {
+    "move", "go", "head", "walk", "run", "travel", "north", "south", "east", "west",
+    "talk", "speak", "chat", "ask", "take", "get", "grab", "pick", "collect",
+    "use", "drink", "eat", "read", "wear", "look", "examine", "check", "search",
+    "status", "inventory", "help", "quit", "exit",
+}
+
+# Separators between the clauses of a compound command. A period only ends
+# a clause before whitespace or the end of the line, and like "and" only
+# when an action verb follows ("use i.d. papers", "talk to mr. jones")
+CLAUSE_SEPARATOR = re.compile(r"\s*(?:[,;]|\band then\b|\bthen\b)\s*")
+SENTENCE_SEPARATOR = re.compile(r"\.(?:\s+|$)")
+AND_SEPARATOR = re.compile(r"\s+and\s+")
+
+# Clauses that carry no command of their own ("go north, please")
+FILLER_CLAUSES = {"please", "thanks", "thank you", "now", "ok", "okay"}
+
+# Actions whose target names a character or an item, by the kind of entity
+ENTITY_ACTIONS = {"talk": "character", "take": "item", "use": "item"}
+
+# Commands in the basic syntax whose meaning is fixed: (action, target)
+FIXED_COMMANDS = {
+    "look": ("look", None), "examine": ("look", None),
+    "status": ("status", None), "inventory": ("status", None),
+    "help": ("help", None), "quit": ("quit", None), "exit": ("quit", None),
+    **{word: ("move", direction) for word, direction in DIRECTION_SHORTCUTS.items()},
+    **{f"{verb} {direction}": ("move", direction)
+       for verb in ("move", "go") for direction in DIRECTION_SHORTCUTS.values()},
+}
+
+# First words of the basic syntax that take a target, by action
+KEYWORD_ACTIONS = {
+    "move": "move", "go": "move", "talk": "talk", "speak": "talk",
+    "take": "take", "get": "take", "use": "use",
+}
+
+
+class Intent:
+    """What a command asks the game to do."""
+
+    __slots__ = ("action", "target", "score", "source")
+
+    def __init__(self, action, target=None, score=None, source="keyword"):
+        """
+        Initialize an intent.
+
+        Args:
+            action (str): 'move', 'talk', 'take', 'use', 'use_service',
+                'look', 'status', 'help' or 'quit'
+            target (str): Direction, character, item or service, if any
+            score (float): Similarity score when the AI engine matched it
+            source (str): How it was resolved ('ai', 'keyword' or 'replay')
+        """
+        self.action = action
+        self.target = target
+        self.score = score
+        self.source = source
+
+    @classmethod
+    def from_command(cls, command, target=None, score=None, source="ai"):
+        """Build an intent from an embedding command key such as 'move north'."""
+        if command.startswith("move "):
+            return cls("move", command.split(" ", 1)[1], score, source)
+        return cls(command, target, score, source)
+
+    def as_tuple(self):
+        return (self.action, self.target)
+
+    def __eq__(self, other):
+        return isinstance(other, Intent) and self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return f"Intent({self.action!r}, {self.target!r}, score={self.score}, source={self.source!r})"
+
+
+def parse_keywords(command):
+    """Return the Intent of a command in the basic syntax, or None.
+
+    Args:
+        command (str): Lowercased, stripped player input
+
+    Returns:
+        Intent or None: The parsed intent, or None if the syntax is unknown
+    """
+    # Commands without a target and direction shortcuts
+    fixed = FIXED_COMMANDS.get(command)
+    if fixed is not None:
+        return Intent(*fixed)
+
+    verb, space, target = command.partition(" ")
+    action = KEYWORD_ACTIONS.get(verb) if space else None
+    if action is None:
+        return None
+    if action == "use" and target.startswith("service "):
+        return Intent("use_service", target.split(" ", 1)[1])
+    return Intent(action, target)
+
+
+def may_chain(command):
+    """Return whether a command might chain several; a cheap test before split_clauses()."""
+    return "," in command or ";" in command or "." in command or "then" in command or " and " in command
+
+
+def split_clauses(command):
+    """Split a compound command into the commands it chains together.
+
+    Clauses are separated by commas, semicolons, "then" and "and then",
+    or by "and" or the period ending a sentence when an action verb
+    follows. Filler clauses such as "please" are dropped.
+
+    Args:
+        command (str): Lowercased, stripped player input
+
+    Returns:
+        list: Non-empty clauses in order (just [command] if nothing is chained)
+    """
+    clauses = []
+    for part in CLAUSE_SEPARATOR.split(command):
+        for sentence in _split_before_verbs(SENTENCE_SEPARATOR.split(part), ". "):
+            clauses.extend(_split_before_verbs(AND_SEPARATOR.split(sentence), " and "))
+    clauses = [clause.strip() for clause in clauses]
+    return [clause for clause in clauses if clause and clause not in FILLER_CLAUSES] or [command]
+
+
+def _split_before_verbs(pieces, joiner):
+    """Rejoin split pieces with joiner unless the next one starts with an action verb or is filler."""
+    clauses = [pieces[0]]
+    for piece in pieces[1:]:
+        if piece.split(" ", 1)[0] in ACTION_VERBS or piece.strip() in FILLER_CLAUSES:
+            clauses.append(piece)
+        elif piece:
+            clauses[-1] += joiner + piece
+    return clauses
@@ -0,0 +1,172 @@
+"""
+Inventories for 'The Line: A Border Journey'
+
+This module provides the multiset used for character inventories and
+location items. Items are stored once per name with a quantity and,
+for consumables, the charges left in the open unit. A normalized-name
+index resolves exact names and word prefixes ("water", "bottle",
+"first aid") in constant time regardless of how many items are held.
+"""
+
+import random
+from items import ITEMS, normalize_name
+
+
+class Inventory:
+    """A multiset of named items with quantities and consumable charges."""
+
+    __slots__ = ("_entries", "_prefixes")
+
+    def __init__(self, items=None):
+        """
+        Initialize an inventory.
+
+        Args:
+            items (iterable): Optional item names to start with
+        """
+        self._entries = {}     # key -> [display name, quantity, charges, capacity]
+        self._prefixes = None  # prefix -> {key: None}, allocated on first add
+        for item in items or ():
+            self.add(item)
+
+    def __len__(self):
+        """Return the number of distinct items held."""
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate the display names of the items held."""
+        return (entry[0] for entry in self._entries.values())
+
+    def __contains__(self, item):
+        return normalize_name(item) in self._entries
+
+    def __repr__(self):
+        return f"Inventory({self.display()!r})"
+
+    def add(self, item, quantity=1, charges=None):
+        """Add units of an item.
+
+        Args:
+            item (str): Item name
+            quantity (int): Number of units to add
+            charges (int): Uses per unit; defaults to the item registry
+
+        Returns:
+            str: The display name the item is stored under
+        """
+        key = normalize_name(item)
+        entry = self._entries.get(key)
+        if entry is None:
+            capacity = charges if charges is not None else ITEMS.charges_for(key)
+            entry = self._entries[key] = [item, 0, capacity, capacity]
+            self._index(key)
+        entry[1] += quantity
+        return entry[0]
+
+    def remove(self, item, quantity=1):
+        """Remove units of an item; return False if there are not enough."""
+        key = normalize_name(item)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < quantity:
+            return False
+        # Unopened units go first, so the open unit keeps its charges
+        entry[1] -= quantity
+        if entry[1] == 0:
+            del self._entries[key]
+            self._unindex(key)
+        return True
+
+    def count(self, item):
+        """Return the quantity held of an item."""
+        entry = self._entries.get(normalize_name(item))
+        return entry[1] if entry else 0
+
+    def charges(self, item):
+        """Return the charges left in the open unit, or None if not consumable."""
+        entry = self._entries.get(normalize_name(item))
+        return entry[2] if entry else None
+
+    def use_charge(self, item):
+        """Spend one charge of a consumable item.
+
+        Returns:
+            bool: True if a unit was used up by this charge
+        """
+        key = normalize_name(item)
+        entry = self._entries.get(key)
+        if entry is None or entry[2] is None:
+            return False
+        entry[2] -= 1
+        if entry[2] > 0:
+            return False
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._entries[key]
+            self._unindex(key)
+        else:
+            entry[2] = entry[3]
+        return True
+
+    def resolve(self, text):
+        """Resolve player text to the display name of a held item.
+
+        Exact names win; otherwise the text may be a prefix of the full
+        name or of any later word in it ("bottle" finds "Water Bottle"),
+        or a registered alias of the item ("canteen").
+
+        Returns:
+            str or None: The matching display name
+        """
+        key = normalize_name(text)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry[0]
+        if not self._prefixes:
+            return None
+        candidates = self._prefixes.get(key)
+        if candidates:
+            return self._entries[next(iter(candidates))][0]
+        item = ITEMS.get(key)
+        if item is not None:
+            entry = self._entries.get(normalize_name(item.name))
+            if entry is not None:
+                return entry[0]
+        return None
+
+    def random_item(self):
+        """Return the display name of a random held item, or None."""
+        if not self._entries:
+            return None
+        return random.choice(list(self._entries.values()))[0]
+
+    def display(self):
+        """Return a comma-separated listing with quantities."""
+        parts = []
+        for name, quantity, charges, capacity in self._entries.values():
+            text = name if quantity == 1 else f"{name} x{quantity}"
+            if charges is not None and capacity and capacity > 1 and charges < capacity:
+                text += f" ({charges}/{capacity} uses left)"
+            parts.append(text)
+        return ", ".join(parts)
+
+    @staticmethod
+    def _prefixes_of(key):
+        words = key.split(" ")
+        for start in range(len(words)):
+            tail = " ".join(words[start:])
+            for end in range(1, len(tail) + 1):
+                yield tail[:end]
+
+    def _index(self, key):
+        if self._prefixes is None:
+            self._prefixes = {}
+        for prefix in self._prefixes_of(key):
+            self._prefixes.setdefault(prefix, {})[key] = None
+
+    def _unindex(self, key):
+        for prefix in self._prefixes_of(key):
+            keys = self._prefixes.get(prefix)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._prefixes[prefix]
@@ -0,0 +1,245 @@
+"""
+Items for 'The Line: A Border Journey'
+
+This module is the single source of truth for item data: display
+names, aliases, descriptions used for embeddings, which roles can use
+an item, how many uses a unit holds, and what using it does. The
+registry compiles every item into a dispatch table so that using an
+item is one hash lookup followed by a list of precomputed stat deltas.
+"""
+
+import random
+
+
+def normalize_name(name):
+    """Return the lookup key for an item or character name."""
+    return " ".join(name.lower().split())
+
+
+class ItemDef:
+    """Static definition of an item."""
+
+    __slots__ = ("id", "name", "aliases", "description", "roles", "charges",
+                 "effects", "message", "fallback_message", "restricted_message",
+                 "handler")
+
+    def __init__(self, item_id, name, description, aliases=(), roles=None, charges=None,
+                 effects=None, message="", fallback_message=None,
+                 restricted_message=None, handler=None):
+        """
+        Initialize an item definition.
+
+        Args:
+            item_id (str): Stable identifier (e.g. 'water_bottle')
+            name (str): Display name
+            description (str): Text used to build the item's embedding
+            aliases (tuple): Other names players use for the item
+            roles (tuple): Character roles allowed to use it (None for all)
+            charges (int): Uses per unit for consumables, None if never used up
+            effects (dict): Stat deltas applied on use {stat: amount}
+            message (str): Result text; may reference {name}
+            fallback_message (str): Result text when the user lacks the stats
+            restricted_message (str): Result text for roles not in `roles`
+            handler (callable): Custom effect handler(game, item) -> str
+        """
+        self.id = item_id
+        self.name = name
+        self.description = description
+        self.aliases = tuple(aliases)
+        self.roles = tuple(roles) if roles else None
+        self.charges = charges
+        self.effects = dict(effects or {})
+        self.message = message
+        self.fallback_message = fallback_message or message
+        self.restricted_message = restricted_message or f"You can't make use of the {name}."
+        self.handler = handler
+
+
+# Stat -> (capability flag required on the character, or None for all)
+STAT_CAPABILITIES = {
+    "health": None,
+    "water": "tracks_supplies",
+    "food": "tracks_supplies",
+    "hope": "tracks_hope",
+    "stress": "tracks_stress",
+    "moral_compass": "tracks_morality",
+}
+
+
+def _use_map(game, item):
+    connections = game.current_location.connections
+    connections_desc = ", ".join(f"{direction} ({loc.name})" for direction, loc in connections.items())
+    return f"You consult the map. Paths lead to: {connections_desc if connections_desc else 'Unknown'}."
+
+
+def _use_radio(game, item):
+    if random.random() < 0.3:
+        intel = random.choice([
+            "Radio reports suspicious activity to the north.",
+            "Dispatch mentions a group crossing near your location.",
+            "Another agent reports finding abandoned supplies."
+        ])
+        return f"You use the radio. {intel}"
+    return "You use the radio but hear only static."
+
+
+class ItemRegistry:
+    """Item definitions compiled into a name -> effect dispatch table."""
+
+    def __init__(self, items=()):
+        """
+        Initialize the registry.
+
+        Args:
+            items (iterable): ItemDef instances to register
+        """
+        self.items = {}      # id -> ItemDef
+        self._lookup = {}    # normalized name/alias/id -> ItemDef
+        self._dispatch = {}  # id -> compiled use function
+        self._name_index = None  # Typo-tolerant alias index, shared by every session
+        for item in items:
+            self.register(item)
+
+    def register(self, item):
+        """Add an item definition and compile its effects."""
+        self.items[item.id] = item
+        for key in (item.id, item.name, *item.aliases):
+            self._lookup[normalize_name(key.replace("_", " "))] = item
+        self._dispatch[item.id] = self._compile(item)
+        self._name_index = None
+        return item
+
+    def get(self, name):
+        """Return the definition for a name, alias or id, or None."""
+        return self._lookup.get(normalize_name(name.replace("_", " ")))
+
+    def names(self):
+        """Return the display names of all registered items."""
+        return [item.name for item in self.items.values()]
+
+    def aliases(self):
+        """Return every (alias, display name) pair, including the name itself."""
+        return [(key, item.name) for key, item in self._lookup.items()]
+
+    def name_index(self):
+        """Return a fuzzy.NameIndex of every alias, built on first use."""
+        if self._name_index is None:
+            from fuzzy import NameIndex
+            self._name_index = NameIndex(self.aliases())
+        return self._name_index
+
+    def charges_for(self, name):
+        """Return the uses per unit of an item, or None if it is never used up."""
+        item = self.get(name)
+        return item.charges if item else None
+
+    def description_for(self, name):
+        """Return the embedding description of an item (or the name itself)."""
+        item = self.get(name)
+        return item.description if item else name
+
+    def use(self, game, name):
+        """Apply an item's effects for the game's player.
+
+        Returns:
+            str or None: Result text, or None if the item is unknown
+        """
+        item = self.get(name)
+        if item is None:
+            return None
+        return self._dispatch[item.id](game)
+
+    @staticmethod
+    def _compile(item):
+        """Turn an item definition into a function applying its effects."""
+        # Precompute (stat, delta, capability) once instead of on every use
+        ops = tuple((stat, delta, STAT_CAPABILITIES.get(stat)) for stat, delta in item.effects.items())
+        capabilities = tuple({cap for _, _, cap in ops if cap})
+        roles = item.roles
+        consumable = item.charges is not None
+
+        def use(game):
+            player = game.player
+            if roles and player.role not in roles:
+                return item.restricted_message
+            emptied = game.consume_item(item.name) if consumable else ""
+            if item.handler is not None:
+                return item.handler(game, item) + emptied
+            for capability in capabilities:
+                if not getattr(player, capability):
+                    return item.fallback_message.format(name=player.name) + emptied
+            for stat, delta, _ in ops:
+                setattr(player, stat, max(0, min(100, getattr(player, stat) + delta)))
+            return item.message.format(name=player.name) + emptied
+
+        return use
+
+
+ITEMS = ItemRegistry([
+    ItemDef(
+        "water_bottle", "Water Bottle",
+        "container for drinking water, hydration, liquid container",
+        aliases=("water", "canteen", "drink"), charges=2, effects={"water": 30},
+        message="You drink from the water bottle, restoring some hydration.",
+        fallback_message="You drink from the water bottle, but it doesn't seem to affect you much."
+    ),
+    ItemDef(
+        "canned_food", "Canned Food",
+        "preserved food, nutrition, sustenance, meal",
+        aliases=("food", "can", "meal"), charges=1, effects={"food": 40},
+        message="You eat the canned food, satisfying your hunger.",
+        fallback_message="You eat the canned food, but it doesn't seem to affect you much."
+    ),
+    ItemDef(
+        "blanket", "Blanket",
+        "cloth for warmth, covering, protection from cold",
+        message="You wrap the blanket around yourself. It provides some comfort against the elements."
+    ),
+    ItemDef(
+        "map", "Map",
+        "navigation tool, directions, guide, area layout",
+        handler=_use_map
+    ),
+    ItemDef(
+        "flashlight", "Flashlight",
+        "portable light, torch, illumination tool",
+        aliases=("torch", "light"),
+        message="You turn on the flashlight. Its beam cuts through the ambient light."
+    ),
+    ItemDef(
+        "first_aid_kit", "First Aid Kit",
+        "medical supplies, bandages, treatment, health items",
+        aliases=("medkit", "bandages", "medicine"), charges=2, effects={"health": 25},
+        message="You use the first aid kit, treating some wounds."
+    ),
+    ItemDef(
+        "compass", "Compass",
+        "navigation tool, direction finder, orientation device",
+        message="You check the compass. It confirms the cardinal directions."
+    ),
+    ItemDef(
+        "family_photo", "Family Photo",
+        "picture of loved ones, personal memento, memory",
+        aliases=("photo", "picture"), effects={"hope": 15},
+        message="You look at the photo of your family. {name} feels more hopeful.",
+        fallback_message="You look at the photo, feeling a mix of emotions."
+    ),
+    ItemDef(
+        "money", "Money",
+        "currency, cash, funds, financial resource",
+        aliases=("cash", "pesos", "dollars"),
+        message="You count the money. It might be useful if you encounter the right people."
+    ),
+    ItemDef(
+        "id_papers", "ID Papers",
+        "identification documents, passport, legal papers",
+        aliases=("id", "papers", "documents", "passport"),
+        message="You check your ID papers. Having them feels important, potentially risky."
+    ),
+    ItemDef(
+        "radio", "Radio",
+        "two-way radio, dispatch communication, walkie-talkie",
+        aliases=("walkie talkie",), roles=("patrol",), handler=_use_radio,
+        restricted_message="You fiddle with the radio, but can't make sense of the transmissions."
+    ),
+])
@@ -0,0 +1,30 @@
+"""
+Lazy imports for 'The Line: A Border Journey'
+
+This module imports the heavy optional dependencies of the AI command
+path, numpy and requests, on first use, so that starting the game does
+not pay for them when that path is never exercised. The embedding,
+vector store, index and shared catalog modules all load them from here
+instead of from each other.
+"""
+
+np = None
+requests = None
+
+
+def load_numpy():
+    """Import numpy on first use and return the module."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def load_requests():
+    """Import requests on first use and return the module."""
+    global requests
+    if requests is None:
+        import requests as requests_module
+        requests = requests_module
+    return requests
@@ -6,11 +6,19 @@ can navigate through in the game world.
 """
 
 import random
+from itertools import islice
 from character import Migrant, BorderPatrol
+from inventory import Inventory
+
+# Crowded locations list this many names and summarize the rest
+MAX_LISTED_CHARACTERS = 8
 
 class Location:
     """Base class for all game locations."""
     
+    __slots__ = ("name", "description", "danger_level", "characters", "items",
+                 "connections", "visited", "events", "_render_cache")
+    
     def __init__(self, name, description, danger_level=0):
         """Initialize a location.
         
@@ -22,20 +30,54 @@ class Location:
         self.name = name
         self.description = description
         self.danger_level = danger_level
-        self.characters = []  # Characters present at this location
-        self.items = []       # Items available at this location
+        self.characters = {}  # Characters present at this location {character: None}
+        self.items = Inventory()  # Items available at this location
         self.connections = {} # Connected locations {direction: location}
         self.visited = False  # Whether player has visited this location
         self.events = []      # Possible events at this location
+        self._render_cache = {}  # Memoized description fragments
         
+    # Detailed descriptions are assembled from these fragments, in order
+    FRAGMENTS = ("base", "danger", "connections", "characters", "items", "details")
+    
     def describe(self, detailed=False):
-        """Return a description of the location."""
-        base_desc = f"{self.name}: {self.description}"
+        """Return a description of the location.
         
+        Fragments are memoized and only rebuilt after the mutator that
+        affects them runs (see invalidate).
+        """
         if not detailed:
-            return base_desc
-            
-        # Add details about danger
+            return self._fragment("base")
+        
+        full = self._render_cache.get("detailed")
+        if full is None:
+            full = "".join([self._fragment(name) for name in self.FRAGMENTS])
+            self._render_cache["detailed"] = full
+        return full
+    
+    def invalidate(self, *fragments):
+        """Drop memoized description fragments (all of them if none are given).
+        
+        Call this after changing attributes such as danger_level directly.
+        """
+        if not fragments:
+            self._render_cache.clear()
+            return
+        for fragment in fragments:
+            self._render_cache.pop(fragment, None)
+        self._render_cache.pop("detailed", None)
+    
+    def _fragment(self, name):
+        text = self._render_cache.get(name)
+        if text is None:
+            text = getattr(self, "_render_" + name)()
+            self._render_cache[name] = text
+        return text
+    
+    def _render_base(self):
+        return f"{self.name}: {self.description}"
+    
+    def _render_danger(self):
         danger_desc = "\nDanger Level: "
         if self.danger_level <= 2:
             danger_desc += "Low - Relatively safe area."
@@ -45,55 +87,68 @@ class Location:
             danger_desc += "High - Very dangerous area."
         else:
             danger_desc += "Extreme - Life-threatening conditions."
-            
-        # Add details about connections
+        return danger_desc
+    
+    def _render_connections(self):
         connections_desc = "\nPaths: "
         if self.connections:
             connections_desc += ", ".join([f"{direction} to {location.name}" 
                                          for direction, location in self.connections.items()])
         else:
             connections_desc += "No obvious paths from here."
-            
-        # Add details about characters present
+        return connections_desc
+    
+    def _render_characters(self):
         characters_desc = "\nPresent: "
         if self.characters:
-            characters_desc += ", ".join([character.name for character in self.characters])
+            names = [character.name for character in islice(self.characters, MAX_LISTED_CHARACTERS)]
+            characters_desc += ", ".join(names)
+            if len(self.characters) > MAX_LISTED_CHARACTERS:
+                characters_desc += f" and {len(self.characters) - MAX_LISTED_CHARACTERS} others"
         else:
             characters_desc += "No one else is here."
-            
-        # Add details about items
+        return characters_desc
+    
+    def _render_items(self):
         items_desc = "\nItems: "
         if self.items:
-            items_desc += ", ".join(self.items)
+            items_desc += self.items.display()
         else:
             items_desc += "Nothing useful found here."
-            
-        return base_desc + danger_desc + connections_desc + characters_desc + items_desc
+        return items_desc
+    
+    def _render_details(self):
+        """Return the subclass-specific part of a detailed description."""
+        return ""
     
     def add_connection(self, direction, location):
         """Connect this location to another in the specified direction."""
         self.connections[direction] = location
+        self.invalidate("connections")
         
     def add_character(self, character):
         """Add a character to this location."""
-        self.characters.append(character)
+        self.characters[character] = None
         character.location = self
+        self.invalidate("characters")
         
     def remove_character(self, character):
         """Remove a character from this location."""
         if character in self.characters:
-            self.characters.remove(character)
+            del self.characters[character]
+            self.invalidate("characters")
             if character.location == self:
                 character.location = None
                 
-    def add_item(self, item):
-        """Add an item to this location."""
-        self.items.append(item)
+    def add_item(self, item, quantity=1):
+        """Add an item (or several of it) to this location."""
+        self.items.add(item, quantity)
+        self.invalidate("items")
         
-    def remove_item(self, item):
+    def remove_item(self, item, quantity=1):
         """Remove an item from this location if present."""
-        if item in self.items:
-            self.items.remove(item)
+        if self.items.remove(item, quantity):
+            self.invalidate("items")
             return True
         return False
     
@@ -111,6 +166,8 @@ class Location:
 class Desert(Location):
     """A desert location with extreme conditions."""
     
+    __slots__ = ("water_scarcity",)
+    
     def __init__(self, name, description, water_scarcity=8, danger_level=7):
         """Initialize a desert location.
         
@@ -123,40 +180,35 @@ class Desert(Location):
         super().__init__(name, description, danger_level)
         self.water_scarcity = water_scarcity
         
-    def describe(self, detailed=False):
-        """Return a description of the desert location."""
-        base_desc = super().describe(detailed)
-        
-        if detailed:
-            water_desc = "\nWater: "
-            if self.water_scarcity >= 8:
-                water_desc += "Critically scarce - No water sources visible."
-            elif self.water_scarcity >= 5:
-                water_desc += "Very limited - Might find small amounts if lucky."
-            else:
-                water_desc += "Limited - Some water sources may be found."
-            return base_desc + water_desc
-            
-        return base_desc
+    def _render_details(self):
+        """Return the water section of the desert description."""
+        water_desc = "\nWater: "
+        if self.water_scarcity >= 8:
+            water_desc += "Critically scarce - No water sources visible."
+        elif self.water_scarcity >= 5:
+            water_desc += "Very limited - Might find small amounts if lucky."
+        else:
+            water_desc += "Limited - Some water sources may be found."
+        return water_desc
     
     # location.py - Desert class modifications
     def apply_effects(self, character):
         effects = []
         
         # Common effects for all characters
-        if hasattr(character, 'water'):
+        if character.tracks_supplies:
             if character.water < 30:
                 effects.append("severely dehydrated")
             elif character.water < 50:
                 effects.append("feeling thirsty")
 
-        if self.danger_level > 5 and hasattr(character, 'health') and character.health < 50:
+        if self.danger_level > 5 and character.health < 50:
             effects.append("weakened by the harsh conditions")
         elif self.danger_level > 7:
             effects.append("struggling against the extreme heat")
 
         # Additional stress for Border Patrol
-        if isinstance(character, BorderPatrol) and hasattr(character, 'stress'):
+        if character.tracks_stress:
             character.stress = min(100, character.stress + 5)
             effects.append("stressed from desert conditions")
 
@@ -168,6 +220,8 @@ class Desert(Location):
 class Border(Location):
     """A border location with patrol presence."""
     
+    __slots__ = ("patrol_intensity",)
+    
     def __init__(self, name, description, patrol_intensity=5, danger_level=6):
         """Initialize a border location.
         
@@ -180,21 +234,16 @@ class Border(Location):
         super().__init__(name, description, danger_level)
         self.patrol_intensity = patrol_intensity
         
-    def describe(self, detailed=False):
-        """Return a description of the border location."""
-        base_desc = super().describe(detailed)
-        
-        if detailed:
-            patrol_desc = "\nPatrol: "
-            if self.patrol_intensity >= 8:
-                patrol_desc += "Heavy presence - Constant surveillance and patrols."
-            elif self.patrol_intensity >= 5:
-                patrol_desc += "Moderate presence - Regular patrols pass through."
-            else:
-                patrol_desc += "Light presence - Occasional patrols in the area."
-            return base_desc + patrol_desc
-            
-        return base_desc
+    def _render_details(self):
+        """Return the patrol section of the border description."""
+        patrol_desc = "\nPatrol: "
+        if self.patrol_intensity >= 8:
+            patrol_desc += "Heavy presence - Constant surveillance and patrols."
+        elif self.patrol_intensity >= 5:
+            patrol_desc += "Moderate presence - Regular patrols pass through."
+        else:
+            patrol_desc += "Light presence - Occasional patrols in the area."
+        return patrol_desc
     
     def encounter_chance(self):
         """Return the chance (0-100) of encountering border patrol."""
@@ -204,6 +253,8 @@ class Border(Location):
 class Settlement(Location):
     """A settlement location with people and resources."""
     
+    __slots__ = ("population", "services")
+    
     def __init__(self, name, description, population=0, danger_level=3):
         """Initialize a settlement location.
         
@@ -217,35 +268,31 @@ class Settlement(Location):
         self.population = population
         self.services = []  # Available services ("food", "shelter", "medical")
         
-    def describe(self, detailed=False):
-        """Return a description of the settlement location."""
-        base_desc = super().describe(detailed)
-        
-        if detailed:
-            pop_desc = "\nPopulation: "
-            if self.population > 10000:
-                pop_desc += "Large community"
-            elif self.population > 1000:
-                pop_desc += "Medium-sized community"
-            elif self.population > 100:
-                pop_desc += "Small community"
-            else:
-                pop_desc += "Tiny settlement"
-                
-            services_desc = "\nServices: "
-            if self.services:
-                services_desc += ", ".join(self.services)
-            else:
-                services_desc += "No services available"
-                
-            return base_desc + pop_desc + services_desc
+    def _render_details(self):
+        """Return the population and services sections of the settlement description."""
+        pop_desc = "\nPopulation: "
+        if self.population > 10000:
+            pop_desc += "Large community"
+        elif self.population > 1000:
+            pop_desc += "Medium-sized community"
+        elif self.population > 100:
+            pop_desc += "Small community"
+        else:
+            pop_desc += "Tiny settlement"
+            
+        services_desc = "\nServices: "
+        if self.services:
+            services_desc += ", ".join(self.services)
+        else:
+            services_desc += "No services available"
             
-        return base_desc
+        return pop_desc + services_desc
     
     def add_service(self, service):
         """Add an available service to this settlement."""
         if service not in self.services:
             self.services.append(service)
+            self.invalidate("details")
             
     def has_service(self, service):
         """Check if a specific service is available."""
@@ -263,24 +310,22 @@ class Settlement(Location):
 
         cost = service_costs.get(service_name.lower(), 0)
         
-        if not hasattr(character, 'money') or character.money < cost:
+        if not character.carries_money or character.money < cost:
             return f"You don't have enough money for {service_name} service (needs ${cost})."
 
         if service_name.lower() == "food":
-            if hasattr(character, 'food'):
+            if character.tracks_supplies:
                 character.food = min(100, character.food + 40)
                 character.money -= cost
                 return f"{character.name} pays ${cost} and receives a meal from the local community."
         elif service_name.lower() == "shelter":
-            if hasattr(character, 'health'):
-                character.health = min(100, character.health + 20)
-                character.money -= cost
-                return f"{character.name} pays ${cost} for shelter and rests safely."
+            character.health = min(100, character.health + 20)
+            character.money -= cost
+            return f"{character.name} pays ${cost} for shelter and rests safely."
         elif service_name.lower() == "medical":
-            if hasattr(character, "health"):
-                character.health = min(100, character.health + 35)
-                character.money -= cost
-                return f"{character.name} pays ${cost} and receives medical care."
+            character.health = min(100, character.health + 35)
+            character.money -= cost
+            return f"{character.name} pays ${cost} and receives medical care."
         
         return f"Used {service_name} service."
         
\ No newline at end of file
@@ -6,13 +6,25 @@ This game explores the human stories and moral complexities of border migration
 and enforcement through interactive storytelling.
 """
 
-import time
+import sys
+
+# Installed before any other import so that every module load is timed
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    from startup import StartupProfiler
+    STARTUP_PROFILER = StartupProfiler().install()
+
 import random
 import os
+import argparse
+import render
 from character import Character, Migrant, BorderPatrol
 from location import Location
 from game_engine import GameEngine
 from story import Story
+from telemetry import open_telemetry
+from replay import SessionRecording
+from profiler import Profiler
+from phrase_cache import PhraseCache
 
 
 def clear_screen():
@@ -21,10 +33,7 @@ def clear_screen():
 
 
 def print_slow(text, delay=0.03, end='\n'):
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
-    print(end=end)
+    render.print_slow(text, delay, end)
 
 
 def display_title():
@@ -43,30 +52,69 @@ def display_title():
     print_slow(title, 0.005)
 
 def intro_page():
+    """Show the title and welcome text; a keypress shows the rest of it at once."""
     clear_screen()
-    display_title()
+    with render.section():
+        display_title()
 
-    print_slow("\t\tWelcome to 'The Line: A Border Journey'\n")
-    print_slow("This game explores the human stories and moral complexities of border")
-    print_slow("migration through interactive storytelling. I've created this because")
-    print_slow("I am interested in coding and, henceforth I felt narrating a story-line")
-    print_slow("is something cool and creative that can be done!")
-    print()
+        print_slow("\t\tWelcome to 'The Line: A Border Journey'\n")
+        print_slow("This game explores the human stories and moral complexities of border")
+        print_slow("migration through interactive storytelling. I've created this because")
+        print_slow("I am interested in coding and, henceforth I felt narrating a story-line")
+        print_slow("is something cool and creative that can be done!")
+        print()
 
-    print_slow('\nPress Enter to continue ', end='')
-    print_slow("... ", delay=0.6, end='')
+        print_slow('\nPress Enter to continue ', end='')
+        print_slow("... ", delay=0.6, end='')
     input()
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="The Line: A Border Journey")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="Text speed multiplier (2 is twice as fast)")
+    parser.add_argument("--no-delay", action="store_true",
+                        help="Print all text instantly")
+    parser.add_argument("--telemetry", metavar="PATH", default=None,
+                        help="Append structured per-turn records to a JSONL log")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="Save the session's seed and inputs for replay.py")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed for the session")
+    parser.add_argument("--phrase-cache", metavar="PATH", default=None,
+                        help="Answer familiar phrasings from a phrase cache file and keep it updated")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each phase of every turn and print p50/p95/p99 on exit")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Report per-module import times and time to first prompt, then exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function to run the game."""
+    args = parse_args(argv)
+    # The startup profile measures loading, not the intro animation
+    instant = args.no_delay or args.startup_profile
+    render.configure(speed=args.speed, instant=True if instant else None)
+
     intro_page()
 
     # Initialize game components
     story = Story()
-    game = GameEngine(story)
+    recording = SessionRecording(args.record) if args.record else None
+    profiler = Profiler() if args.profile else None
+    phrase_cache = PhraseCache.load(args.phrase_cache) if args.phrase_cache else None
+    game = GameEngine(story, telemetry=open_telemetry(args.telemetry), seed=args.seed,
+                      recording=recording, profiler=profiler, phrase_cache=phrase_cache)
     
     # Start the game
-    game.start()
+    try:
+        game.start()
+    finally:
+        if phrase_cache is not None:
+            phrase_cache.save()
+        if profiler:
+            profiler.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+"""
+Stand-in embedding server for 'The Line: A Border Journey'
+
+This module serves the parts of the Ollama HTTP API the game uses, so
+the AI command path can be tested and benchmarked without a real
+Ollama installation:
+
+    POST /api/embeddings  {"model", "prompt"}  -> {"embedding": [...]}
+    POST /api/embed       {"model", "input"}   -> {"model", "embeddings": [[...], ...]}
+    GET  /api/tags                             -> {"models": [...]}
+
+Vectors are deterministic hashed bag-of-words embeddings: the same text
+always gets the same vector, and texts that share words are similar.
+Latency, jitter, error rate and dimensionality are configurable.
+
+Usage:
+    python ollama_stub.py [--port 11434] [--dims 768] [--latency 20] [--jitter 5] [--error-rate 0.01]
+    THE_LINE_OLLAMA_URL=http://localhost:11434/api/embeddings python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def fake_embedding(text, dims=768):
+    """Return a unit-length hashed bag-of-words vector for a text.
+
+    Args:
+        text (str): Text to embed
+        dims (int): Vector dimensionality
+
+    Returns:
+        list: dims floats, identical for identical text on every machine
+    """
+    vector = [0.0] * dims
+    for token in TOKEN_PATTERN.findall(text.lower()) or [text]:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        vector[value % dims] += 1.0 if value >> 63 else -1.0
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class StubConfig:
+    """Behaviour of the stand-in server."""
+
+    def __init__(self, dims=768, latency=0.0, jitter=0.0, error_rate=0.0, seed=None,
+                 model="nomic-embed-text"):
+        """
+        Initialize the configuration.
+
+        Args:
+            dims (int): Embedding dimensionality
+            latency (float): Mean delay per request in seconds
+            jitter (float): Maximum random deviation from the latency in seconds
+            error_rate (float): Fraction of requests answered with HTTP 500
+            seed (int): Seed for the latency and error randomness
+            model (str): Model name reported by /api/tags
+        """
+        self.dims = dims
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.model = model
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0   # Requests served, errors included
+        self.texts = 0      # Texts embedded
+        self.errors = 0     # Injected errors
+
+    def delay(self):
+        """Return this request's delay and whether it should fail."""
+        with self.lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            fail = self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return delay, fail
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers Ollama embedding requests using the server's StubConfig."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark and test output clean
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up (e.g. its timeout expired)
+
+    def do_GET(self):
+        config = self.server.config
+        if self.path == "/api/tags":
+            self._send(200, {"models": [{"name": config.model, "model": config.model}]})
+        elif self.path == "/":
+            self._send(200, {"status": "Ollama stub is running"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        config = self.server.config
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+
+        if self.path == "/api/embeddings":
+            texts = [payload.get("prompt", "")]
+        elif self.path == "/api/embed":
+            texts = payload.get("input", "")
+            texts = [texts] if isinstance(texts, str) else list(texts)
+        else:
+            self._send(404, {"error": "not found"})
+            return
+
+        delay, fail = config.delay()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(500, {"error": "injected failure"})
+            return
+
+        vectors = [fake_embedding(str(text), config.dims) for text in texts]
+        with config.lock:
+            config.texts += len(vectors)
+        if self.path == "/api/embeddings":
+            self._send(200, {"embedding": vectors[0]})
+        else:
+            self._send(200, {"model": payload.get("model", config.model), "embeddings": vectors})
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying a StubConfig."""
+
+    daemon_threads = True
+    request_queue_size = 128  # Many sessions may connect at once
+
+    def __init__(self, address, config):
+        super().__init__(address, StubHandler)
+        self.config = config
+
+    @property
+    def url(self):
+        """Base URL of the server, e.g. http://127.0.0.1:11434"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub(port=0, host="127.0.0.1", **config):
+    """Start a stub server in a background thread (port 0 picks a free port).
+
+    Returns:
+        StubServer: Running server; call shutdown() to stop it
+    """
+    server = StubServer((host, port), StubConfig(**config))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in Ollama embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--dims", type=int, default=768, help="Embedding dimensionality")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean delay per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum deviation from the latency (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and error randomness")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(dims=args.dims, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                        error_rate=args.error_rate, seed=args.seed)
+    server = StubServer((args.host, args.port), config)
+    print(f"Ollama stub listening on {server.url} ({args.dims} dims)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {config.requests} requests ({config.errors} injected errors, {config.texts} texts)")
+
+
+if __name__ == "__main__":
+    main()
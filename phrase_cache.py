@@ -0,0 +1,204 @@
+"""
+Phrase cache for 'The Line: A Border Journey'
+
+This module remembers which intent each player phrasing resolved to, so
+the phrasings players repeat ("check my health", "head north") resolve
+with one dictionary lookup instead of an embedding request.
+
+Phrases are normalized (lowercase, no punctuation or articles) and
+every resolution of a phrase is counted. A phrase is only answered from
+the cache once it has been seen enough times and one intent accounts
+for enough of its resolutions. The least recently used phrases are
+evicted when the cache is full.
+
+The cache can be seeded offline from telemetry logs and is kept up to
+date while playing:
+
+    python phrase_cache.py seed logs/ --out phrases.json
+    python phrase_cache.py show phrases.json
+    python main.py --phrase-cache phrases.json
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import OrderedDict
+
+from intents import Intent, split_clauses
+
+
+VERSION = 1
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+FILLER_WORDS = {"a", "an", "the", "please"}
+
+
+def normalize_phrase(text):
+    """Return the cache key for a command: lowercase words without punctuation or articles."""
+    words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in FILLER_WORDS]
+    return " ".join(words)
+
+
+class PhraseCache:
+    """Normalized phrase -> resolved intent, with confidence tracking and LRU eviction."""
+
+    def __init__(self, path=None, capacity=5000, min_count=2, min_confidence=0.8):
+        """
+        Initialize an empty cache.
+
+        Args:
+            path (str): File the cache is loaded from and saved to (optional)
+            capacity (int): Maximum number of phrases kept
+            min_count (int): Resolutions of a phrase needed before it is served
+            min_confidence (float): Share of those resolutions the most common
+                intent must have
+        """
+        self.path = path
+        self.capacity = capacity
+        self.min_count = min_count
+        self.min_confidence = min_confidence
+        self.phrases = OrderedDict()  # phrase -> {(action, target): count}, least recent first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def lookup(self, command):
+        """Return the cached Intent for a command, or None if it is not confidently known."""
+        phrase = normalize_phrase(command)
+        counts = self.phrases.get(phrase)
+        best = self._best(counts) if counts else None
+        if best is None:
+            self.misses += 1
+            return None
+        self.phrases.move_to_end(phrase)
+        self.hits += 1
+        (action, target), confidence = best
+        return Intent(action, target, confidence, "cache")
+
+    def observe(self, command, intent, count=1):
+        """Count one resolution of a command (compound commands are ignored).
+
+        Args:
+            command (str): Player input
+            intent (tuple): (action, target) it resolved to
+            count (int): Number of resolutions to add
+        """
+        if len(split_clauses(command.lower().strip())) > 1:
+            return
+        phrase = normalize_phrase(command)
+        if not phrase:
+            return
+        counts = self.phrases.get(phrase)
+        if counts is None:
+            counts = self.phrases[phrase] = {}
+            while len(self.phrases) > self.capacity:
+                self.phrases.popitem(last=False)
+        else:
+            self.phrases.move_to_end(phrase)
+        key = tuple(intent)
+        counts[key] = counts.get(key, 0) + count
+
+    def confidence(self, command):
+        """Return (intent, share of resolutions) for a command's most common intent, or (None, 0)."""
+        counts = self.phrases.get(normalize_phrase(command))
+        if not counts:
+            return None, 0.0
+        key = max(counts, key=counts.get)
+        return key, counts[key] / sum(counts.values())
+
+    def _best(self, counts):
+        total = sum(counts.values())
+        if total < self.min_count:
+            return None
+        key = max(counts, key=counts.get)
+        confidence = counts[key] / total
+        if confidence < self.min_confidence:
+            return None
+        return key, confidence
+
+    def seed_from_logs(self, paths):
+        """Count the resolved intents of the single commands in telemetry logs.
+
+        Args:
+            paths (list): Log files, directories or glob patterns
+
+        Returns:
+            int: Number of turn records counted
+        """
+        from analytics import find_logs, open_log
+        counted = 0
+        for path in find_logs(paths):
+            with open_log(path) as log_file:
+                for line in log_file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("type") != "turn" or not record.get("intent") or not record.get("command"):
+                        continue
+                    self.observe(record["command"], (record["intent"], record.get("target")))
+                    counted += 1
+        return counted
+
+    def to_dict(self):
+        return {"version": VERSION, "phrases": {
+            phrase: [[action, target, count] for (action, target), count in counts.items()]
+            for phrase, counts in self.phrases.items()
+        }}
+
+    def save(self, path=None):
+        """Write the cache as JSON (to path or the cache's own path)."""
+        path = path or self.path
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as cache_file:
+            json.dump(self.to_dict(), cache_file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Read a cache saved with save(); a missing file gives an empty cache."""
+        cache = cls(path, **kwargs)
+        if not os.path.exists(path):
+            return cache
+        with open(path, "r", encoding="utf-8") as cache_file:
+            data = json.load(cache_file)
+        if data.get("version") != VERSION:
+            return cache
+        for phrase, entries in data["phrases"].items():
+            cache.phrases[phrase] = {(action, target): count for action, target, count in entries}
+        while len(cache.phrases) > cache.capacity:
+            cache.phrases.popitem(last=False)
+        return cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phrase-to-intent cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed = commands.add_parser("seed", help="Count the resolved commands in telemetry logs")
+    seed.add_argument("logs", nargs="+", help="Log files, directories or glob patterns")
+    seed.add_argument("--out", required=True, help="Cache file to create or extend")
+    show = commands.add_parser("show", help="List the phrases a cache would answer")
+    show.add_argument("cache", help="Cache file")
+    show.add_argument("--top", type=int, default=20, help="Phrases to list")
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        cache = PhraseCache.load(args.out)
+        counted = cache.seed_from_logs(args.logs)
+        cache.save()
+        print(f"Counted {counted} commands; {len(cache)} phrases in {args.out}")
+        return
+
+    cache = PhraseCache.load(args.cache)
+    served = [(sum(counts.values()), phrase, cache._best(counts)) for phrase, counts in cache.phrases.items()]
+    served = sorted((entry for entry in served if entry[2]), reverse=True, key=lambda entry: entry[0])
+    print(f"{len(served)} of {len(cache)} phrases are answered from the cache")
+    for total, phrase, ((action, target), confidence) in served[:args.top]:
+        intent = f"{action} {target}" if target else action
+        print(f"  {total:>6}  {phrase:<32} -> {intent:<28} {confidence:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Turn profiling for 'The Line: A Border Journey'
+
+This module measures where the time of a turn goes. The game engine
+wraps each phase of a turn (location effects, resource consumption, the
+NPC tick, game over checks, narrative rolls, input, command processing
+with its embedding calls, moves and interactions, event execution) in a
+named span. An enabled Profiler keeps a quantile sketch per span for
+p50/p95/p99 reports and the self time of every span stack, which can be
+written in folded format for flamegraph tools.
+
+Profiling is off by default: the engine then uses NULL_PROFILER, whose
+spans are a single shared no-op context manager.
+
+Usage:
+    python main.py --profile
+    python profiler.py session.json [--folded turn.folded] [--cprofile turn.prof]
+"""
+
+import argparse
+import functools
+import sys
+import time
+
+from sketches import QuantileSketch
+
+
+class _Span:
+    """Context manager timing one span of an enabled Profiler."""
+
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._stack.append([self.name, 0.0])
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._finish(time.perf_counter() - self.started)
+        return False
+
+
+class Profiler:
+    """Collects span timings as quantile sketches and folded stacks."""
+
+    enabled = True
+
+    def __init__(self):
+        """Initialize an empty profiler."""
+        self.spans = {}    # span name -> QuantileSketch of milliseconds
+        self.folded = {}   # "turn;command;move" -> self time in seconds
+        self._stack = []   # [name, time spent in child spans] per open span
+
+    def span(self, name):
+        """Return a context manager that times a named span."""
+        return _Span(self, name)
+
+    def _finish(self, elapsed):
+        path = ";".join(name for name, _ in self._stack)
+        name, children = self._stack.pop()
+        if self._stack:
+            self._stack[-1][1] += elapsed
+        self.folded[path] = self.folded.get(path, 0.0) + max(0.0, elapsed - children)
+        sketch = self.spans.get(name)
+        if sketch is None:
+            sketch = self.spans[name] = QuantileSketch()
+        sketch.add(elapsed * 1000)
+
+    def summary(self):
+        """Return {span name: count, mean, p50, p95, p99 in milliseconds}."""
+        return {name: sketch.summary() for name, sketch in self.spans.items()}
+
+    def report(self, stream=None):
+        """Write a table of span latencies, slowest total first."""
+        stream = stream or sys.stderr
+        rows = sorted(self.spans.items(), key=lambda item: item[1].total, reverse=True)
+        stream.write("\nTURN PROFILE (ms)\n")
+        stream.write("=================\n")
+        stream.write(f"{'span':<14}{'count':>8}{'total':>12}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}\n")
+        for name, sketch in rows:
+            summary = sketch.summary()
+            stream.write(f"{name:<14}{summary['count']:>8}{sketch.total:>12.2f}{summary['mean']:>10.3f}"
+                         f"{summary['p50']:>10.3f}{summary['p95']:>10.3f}{summary['p99']:>10.3f}\n")
+        stream.flush()
+
+    def write_folded(self, path):
+        """Write self times as folded stacks (microseconds) for flamegraph tools."""
+        with open(path, "w", encoding="utf-8") as folded_file:
+            for stack, seconds in sorted(self.folded.items()):
+                folded_file.write(f"{stack} {round(seconds * 1e6)}\n")
+
+
+class _NullSpan:
+    """Shared span of the NullProfiler; entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """Profiler used when profiling is off; every call is a no-op."""
+
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name):
+        return self._span
+
+    def summary(self):
+        return {}
+
+    def report(self, stream=None):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def spanned(name):
+    """Decorate a GameEngine method so that each call is timed as a span."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the turns of a recorded game session")
+    parser.add_argument("recording", help="Recording saved with main.py --record")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the session this many times")
+    parser.add_argument("--folded", metavar="PATH", help="Write span stacks in folded (flamegraph) format")
+    parser.add_argument("--cprofile", metavar="PATH", help="Also run under cProfile and save the stats")
+    args = parser.parse_args(argv)
+
+    from replay import Replayer, SessionRecording  # Imported here to keep profiling imports light
+    recording = SessionRecording.load(args.recording)
+    profiler = Profiler()
+
+    cprofile = None
+    if args.cprofile:
+        import cProfile
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    for _ in range(args.repeat):
+        replayer = Replayer(recording, snapshot_interval=sys.maxsize)
+        replayer.engine.profiler = profiler
+        replayer.run()
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(args.cprofile)
+
+    profiler.report(sys.stdout)
+    if args.folded:
+        profiler.write_folded(args.folded)
+        print(f"\nFolded stacks written to {args.folded}")
+    if cprofile is not None:
+        import pstats
+        print(f"\ncProfile stats written to {args.cprofile}")
+        pstats.Stats(cprofile, stream=sys.stdout).sort_stats("cumulative").print_stats(15)
+
+
+if __name__ == "__main__":
+    main()
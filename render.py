@@ -0,0 +1,209 @@
+"""
+Text rendering for 'The Line: A Border Journey'
+
+This module implements the typewriter effect used for narrative text.
+Instead of writing and sleeping once per character, the renderer works
+in frames: each frame writes every character that is due by the elapsed
+time in a single buffered write, then waits for the next frame or a
+keypress. A keypress skips to the end of the text (or, inside a
+section(), to the end of every text in the section), a global speed
+multiplier scales every delay, and no-delay mode prints text at once
+for headless and server use.
+
+Settings can also be given through the environment:
+    THE_LINE_NO_DELAY=1      print everything instantly
+    THE_LINE_TEXT_SPEED=2.0  animate twice as fast
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:  # POSIX keypress detection
+    import select
+    import termios
+    import tty
+except ImportError:  # Windows
+    select = termios = tty = None
+
+try:  # Windows keypress detection
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class Renderer:
+    """Writes text with a frame-based typewriter animation."""
+
+    def __init__(self, stream=None, speed=1.0, instant=False, frame_rate=60, skippable=True):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream: Text stream to write to (default: sys.stdout at write time)
+            speed (float): Multiplier applied to every delay (2.0 is twice as fast)
+            instant (bool): Print text immediately without any animation
+            frame_rate (int): Maximum number of writes per second while animating
+            skippable (bool): Let a keypress skip to the end of the text
+        """
+        self._stream = stream
+        self.speed = speed
+        self.instant = instant
+        self.frame_interval = 1.0 / frame_rate
+        self.skippable = skippable
+        self._in_section = False
+        self._section_skipped = False  # A keypress skipped the current section
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Create a renderer configured from environment variables."""
+        environ = os.environ if environ is None else environ
+        instant = environ.get("THE_LINE_NO_DELAY", "").lower() in ("1", "true", "yes")
+        try:
+            speed = float(environ.get("THE_LINE_TEXT_SPEED", "1.0"))
+        except ValueError:
+            speed = 1.0
+        return cls(speed=speed, instant=instant)
+
+    @property
+    def stream(self):
+        return self._stream if self._stream is not None else sys.stdout
+
+    def configure(self, speed=None, instant=None, skippable=None):
+        """Change the renderer settings at runtime."""
+        if speed is not None:
+            self.speed = speed
+        if instant is not None:
+            self.instant = instant
+        if skippable is not None:
+            self.skippable = skippable
+
+    @contextmanager
+    def section(self):
+        """Group several writes so that one keypress shows the rest of them at once."""
+        if self._in_section:
+            yield
+            return
+        self._in_section, self._section_skipped = True, False
+        try:
+            yield
+        finally:
+            self._in_section = self._section_skipped = False
+
+    def _animates(self, delay):
+        return not self.instant and not self._section_skipped and delay > 0 and self.speed > 0
+
+    def print_slow(self, text, delay=0.03, end="\n"):
+        """Write text with the typewriter effect.
+
+        Args:
+            text (str): Text to write
+            delay (float): Seconds per character at speed 1.0
+            end (str): String written after the text
+        """
+        stream = self.stream
+        if not self._animates(delay) or not text:
+            stream.write(text + end)
+            stream.flush()
+            return
+
+        char_delay = delay / self.speed
+        start = time.monotonic()
+        shown = 0
+        with _KeyWatcher(self.skippable and _is_interactive(stream)) as keys:
+            while shown < len(text):
+                due = min(len(text), int((time.monotonic() - start) / char_delay) + 1)
+                if due > shown:
+                    stream.write(text[shown:due])
+                    stream.flush()
+                    shown = due
+                if shown >= len(text):
+                    break
+                # Sleep until the next character is due, but at least one frame
+                next_due = start + shown * char_delay
+                if keys.wait(max(self.frame_interval, next_due - time.monotonic())):
+                    stream.write(text[shown:])
+                    shown = len(text)
+                    self._section_skipped = self._in_section
+        stream.write(end)
+        stream.flush()
+
+    def pause(self, seconds):
+        """Sleep for a scaled amount of time (skipped in no-delay mode)."""
+        if self._animates(seconds):
+            time.sleep(seconds / self.speed)
+
+
+def _is_interactive(stream):
+    try:
+        return stream.isatty() and sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+class _KeyWatcher:
+    """Waits for frame deadlines while watching stdin for a keypress."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled and (msvcrt is not None or termios is not None)
+        self._saved = None
+
+    def __enter__(self):
+        if self.enabled and termios is not None:
+            try:
+                fd = sys.stdin.fileno()
+                self._saved = termios.tcgetattr(fd)
+                tty.setcbreak(fd)
+            except (termios.error, ValueError, OSError):
+                self.enabled = False
+        return self
+
+    def __exit__(self, *exc):
+        if self._saved is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+        return False
+
+    def wait(self, timeout):
+        """Wait up to timeout seconds; return True if a key was pressed."""
+        if not self.enabled:
+            time.sleep(timeout)
+            return False
+        if msvcrt is not None:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if msvcrt.kbhit():
+                    msvcrt.getwch()
+                    return True
+                time.sleep(0.005)
+            return False
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if ready:
+            os.read(sys.stdin.fileno(), 1024)  # Swallow the key so it doesn't reach the prompt
+            return True
+        return False
+
+
+# Shared renderer used by the game
+RENDERER = Renderer.from_env()
+
+
+def print_slow(text, delay=0.03, end="\n"):
+    """Write text with the shared renderer's typewriter effect."""
+    RENDERER.print_slow(text, delay, end)
+
+
+def pause(seconds):
+    """Sleep with the shared renderer's speed settings."""
+    RENDERER.pause(seconds)
+
+
+def configure(speed=None, instant=None, skippable=None):
+    """Change the shared renderer's settings."""
+    RENDERER.configure(speed, instant, skippable)
+
+
+def section():
+    """Group writes so that one keypress skips the shared renderer's animation of all of them."""
+    return RENDERER.section()
@@ -0,0 +1,311 @@
+"""
+Session recording and replay for 'The Line: A Border Journey'
+
+This module treats a game session as an event stream: the random seed,
+the player's character, and every input in order - commands, quit
+confirmations and moral choices - together with how the embeddings
+engine resolved each command and how many NPCs each simulation tick
+advanced. Replaying the stream reproduces the session exactly without
+calling input() or the embedding server.
+
+The Replayer keeps a snapshot of the full game state every few turns,
+so jumping to any turn restores the nearest earlier snapshot and only
+replays the turns after it.
+
+Usage:
+    python main.py --record session.json
+    python replay.py session.json --turn 12
+"""
+
+import argparse
+import contextlib
+import io
+import json
+
+import render
+from telemetry import NULL_TELEMETRY
+
+
+class ReplayError(Exception):
+    """Raised when a recording does not match the game being replayed."""
+
+
+class EndOfRecording(ReplayError):
+    """Raised when the game asks for more input than was recorded."""
+
+
+# Returned by Playback.next_resolution() when an input has no recorded intent
+NOT_RECORDED = object()
+
+
+class SessionRecording:
+    """The seed, player and input stream of one game session."""
+
+    VERSION = 2
+    SUPPORTED_VERSIONS = (1, 2)  # Version 1 recorded AI resolutions only, under "ai"
+
+    def __init__(self, path=None):
+        """
+        Initialize an empty recording.
+
+        Args:
+            path (str): File the recording is saved to (optional)
+        """
+        self.path = path
+        self.seed = None
+        self.player = None   # {"name", "type", "extra"}
+        self.entries = []    # {"input": text, "intent"/"intents": ...} or {"tick": steps}
+
+    def begin(self, seed, name, character_type, extra_info):
+        """Start recording a session."""
+        self.seed = seed
+        self.player = {"name": name, "type": character_type, "extra": dict(extra_info)}
+        self.entries = []
+
+    def record_input(self, text):
+        """Record one line of player input."""
+        self.entries.append({"input": text})
+
+    def record_resolution(self, resolution):
+        """Record the intent the last input resolved to (None if not understood)."""
+        self.entries[-1]["intent"] = list(resolution) if resolution else None
+
+    def record_resolutions(self, resolutions):
+        """Record the intents of the clauses of a compound last input."""
+        self.entries[-1]["intents"] = [list(resolution) if resolution else None for resolution in resolutions]
+
+    def record_tick(self, processed):
+        """Record how many NPCs a simulation tick advanced."""
+        self.entries.append({"tick": processed})
+
+    @property
+    def inputs(self):
+        """Number of recorded inputs."""
+        return sum(1 for entry in self.entries if "input" in entry)
+
+    def to_dict(self):
+        return {"version": self.VERSION, "seed": self.seed, "player": self.player,
+                "entries": self.entries}
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        if data.get("version") not in cls.SUPPORTED_VERSIONS:
+            raise ReplayError(f"Unsupported recording version: {data.get('version')}")
+        recording = cls(path)
+        recording.seed = data["seed"]
+        recording.player = data["player"]
+        recording.entries = data["entries"]
+        return recording
+
+    def save(self, path=None):
+        """Write the recording as JSON (to path or the recording's own path)."""
+        path = path or self.path
+        if not path or self.player is None:
+            return
+        with open(path, "w", encoding="utf-8") as recording_file:
+            json.dump(self.to_dict(), recording_file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        """Read a recording saved with save()."""
+        with open(path, "r", encoding="utf-8") as recording_file:
+            return cls.from_dict(json.load(recording_file), path)
+
+
+class Playback:
+    """Cursor over a recording that answers the game's input requests."""
+
+    def __init__(self, recording, position=0):
+        self.entries = recording.entries
+        self.position = position
+        self._last_input = None
+
+    def next_input(self, prompt=""):
+        """Return the next recorded input."""
+        entry = self._next("input")
+        self._last_input = entry
+        return entry["input"]
+
+    def next_resolution(self):
+        """Return the recorded intent of the last input as (action, target).
+        
+        Returns None if the input was not understood, or NOT_RECORDED if the
+        recording does not say and the input should be parsed again.
+        """
+        entry = self._last_input or {}
+        if "intent" in entry:
+            return tuple(entry["intent"]) if entry["intent"] else None
+        if entry.get("ai"):
+            return tuple(entry["ai"])
+        return NOT_RECORDED
+
+    def next_resolutions(self):
+        """Return the recorded intents of a compound last input, or NOT_RECORDED."""
+        entry = self._last_input or {}
+        if "intents" in entry:
+            return [tuple(resolution) if resolution else None for resolution in entry["intents"]]
+        return NOT_RECORDED
+
+    def next_tick(self):
+        """Return the recorded NPC count of the next tick, or None if none was recorded."""
+        if self.position < len(self.entries) and "tick" in self.entries[self.position]:
+            self.position += 1
+            return self.entries[self.position - 1]["tick"]
+        return None
+
+    def _next(self, kind):
+        # Skip ticks the game did not ask for (e.g. no NPCs)
+        while self.position < len(self.entries):
+            entry = self.entries[self.position]
+            self.position += 1
+            if kind in entry:
+                return entry
+        raise EndOfRecording(f"Recording ended while waiting for {kind}")
+
+
+@contextlib.contextmanager
+def quiet(output):
+    """Send game output to a buffer and disable text animation."""
+    renderer = render.RENDERER
+    instant = renderer.instant
+    renderer.configure(instant=True)
+    try:
+        with contextlib.redirect_stdout(output):
+            yield
+    finally:
+        renderer.configure(instant=instant)
+
+
+class Replayer:
+    """Reconstructs the game state at any step of a recorded session."""
+
+    def __init__(self, recording, story_factory=None, snapshot_interval=10):
+        """
+        Initialize the replayer.
+
+        Args:
+            recording (SessionRecording): Session to replay
+            story_factory (callable): Creates the Story (default: story.Story)
+            snapshot_interval (int): Steps between state snapshots
+        """
+        from game_engine import GameEngine  # Imported here to avoid circular imports
+        if story_factory is None:
+            from story import Story
+            story_factory = Story
+
+        self.recording = recording
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.snapshots = {}      # step -> (game state, playback position)
+        self.step = 0            # Turns played so far
+        self.finished = False
+        self.last_output = ""
+
+        player = recording.player
+        with quiet(io.StringIO()):
+            self.engine = GameEngine(story_factory(), telemetry=NULL_TELEMETRY, seed=recording.seed)
+            self.engine.embeddings_engine = None
+            self.engine.playback = Playback(recording)
+            self.engine.setup(player["name"], player["type"], **player["extra"])
+        self._take_snapshot()
+
+    def _take_snapshot(self):
+        self.snapshots[self.step] = (self.engine.snapshot(), self.engine.playback.position)
+
+    def _restore(self, step):
+        state, position = self.snapshots[step]
+        self.engine.restore(state)
+        self.engine.playback = Playback(self.recording, position)
+        self.step = step
+        self.finished = False
+
+    def advance(self):
+        """Replay one turn.
+
+        Returns:
+            bool: False if the session had already ended
+        """
+        if self.finished or self.engine.game_over:
+            self.finished = True
+            return False
+        if self.step % self.snapshot_interval == 0 and self.step not in self.snapshots:
+            self._take_snapshot()
+
+        output = io.StringIO()
+        try:
+            with quiet(output):
+                keep_playing = self.engine.play_turn()
+        except EndOfRecording:
+            # The session was closed at this turn's prompt
+            keep_playing = False
+        self.last_output = output.getvalue()
+        self.step += 1
+        if not keep_playing or self.engine.game_over:
+            self.finished = True
+        return True
+
+    def seek(self, step):
+        """Move to the state after `step` turns (or the end of the session).
+
+        Returns:
+            GameEngine: The engine in that state
+        """
+        nearest = max((s for s in self.snapshots if s <= step), default=0)
+        if self.step > step or nearest > self.step:
+            self._restore(nearest)
+        while self.step < step and self.advance():
+            pass
+        return self.engine
+
+    def seek_turn(self, turn):
+        """Move to the first step at which the game's turn counter reaches `turn`.
+
+        Returns:
+            GameEngine: The engine in that state
+        """
+        earlier = [s for s, (state, _) in self.snapshots.items() if state["turn_count"] < turn]
+        nearest = max(earlier, default=0)
+        if self.engine.turn_count >= turn or nearest > self.step:
+            self._restore(nearest)
+        while self.engine.turn_count < turn and self.advance():
+            pass
+        return self.engine
+
+    def run(self):
+        """Replay to the end of the session.
+
+        Returns:
+            GameEngine: The engine in its final state
+        """
+        while self.advance():
+            pass
+        return self.engine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded game session")
+    parser.add_argument("recording", help="Recording saved with main.py --record")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--step", type=int, help="Stop after this many turns have been replayed")
+    target.add_argument("--turn", type=int, help="Stop when the game's turn counter reaches this value")
+    parser.add_argument("--snapshot-interval", type=int, default=10, help="Steps between state snapshots")
+    args = parser.parse_args(argv)
+
+    replayer = Replayer(SessionRecording.load(args.recording), snapshot_interval=args.snapshot_interval)
+    if args.step is not None:
+        engine = replayer.seek(args.step)
+    elif args.turn is not None:
+        engine = replayer.seek_turn(args.turn)
+    else:
+        engine = replayer.run()
+
+    print(f"Step {replayer.step}{' (end of session)' if replayer.finished else ''}")
+    if replayer.last_output.strip():
+        print("\nLast turn output:")
+        print(replayer.last_output.strip())
+    print("\n" + engine.get_status())
+    if engine.game_over:
+        print(f"Ending: {engine.ending}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Event rules for 'The Line: A Border Journey'
+
+This module gates events behind preconditions over story flags,
+character stats and locations. Rules are indexed by the flags they
+depend on so that a flag change only re-evaluates the rules that
+read it, and the eligible events for a location are kept up to date
+incrementally instead of being recomputed from the whole catalog.
+"""
+
+import random
+
+
+class Rule:
+    """Preconditions that must hold for an event to be eligible."""
+
+    def __init__(self, event, flags=None, stats=None, locations=None):
+        """
+        Initialize a rule.
+
+        Args:
+            event: The event this rule gates
+            flags (dict): Required story flag values {flag_name: value}
+            stats (dict): Inclusive stat ranges {stat_name: (minimum, maximum)};
+                either bound may be None
+            locations (list): Names of the locations where the event may occur
+                (in addition to the event's location_types)
+        """
+        self.event = event
+        self.flags = dict(flags or {})
+        self.stats = dict(stats or {})
+        self.locations = set(locations or [])
+
+    @classmethod
+    def from_event(cls, event):
+        """Build a rule from the preconditions declared on an event."""
+        preconditions = getattr(event, "preconditions", None) or {}
+        return cls(
+            event,
+            flags=preconditions.get("flags"),
+            stats=preconditions.get("stats"),
+            locations=preconditions.get("locations"),
+        )
+
+    def applies_to(self, location):
+        """Check the static location preconditions."""
+        if self.locations and location.name not in self.locations:
+            return False
+        return self.event.can_occur(location)
+
+    def flag_met(self, character, flag_name):
+        """Check a single flag precondition."""
+        return character.story_flags.get(flag_name, False) == self.flags[flag_name]
+
+    def flags_met(self, character):
+        """Check every flag precondition."""
+        return all(self.flag_met(character, flag_name) for flag_name in self.flags)
+
+    def stats_met(self, character):
+        """Check the stat preconditions against the character's current stats."""
+        for stat, (minimum, maximum) in self.stats.items():
+            value = getattr(character, stat, None)
+            if value is None:
+                return False
+            if minimum is not None and value < minimum:
+                return False
+            if maximum is not None and value > maximum:
+                return False
+        return True
+
+
+class RuleEngine:
+    """Keeps the set of eligible events per location up to date."""
+
+    def __init__(self):
+        """Initialize an empty rule engine."""
+        self.rules = []
+        self.character = None
+        self._flag_index = {}   # flag name -> ids of rules reading it
+        self._unmet = []        # rule id -> set of unmet flag names
+        self._rule_locations = []  # rule id -> locations the rule applies to
+        self._eligible = {}     # location -> {rule id: None}, flags satisfied
+
+    def add_rule(self, rule, locations):
+        """Register a rule for the locations where it may occur.
+
+        Args:
+            rule (Rule): The rule to add
+            locations (iterable): Candidate locations; filtered by rule.applies_to
+        """
+        rule_id = len(self.rules)
+        self.rules.append(rule)
+        self._rule_locations.append([loc for loc in locations if rule.applies_to(loc)])
+
+        for flag_name in rule.flags:
+            self._flag_index.setdefault(flag_name, []).append(rule_id)
+
+        unmet = set(rule.flags)
+        if self.character is not None:
+            unmet = {f for f in rule.flags if not rule.flag_met(self.character, f)}
+        self._unmet.append(unmet)
+        if not unmet:
+            self._mark_eligible(rule_id)
+        return rule
+
+    def add_event(self, event, locations):
+        """Register an event using the preconditions it declares."""
+        return self.add_rule(Rule.from_event(event), locations)
+
+    def bind(self, character):
+        """Track the story flags of a character (usually the player)."""
+        if self.character is not None:
+            self.character.remove_flag_observer(self.on_flag_changed)
+        self.character = character
+        character.add_flag_observer(self.on_flag_changed)
+
+        for rule_id, rule in enumerate(self.rules):
+            was_eligible = not self._unmet[rule_id]
+            self._unmet[rule_id] = {f for f in rule.flags if not rule.flag_met(character, f)}
+            self._update(rule_id, was_eligible)
+
+    def on_flag_changed(self, character, flag_name):
+        """Re-evaluate only the rules that depend on the changed flag."""
+        if character is not self.character:
+            return
+        for rule_id in self._flag_index.get(flag_name, ()):
+            unmet = self._unmet[rule_id]
+            was_eligible = not unmet
+            if self.rules[rule_id].flag_met(character, flag_name):
+                unmet.discard(flag_name)
+            else:
+                unmet.add(flag_name)
+            self._update(rule_id, was_eligible)
+
+    def _update(self, rule_id, was_eligible):
+        is_eligible = not self._unmet[rule_id]
+        if is_eligible and not was_eligible:
+            self._mark_eligible(rule_id)
+        elif was_eligible and not is_eligible:
+            for location in self._rule_locations[rule_id]:
+                self._eligible[location].pop(rule_id, None)
+
+    def _mark_eligible(self, rule_id):
+        for location in self._rule_locations[rule_id]:
+            self._eligible.setdefault(location, {})[rule_id] = None
+
+    def eligible_events(self, location, character=None):
+        """Return the events whose preconditions currently hold at a location."""
+        character = character or self.character
+        events = []
+        for rule_id in self._eligible.get(location, ()):
+            rule = self.rules[rule_id]
+            if not rule.stats or (character is not None and rule.stats_met(character)):
+                events.append(rule.event)
+        return events
+
+    def pick_event(self, location, character=None):
+        """Return a random eligible event for a location, or None."""
+        events = self.eligible_events(location, character)
+        if not events:
+            return None
+        return random.choice(events)
@@ -0,0 +1,211 @@
+"""
+Shared embedding catalogs for 'The Line: A Border Journey'
+
+This module lets the worker processes of a pool share one copy of the
+embedding catalogs instead of each building its own. One process
+publishes the catalogs (EmbeddingTable or CompactEmbeddings objects)
+into a shared memory segment; workers attach to it and search read-only
+numpy views of the same pages.
+
+Every publish writes a new, immutable segment named "<name>.<version>"
+and then bumps the version number kept in a small segment named
+"<name>". Workers call refresh() between turns to swap in a newer
+catalog. A segment is only unlinked after its successor is published,
+and workers that still map it keep reading it until they let go, so a
+reader never sees a half-written catalog.
+
+    publisher = CatalogPublisher("the-line")
+    publisher.publish(engine.catalogs())
+    ...
+    # in each worker
+    engine.attach_catalogs("the-line")
+
+Before Python 3.13, attaching registers a segment with the resource
+tracker of the attaching process, so attach from processes started by
+multiprocessing in the publishing process (which share its tracker).
+"""
+
+import json
+import struct
+from multiprocessing import shared_memory
+
+from lazy_imports import load_numpy
+from vector_store import CompactEmbeddings, EmbeddingTable
+
+
+FORMAT_VERSION = 1
+ALIGNMENT = 64  # Byte alignment of every array in a segment
+LENGTH_FORMAT = "<q"  # Metadata length, and the version number in the version segment
+CATALOG_TYPES = {"table": EmbeddingTable, "compact": CompactEmbeddings}
+
+
+def _attach(name):
+    """Open an existing segment without taking ownership of it."""
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name)
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _read_version(segment):
+    return struct.unpack_from(LENGTH_FORMAT, segment.buf, 0)[0]
+
+
+class CatalogPublisher:
+    """Writes versions of a set of catalogs to shared memory."""
+
+    def __init__(self, name):
+        """
+        Create the version segment for a catalog name.
+
+        Args:
+            name (str): Name workers attach with
+        """
+        self.name = name
+        self.version = 0
+        self._version_segment = shared_memory.SharedMemory(name, create=True,
+                                                           size=struct.calcsize(LENGTH_FORMAT))
+        struct.pack_into(LENGTH_FORMAT, self._version_segment.buf, 0, 0)
+        self._segment = None
+
+    def publish(self, catalogs):
+        """Write a new version of the catalogs and make it the current one.
+
+        Args:
+            catalogs (dict): EmbeddingTable or CompactEmbeddings objects by name
+
+        Returns:
+            int: The new version number
+        """
+        np = load_numpy()
+        version = self.version + 1
+        layout = {}
+        arrays = []
+        offset = 0
+        for catalog_name, catalog in catalogs.items():
+            metadata, catalog_arrays = catalog.to_arrays()
+            kind = next(kind for kind, cls in CATALOG_TYPES.items() if isinstance(catalog, cls))
+            entry = layout[catalog_name] = {"type": kind, "metadata": metadata, "arrays": {}}
+            for array_name, array in catalog_arrays.items():
+                array = np.ascontiguousarray(array)
+                entry["arrays"][array_name] = [offset, array.dtype.str, list(array.shape)]
+                arrays.append((offset, array))
+                offset = _aligned(offset + array.nbytes)
+
+        header = json.dumps({"format": FORMAT_VERSION, "version": version, "catalogs": layout},
+                            separators=(",", ":")).encode("utf-8")
+        data_start = _aligned(struct.calcsize(LENGTH_FORMAT) + len(header))
+        segment = shared_memory.SharedMemory(f"{self.name}.{version}", create=True,
+                                             size=max(1, data_start + offset))
+        struct.pack_into(LENGTH_FORMAT, segment.buf, 0, len(header))
+        segment.buf[struct.calcsize(LENGTH_FORMAT):struct.calcsize(LENGTH_FORMAT) + len(header)] = header
+        for array_offset, array in arrays:
+            start = data_start + array_offset
+            segment.buf[start:start + array.nbytes] = array.reshape(-1).view(np.uint8)
+
+        # Only announce the segment once it is complete
+        struct.pack_into(LENGTH_FORMAT, self._version_segment.buf, 0, version)
+        previous, self._segment, self.version = self._segment, segment, version
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+        return version
+
+    def close(self):
+        """Remove every segment; attached workers keep what they already map."""
+        for segment in (self._segment, self._version_segment):
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self._segment = self._version_segment = None
+
+
+class SharedCatalog:
+    """A worker's read-only view of the current version of published catalogs."""
+
+    def __init__(self, name):
+        """
+        Attach to the catalogs published under a name.
+
+        Args:
+            name (str): Name given to CatalogPublisher
+
+        Raises:
+            FileNotFoundError: If nothing was published under the name
+        """
+        self.name = name
+        self.version = 0
+        self.catalogs = {}
+        self._retired = []  # Earlier segments, closed once nothing uses their catalogs
+        self._version_segment = _attach(name)
+        if not self.refresh():
+            raise FileNotFoundError(f"No catalogs published as {name!r}")
+
+    def refresh(self):
+        """Switch to the latest published version if there is a newer one.
+
+        If the announced segment is gone and no newer version replaced it
+        (the publisher closed or crashed), the current catalogs are kept.
+
+        Returns:
+            bool: True if the catalogs changed
+        """
+        version = _read_version(self._version_segment)
+        while version != self.version:
+            try:
+                segment = _attach(f"{self.name}.{version}")
+            except FileNotFoundError:
+                # Retry only if a newer version replaced it in the meantime
+                latest = _read_version(self._version_segment)
+                if latest == version:
+                    return False
+                version = latest
+                continue
+            self.catalogs, self.version = self._read(segment), version
+            self._retired.append(segment)
+            self._release()
+            return True
+        return False
+
+    def close(self):
+        """Drop the catalogs and detach from every segment no longer in use."""
+        self.catalogs = {}
+        self.version = 0
+        self._release(keep_current=False)
+        if self._version_segment is not None:
+            self._version_segment.close()
+            self._version_segment = None
+
+    def _release(self, keep_current=True):
+        """Close earlier segments whose catalogs are no longer referenced anywhere."""
+        current = self._retired[-1:] if keep_current else []
+        still_used = []
+        for segment in self._retired[:len(self._retired) - len(current)]:
+            try:
+                segment.close()
+            except BufferError:  # Some catalog built on it is still alive
+                still_used.append(segment)
+        self._retired = still_used + current
+
+    def _read(self, segment):
+        """Return the catalogs stored in a segment, as read-only views of it."""
+        np = load_numpy()
+        length = struct.unpack_from(LENGTH_FORMAT, segment.buf, 0)[0]
+        start = struct.calcsize(LENGTH_FORMAT)
+        header = json.loads(bytes(segment.buf[start:start + length]).decode("utf-8"))
+        if header["format"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported shared catalog format: {header['format']}")
+        data_start = _aligned(start + length)
+        catalogs = {}
+        for catalog_name, entry in header["catalogs"].items():
+            arrays = {}
+            for array_name, (offset, dtype, shape) in entry["arrays"].items():
+                array = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=data_start + offset)
+                array.flags.writeable = False
+                arrays[array_name] = array
+            catalogs[catalog_name] = CATALOG_TYPES[entry["type"]].from_arrays(entry["metadata"], arrays)
+        return catalogs
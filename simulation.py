@@ -0,0 +1,239 @@
+"""
+NPC simulation for 'The Line: A Border Journey'
+
+This module advances non-player characters each turn: migrants walk
+north and consume their supplies, patrol agents hold their ground in
+proportion to the patrol intensity of where they stand and detain the
+migrants they run into, and everyone else drifts between locations.
+A per-location occupancy index keeps encounter checks and location
+descriptions independent of the total number of NPCs in the world.
+"""
+
+import random
+import time
+from location import Desert, Border, Settlement
+
+
+class OccupancyIndex:
+    """Tracks which NPCs are at each location, grouped by role."""
+
+    ROLES = ("migrant", "patrol", "local")
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # location -> {role: {npc: None}} (insertion ordered sets)
+        self._occupants = {}
+
+    def _roles_at(self, location):
+        roles = self._occupants.get(location)
+        if roles is None:
+            roles = self._occupants[location] = {role: {} for role in self.ROLES}
+        return roles
+
+    def add(self, npc, location):
+        """Record an NPC at a location."""
+        self._roles_at(location)[npc.role][npc] = None
+
+    def remove(self, npc, location):
+        """Forget an NPC at a location."""
+        roles = self._occupants.get(location)
+        if roles is not None:
+            roles[npc.role].pop(npc, None)
+
+    def move(self, npc, old_location, new_location):
+        """Move an NPC between two locations."""
+        self.remove(npc, old_location)
+        self.add(npc, new_location)
+
+    def occupants(self, location, role=None):
+        """Iterate the NPCs at a location, optionally filtered by role."""
+        roles = self._occupants.get(location)
+        if roles is None:
+            return iter(())
+        if role is None:
+            return (npc for group in roles.values() for npc in group)
+        return iter(roles[role])
+
+    def count(self, location, role=None):
+        """Return how many NPCs (of a role) are at a location."""
+        roles = self._occupants.get(location)
+        if roles is None:
+            return 0
+        if role is None:
+            return sum(len(group) for group in roles.values())
+        return len(roles[role])
+
+    def first(self, location, role):
+        """Return one NPC of a role at a location, or None."""
+        return next(self.occupants(location, role), None)
+
+
+class NPCSimulation:
+    """Advances every NPC in the world by one step per game turn."""
+
+    def __init__(self, world, detention_center=None, budget=0.02):
+        """
+        Initialize the simulation.
+
+        Args:
+            world (dict): Dictionary of location objects
+            detention_center: Location where detained migrants are sent
+            budget (float): Seconds of simulation allowed per tick; NPCs
+                not reached within the budget are resumed on the next tick
+        """
+        self.world = world
+        self.detention_center = detention_center
+        self.budget = budget
+        self.index = OccupancyIndex()
+        self.npcs = []
+        self._cursor = 0
+        self.ticks = 0
+        self.last_tick_processed = 0
+
+    def add_npc(self, npc, location=None):
+        """Add an NPC to the simulation at its location (or the one given)."""
+        if location is not None and npc.location is not location:
+            location.add_character(npc)
+        self.npcs.append(npc)
+        self.index.add(npc, npc.location)
+
+    def remove_npc(self, npc):
+        """Take an NPC out of the world entirely (e.g. after death)."""
+        location = npc.location
+        if location is not None:
+            self.index.remove(npc, location)
+            location.remove_character(npc)
+        npc.set_flag("removed", True)
+
+    def tick(self, watch=None, budget=None, limit=None):
+        """Advance the simulation within the per-tick time budget.
+
+        Args:
+            watch: Location whose arrivals and departures should be reported
+            budget (float): Override of the per-tick time budget in seconds
+            limit (int): Process exactly this many NPCs, ignoring the budget
+                (used to replay a recorded tick)
+
+        Returns:
+            list: Messages about NPC activity at the watched location
+        """
+        budget = self.budget if budget is None else budget
+        deadline = time.perf_counter() + budget if limit is None else float("inf")
+        messages = []
+        processed = 0
+        total = len(self.npcs) if limit is None else limit
+
+        while processed < total:
+            if self._cursor >= len(self.npcs):
+                self._cursor = 0
+                self._compact()
+                total = min(total, len(self.npcs))
+                if not self.npcs:
+                    break
+            npc = self.npcs[self._cursor]
+            self._cursor += 1
+            processed += 1
+            if not npc.has_flag("removed"):
+                self.step(npc, watch, messages)
+            # Checking the clock every NPC costs more than the step itself
+            if processed % 64 == 0 and time.perf_counter() >= deadline:
+                break
+
+        self.ticks += 1
+        self.last_tick_processed = processed
+        return messages
+
+    def _compact(self):
+        """Drop removed NPCs once per full pass."""
+        self.npcs = [npc for npc in self.npcs if not npc.has_flag("removed")]
+
+    def step(self, npc, watch=None, messages=None):
+        """Advance a single NPC by one turn."""
+        if npc.role == "migrant":
+            self._step_migrant(npc, watch, messages)
+        elif npc.role == "patrol":
+            self._step_patrol(npc, watch, messages)
+        else:
+            if random.random() < 0.1:
+                self._wander(npc, watch, messages)
+
+    def _step_migrant(self, npc, watch, messages):
+        if npc.has_flag("detained"):
+            return
+        location = npc.location
+        water, food = 5, 5
+        if isinstance(location, Desert):
+            water += location.water_scarcity // 2
+            food += 2
+        elif isinstance(location, Settlement) and location.has_service("food"):
+            food = max(0, food - 3)
+        npc.consume_resources(water, food)
+
+        if npc.health <= 0:
+            if messages is not None and location is watch:
+                messages.append(f"{npc.name} collapses and does not get up again.")
+            self.remove_npc(npc)
+            return
+
+        if random.random() < 0.3:
+            self._wander(npc, watch, messages, prefer="north")
+
+    def _step_patrol(self, npc, watch, messages):
+        location = npc.location
+        water, food = 3, 3
+        if isinstance(location, Desert):
+            water += location.water_scarcity // 3
+            food += 1
+        npc.consume_resources(water, food)
+
+        intensity = location.patrol_intensity if isinstance(location, Border) else 0
+        if intensity and location is not self.detention_center:
+            if random.randint(1, 100) <= location.encounter_chance():
+                migrant = self.index.first(location, "migrant")
+                if migrant is not None and not migrant.has_flag("detained"):
+                    self._detain(npc, migrant, watch, messages)
+
+        # Agents hold high-intensity posts and roam away from quiet ones
+        if random.random() >= intensity / 10:
+            self._wander(npc, watch, messages, prefer_type=Border)
+
+    def _detain(self, agent, migrant, watch, messages):
+        report = agent.encounter_migrant(migrant, "detain")
+        if messages is not None and migrant.location is watch:
+            messages.append(report)
+        if self.detention_center is not None:
+            self._relocate(migrant, self.detention_center, None, watch, messages)
+        migrant.set_flag("detained", True)
+
+    def _wander(self, npc, watch, messages, prefer=None, prefer_type=None):
+        connections = npc.location.connections if npc.location else None
+        if not connections:
+            return
+        if prefer in connections:
+            direction = prefer
+        else:
+            options = list(connections)
+            if prefer_type is not None:
+                preferred = [d for d in options if isinstance(connections[d], prefer_type)]
+                options = preferred or options
+            direction = random.choice(options)
+        destination = connections[direction]
+        if destination is self.detention_center:
+            return
+        self._relocate(npc, destination, direction, watch, messages)
+
+    def _relocate(self, npc, destination, direction, watch, messages):
+        origin = npc.location
+        self.index.move(npc, origin, destination)
+        origin.remove_character(npc)
+        destination.add_character(npc)
+
+        if messages is None or watch is None:
+            return
+        if origin is watch:
+            if direction:
+                messages.append(f"{npc.name} leaves heading {direction}.")
+            else:
+                messages.append(f"{npc.name} is taken away.")
+        elif destination is watch:
+            messages.append(f"{npc.name} arrives.")
@@ -0,0 +1,93 @@
+"""
+Mergeable summaries for 'The Line: A Border Journey'
+
+This module provides small, fixed-memory aggregates that can be built
+independently (per log file, per worker process, per profiling run) and
+merged afterwards without losing accuracy guarantees.
+"""
+
+import math
+
+
+class QuantileSketch:
+    """Quantile estimates with bounded relative error over positive values.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so any
+    quantile is returned within `relative_accuracy` of the true value,
+    memory grows with the log of the value range rather than the number
+    of values, and two sketches merge by adding bucket counts.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma_log", "buckets", "zeros",
+                 "count", "total", "minimum", "maximum")
+
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy (float): Maximum relative error of quantiles
+        """
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self.buckets = {}  # bucket index -> count
+        self.zeros = 0     # values <= 0, reported as 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value, count=1):
+        """Add a value (count times)."""
+        self.count += count
+        self.total += value * count
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if value <= 0:
+            self.zeros += count
+            return
+        index = math.ceil(math.log(value) / self._gamma_log)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def merge(self, other):
+        """Add the contents of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def quantile(self, q):
+        """Return the estimated value at quantile q (0-1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms
+                value = 2 * math.exp(index * self._gamma_log) / (1 + math.exp(self._gamma_log))
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    def mean(self):
+        """Return the mean of the values added, or None if empty."""
+        return self.total / self.count if self.count else None
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)):
+        """Return count, mean and the requested quantiles as a dict."""
+        result = {"count": self.count, "mean": self.mean()}
+        for q in quantiles:
+            result[f"p{round(q * 100):g}"] = self.quantile(q)
+        return result
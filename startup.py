@@ -0,0 +1,88 @@
+"""
+Startup profiling for 'The Line: A Border Journey'
+
+This module measures how long the game takes to become interactive:
+the time spent importing each module and the time until the first
+input prompt is shown. It is installed by `main.py --startup-profile`
+before any game module is imported and only depends on the standard
+library so that it does not distort what it measures.
+"""
+
+import builtins
+import sys
+import time
+
+
+class StartupProfiler:
+    """Records per-module import times and the time to the first prompt."""
+
+    def __init__(self, stream=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            stream: Where the report is written (default: sys.stderr)
+        """
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.imports = {}  # module name -> (inclusive seconds, self seconds)
+        self.first_prompt = None
+        self._stack = []
+        self._original_import = None
+        self._original_input = None
+
+    def install(self):
+        """Start timing imports and watching for the first prompt."""
+        self._original_import = builtins.__import__
+        self._original_input = builtins.input
+        builtins.__import__ = self._timed_import
+        builtins.input = self._timed_input
+        return self
+
+    def uninstall(self):
+        """Restore the original import and input functions."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            builtins.input = self._original_input
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only imports that actually load a module are worth timing
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports[name] = (elapsed, elapsed - children)
+
+    def _timed_input(self, prompt=""):
+        if self.first_prompt is None:
+            self.first_prompt = time.perf_counter() - self.start
+            self.report()
+            raise SystemExit(0)
+        return self._original_input(prompt)
+
+    def report(self, limit=20):
+        """Write the import table and time to first prompt."""
+        stream = self.stream or sys.stderr
+        total_import = sum(self_time for _, self_time in self.imports.values())
+        rows = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+
+        stream.write("\nSTARTUP PROFILE\n")
+        stream.write("===============\n")
+        stream.write(f"{'module':<28}{'inclusive ms':>14}{'self ms':>10}\n")
+        for name, (inclusive, self_time) in rows[:limit]:
+            stream.write(f"{name:<28}{inclusive * 1000:>14.2f}{self_time * 1000:>10.2f}\n")
+        if len(rows) > limit:
+            stream.write(f"... {len(rows) - limit} more modules\n")
+        stream.write(f"\nTotal import time:    {total_import * 1000:.2f} ms\n")
+        if self.first_prompt is not None:
+            stream.write(f"Time to first prompt: {self.first_prompt * 1000:.2f} ms\n")
+        stream.flush()
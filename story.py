@@ -5,10 +5,10 @@ This module handles the narrative elements, player interactions,
 and storytelling aspects of the game.
 """
 
-import time
 import os
 import sys
 import random
+import render
 
 
 class Story:
@@ -98,6 +98,9 @@ class Story:
             ]
         }
 
+        # Memoized thematic quotes {(location type, name): quotes}
+        self._location_quotes = {}
+
         # Journey stats (Similar to health levels in a game)
         self.journey_stats = {
             "distance_traveled": 0,
@@ -111,10 +114,7 @@ class Story:
         os.system('cls' if os.name == 'nt' else "clear")
     
     def print_slow(self, text, delay=0.03):
-        for char in text:
-            print(char, end='', flush=True)
-            time.sleep(delay)
-        print()
+        render.print_slow(text, delay)
     
     def display_intro(self, starting_location):
         """Display the game introduction."""
@@ -182,7 +182,7 @@ class Story:
         print("EPILOGUE")
         print("========\n")
         
-        if ending_type == "success" and hasattr(player, 'origin'):
+        if ending_type == "success" and player.role == "migrant":
             epilogue = """
             You've made it to Tucson, but your journey is far from over. Like many migrants
             who cross the border, you now face the challenges of building a life in a new country.
@@ -325,45 +325,71 @@ class Story:
         self.print_slow(f"\nA haunting moment sears itself into your memory:\n{event}")
         return event
     
+    # Thematic quotes per location type, shared by every Story instance
+    DESERT_QUOTES = (
+        "The desert stretches endlessly, a vast graveyard of dreams and desperation.",
+        "The sun beats down like judgment from above, while the sand below holds countless untold stories.",
+        "Between the saguaros, you glimpse remnants of others' journeys - a child's shoe, a tattered backpack, a rosary.",
+        "The wind whispers names of those who never made it, their hopes scattered among sun-bleached bones.",
+        "Even the cacti seem to weep here, their shadows stretching like mourners across the sand."
+    )
+    BORDER_QUOTES = (
+        "The wall rises like an iron curtain, dividing not just land, but dreams, families, and futures.",
+        "Surveillance cameras stare with unblinking eyes, while sensors pulse beneath the ground like a mechanical heartbeat.",
+        "The air thrums with tension - helicopter rotors above, desperate prayers below.",
+        "Here, policy meets humanity in a clash of steel and flesh, law and desperation.",
+        "Every footprint in the dust tells a story of choice - to cross, to turn back, to enforce, to defy."
+    )
+    SETTLEMENT_QUOTES = (
+        "The community lives and breathes the border, its rhythms shaped by the ebb and flow of crossings.",
+        "In every face you see the weight of choice - to help, to hinder, to look away.",
+        "Children play in the shadow of the wall, their laughter a defiant song against the barrier's silence.",
+        "The streets hold secrets: safe houses marked with subtle signs, routes whispered in hushed tones.",
+        "Even the church bells sound different here, their toll a reminder of lives interrupted, journeys unfinished."
+    )
+    GENERIC_QUOTES = (
+        "{name} pulses with the heartbeat of the borderlands, each moment pregnant with possibility and peril.",
+        "The border's gravity pulls at everything here, bending lives like light through a prism.",
+        "Time feels different in this place, stretched taut between before and after, between here and there.",
+        "The air itself carries stories - of courage and fear, of mercy and indifference, of hope and despair.",
+        "In every shadow lurks a choice, in every choice, a story waiting to be told."
+    )
+    
     def get_location_description(self, location_type, name):
-        """Get additional thematic description for a location type."""
-        from location import Desert, Border, Settlement
+        """Get additional thematic description for a location type.
         
-        if isinstance(location_type, Desert):
-            return [
-                "The desert stretches endlessly, a vast graveyard of dreams and desperation.",
-                "The sun beats down like judgment from above, while the sand below holds countless untold stories.",
-                "Between the saguaros, you glimpse remnants of others' journeys - a child's shoe, a tattered backpack, a rosary.",
-                "The wind whispers names of those who never made it, their hopes scattered among sun-bleached bones.",
-                "Even the cacti seem to weep here, their shadows stretching like mourners across the sand."
-            ]
+        interact('look') passes the location's class. Before classes were
+        accepted, every location got the generic quotes; deserts, border
+        crossings and settlements now get their own.
         
-        elif isinstance(location_type, Border):
-            return [
-                "The wall rises like an iron curtain, dividing not just land, but dreams, families, and futures.",
-                "Surveillance cameras stare with unblinking eyes, while sensors pulse beneath the ground like a mechanical heartbeat.",
-                "The air thrums with tension - helicopter rotors above, desperate prayers below.",
-                "Here, policy meets humanity in a clash of steel and flesh, law and desperation.",
-                "Every footprint in the dust tells a story of choice - to cross, to turn back, to enforce, to defy."
-            ]
+        Args:
+            location_type: A location, or its class
+            name (str): Name of the location
+            
+        Returns:
+            tuple: Thematic quotes (memoized per location type and name)
+        """
+        from location import Desert, Border, Settlement
         
-        elif isinstance(location_type, Settlement):
-            return [
-                "The community lives and breathes the border, its rhythms shaped by the ebb and flow of crossings.",
-                "In every face you see the weight of choice - to help, to hinder, to look away.",
-                "Children play in the shadow of the wall, their laughter a defiant song against the barrier's silence.",
-                "The streets hold secrets: safe houses marked with subtle signs, routes whispered in hushed tones.",
-                "Even the church bells sound different here, their toll a reminder of lives interrupted, journeys unfinished."
-            ]
+        if not isinstance(location_type, type):
+            location_type = type(location_type)
         
+        key = (location_type, name)
+        quotes = self._location_quotes.get(key)
+        if quotes is not None:
+            return quotes
+        
+        if issubclass(location_type, Desert):
+            quotes = self.DESERT_QUOTES
+        elif issubclass(location_type, Border):
+            quotes = self.BORDER_QUOTES
+        elif issubclass(location_type, Settlement):
+            quotes = self.SETTLEMENT_QUOTES
         else:
-            return [
-                f"{name} pulses with the heartbeat of the borderlands, each moment pregnant with possibility and peril.",
-                "The border's gravity pulls at everything here, bending lives like light through a prism.",
-                "Time feels different in this place, stretched taut between before and after, between here and there.",
-                "The air itself carries stories - of courage and fear, of mercy and indifference, of hope and despair.",
-                "In every shadow lurks a choice, in every choice, a story waiting to be told."
-            ]
+            quotes = tuple(quote.format(name=name) for quote in self.GENERIC_QUOTES)
+        
+        self._location_quotes[key] = quotes
+        return quotes
     
     def trigger_random_event(self, player_type):
         """Trigger a random event based on player type."""
@@ -407,7 +433,7 @@ class Story:
             print()
         
         # Character-specific summary
-        if hasattr(player, 'origin'):  # Migrant
+        if player.role == "migrant":
             print(f"You began your journey in {player.origin}, carrying dreams of a better life.")
             if player.hope > 70:
                 print("Despite the hardships, your spirit remains unbroken.")
@@ -434,6 +460,6 @@ class Story:
         """Handle graceful exit from the game with journey summary."""
         self.clear_screen()
         print("Preparing your journey summary...\n")
-        time.sleep(1)
+        render.pause(1)
         self.display_journey_summary(player)
         sys.exit(0)
\ No newline at end of file
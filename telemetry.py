@@ -0,0 +1,138 @@
+"""
+Telemetry for 'The Line: A Border Journey'
+
+This module writes structured, append-only session logs. Every record
+is one JSON object per line (JSONL) with a 'type' field:
+
+    session_start  session, role, seed, location
+    turn           session, turn, command, intent, source, score, target,
+                   location, events, choice, deltas, timings
+    session_end    session, role, ending, turns, location, journey_stats
+
+Records are buffered in memory and written in batches, and the file is
+rotated once it grows past a size limit (game.jsonl -> game.jsonl.1 ...).
+When telemetry is off the game uses NULL_TELEMETRY, whose `enabled`
+flag lets the turn loop skip all bookkeeping.
+"""
+
+import json
+import os
+import time
+import uuid
+
+
+# Story.journey_stats counters copied into session_end records
+JOURNEY_STAT_KEYS = ("distance_traveled", "lives_impacted", "moral_choices_made", "trauma_experienced")
+
+# Character stats recorded in turn deltas, with the capability that gates them
+TRACKED_STATS = (
+    ("health", None),
+    ("water", "tracks_supplies"),
+    ("food", "tracks_supplies"),
+    ("hope", "tracks_hope"),
+    ("stress", "tracks_stress"),
+    ("moral_compass", "tracks_morality"),
+    ("money", "carries_money"),
+)
+
+
+def stat_snapshot(character):
+    """Return the tracked stats of a character as a dict."""
+    return {stat: getattr(character, stat) for stat, capability in TRACKED_STATS
+            if capability is None or getattr(character, capability)}
+
+
+def stat_deltas(before, after):
+    """Return the non-zero differences between two stat snapshots."""
+    return {stat: after[stat] - before.get(stat, 0) for stat in after
+            if after[stat] != before.get(stat, 0)}
+
+
+def new_session_id():
+    """Return a unique identifier for a game session."""
+    return uuid.uuid4().hex
+
+
+class TelemetryLog:
+    """Buffered, rotating JSONL writer for session records."""
+
+    enabled = True
+
+    def __init__(self, path, buffer_size=64, max_bytes=64 * 1024 * 1024, backups=5):
+        """
+        Initialize the log.
+
+        Args:
+            path (str): Log file path; appended to if it exists
+            buffer_size (int): Records held in memory before a write
+            max_bytes (int): Rotate once the file reaches this size
+            backups (int): Rotated files to keep (path.1 ... path.N)
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer = []
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def emit(self, record):
+        """Queue a record; it is written once the buffer is full."""
+        if "t" not in record:
+            record["t"] = round(time.time(), 3)
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered records in a single append."""
+        if not self._buffer:
+            return
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in self._buffer)
+        self._buffer.clear()
+        with open(self.path, "a", encoding="utf-8") as log_file:
+            log_file.write(data)
+            size = log_file.tell()
+        if size >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest backup."""
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self):
+        """Flush any pending records."""
+        self.flush()
+
+
+class NullTelemetry:
+    """Telemetry sink used when logging is off; every call is a no-op."""
+
+    enabled = False
+
+    def emit(self, record):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_TELEMETRY = NullTelemetry()
+
+
+def open_telemetry(path=None, **kwargs):
+    """Return a TelemetryLog for a path (or $THE_LINE_TELEMETRY), else NULL_TELEMETRY."""
+    path = path or os.environ.get("THE_LINE_TELEMETRY")
+    if not path:
+        return NULL_TELEMETRY
+    return TelemetryLog(path, **kwargs)
@@ -0,0 +1,11 @@
+"""
+Test configuration for 'The Line: A Border Journey'
+
+This module puts the game modules, which live at the top level of the
+repository, on the import path of the tests.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
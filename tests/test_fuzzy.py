@@ -0,0 +1,95 @@
+"""
+Fuzzy matching tests for 'The Line: A Border Journey'
+
+This module checks the typo budget at each name length, that the trigram
+filter never drops a name within the budget, and how ties are resolved.
+"""
+
+import random
+
+import pytest
+
+from fuzzy import NameIndex, edit_distance, typo_budget
+
+
+NAMES = ["Manuel", "Maria", "Agent Hernandez", "Flashlight", "First Aid Kit", "Water Bottle",
+         "Map", "Radio", "Compass", "Canned Food", "Blanket"]
+
+
+@pytest.fixture
+def index():
+    return NameIndex((name, name) for name in NAMES)
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("", "", 0), ("", "abc", 3), ("manuel", "manuel", 0), ("manul", "manuel", 1),
+    ("flashlite", "flashlight", 3), ("kitten", "sitting", 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b) == distance
+    assert edit_distance(b, a) == distance
+
+
+def test_edit_distance_gives_up_beyond_the_limit():
+    assert edit_distance("kitten", "sitting", limit=3) == 3
+    assert edit_distance("kitten", "sitting", limit=1) > 1
+    assert edit_distance("a", "abcdef", limit=2) > 2
+
+
+@pytest.mark.parametrize("length, budget", [(1, 0), (3, 0), (4, 1), (5, 1), (6, 2), (7, 2), (8, 3), (15, 3)])
+def test_typo_budget_grows_with_length(length, budget):
+    assert typo_budget("x" * length) == budget
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("manuel", "Manuel"),            # Exact, any case
+    ("MANUEL ", "Manuel"),
+    ("manul", "Manuel"),             # 5 letters, 1 typo
+    ("flashlite", "Flashlight"),     # 9 letters, 3 typos
+    ("agent hernandes", "Agent Hernandez"),
+    ("wter botle", "Water Bottle"),
+    ("mpa", None),                   # 3 letters: no typos allowed
+    ("mraio", None),                 # 5 letters, 2 typos: over budget
+    ("flshlte", None),               # 7 letters, 3 typos: over budget
+])
+def test_best_respects_the_typo_budget(index, text, expected):
+    assert index.best(text) == expected
+
+
+def test_match_lists_closest_first_with_distances(index):
+    assert index.match("maria") == [("Maria", 0)]
+    assert index.match("radoi") == []  # A swap is 2 edits, over the budget of 1
+    assert index.match("compas") == [("Compass", 1)]
+
+
+def test_equally_close_names_are_ambiguous():
+    index = NameIndex([("maria", "Maria"), ("marta", "Marta")])
+    assert index.best("marga") is None
+    assert index.best("maria") == "Maria"
+
+
+def test_aliases_resolve_to_their_canonical_name():
+    index = NameIndex([("canteen", "Water Bottle"), ("water bottle", "Water Bottle")])
+    assert index.best("cantene") == "Water Bottle"
+    assert index.match("canteen", k=3) == [("Water Bottle", 0)]
+
+
+def test_trigram_filter_keeps_every_name_within_budget(index):
+    rng = random.Random(0)
+    aliases = [name.lower() for name in NAMES]
+    letters = "abcdefghijklmnopqrstuvwxyz "
+    for _ in range(2000):
+        text = list(rng.choice(aliases))
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randrange(len(text))
+            edit = rng.choice(("insert", "delete", "replace"))
+            if edit == "insert":
+                text.insert(position, rng.choice(letters))
+            elif edit == "delete" and len(text) > 1:
+                del text[position]
+            else:
+                text[position] = rng.choice(letters)
+        text = "".join(text)
+        budget = typo_budget(text)
+        within = {alias for alias in aliases if edit_distance(text, alias) <= budget}
+        assert within <= set(index.candidates(text, budget)), text
@@ -0,0 +1,72 @@
+"""
+Command parsing tests for 'The Line: A Border Journey'
+
+This module checks how compound commands are split into clauses and how
+the keyword parser reads the basic command syntax.
+"""
+
+import pytest
+
+from intents import Intent, may_chain, parse_keywords, split_clauses
+
+
+@pytest.mark.parametrize("command, clauses", [
+    # Periods inside words and abbreviations do not end a clause
+    ("use i.d. papers", ["use i.d. papers"]),
+    ("talk to mr. jones", ["talk to mr. jones"]),
+    ("use i.d. papers. go north", ["use i.d. papers", "go north"]),
+    ("look.", ["look"]),
+    # "and" only splits before an action verb
+    ("health and stats", ["health and stats"]),
+    ("check health and stats then look", ["check health and stats", "look"]),
+    ("talk to manuel and maria", ["talk to manuel and maria"]),
+    ("take map and use map", ["take map", "use map"]),
+    ("take water and then drink it", ["take water", "drink it"]),
+    # Explicit separators always split
+    ("look;status", ["look", "status"]),
+    ("go north then west", ["go north", "west"]),
+    ("look. then go north", ["look", "go north"]),
+])
+def test_split_clauses(command, clauses):
+    assert split_clauses(command) == clauses
+
+
+@pytest.mark.parametrize("command, clauses", [
+    ("go north, please", ["go north"]),
+    ("take map and please", ["take map"]),
+    ("read the map. thanks", ["read the map"]),
+    ("look, then status, ok", ["look", "status"]),
+])
+def test_trailing_filler_clauses_are_dropped(command, clauses):
+    assert split_clauses(command) == clauses
+
+
+def test_a_command_that_is_only_filler_is_kept():
+    assert split_clauses("please") == ["please"]
+    assert split_clauses("thanks.") == ["thanks."]
+
+
+@pytest.mark.parametrize("command", [
+    "look", "go north", "take water bottle", "talk to manuel", "take map please", "dance wildly",
+])
+def test_commands_that_cannot_chain_are_left_whole(command):
+    assert not may_chain(command)
+    assert split_clauses(command) == [command]
+
+
+@pytest.mark.parametrize("command, expected", [
+    ("look", Intent("look")),
+    ("examine", Intent("look")),
+    ("inventory", Intent("status")),
+    ("exit", Intent("quit")),
+    ("n", Intent("move", "north")),
+    ("go west", Intent("move", "west")),
+    ("head north", None),
+    ("take water bottle", Intent("take", "water bottle")),
+    ("get map", Intent("take", "map")),
+    ("use service food", Intent("use_service", "food")),
+    ("use", None),
+    ("dance wildly", None),
+])
+def test_parse_keywords(command, expected):
+    assert parse_keywords(command) == expected
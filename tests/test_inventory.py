@@ -0,0 +1,98 @@
+"""
+Inventory tests for 'The Line: A Border Journey'
+
+This module checks how consumable charges are spent and how player text
+is resolved to held items through names, word prefixes and aliases.
+"""
+
+from inventory import Inventory
+
+
+def test_consumables_take_their_charges_from_the_registry():
+    inventory = Inventory(["Water Bottle", "Blanket"])
+    assert inventory.charges("Water Bottle") == 2
+    assert inventory.charges("Blanket") is None
+    assert inventory.charges("Compass") is None
+
+
+def test_a_unit_is_used_up_by_its_last_charge():
+    inventory = Inventory()
+    inventory.add("Water Bottle", 2)
+
+    assert inventory.use_charge("Water Bottle") is False
+    assert (inventory.count("Water Bottle"), inventory.charges("Water Bottle")) == (2, 1)
+
+    assert inventory.use_charge("Water Bottle") is True
+    # The next unit is opened with full charges
+    assert (inventory.count("Water Bottle"), inventory.charges("Water Bottle")) == (1, 2)
+
+
+def test_using_up_the_last_unit_removes_the_item_and_its_prefixes():
+    inventory = Inventory(["Canned Food"])
+    assert inventory.resolve("can") == "Canned Food"
+
+    assert inventory.use_charge("Canned Food") is True
+    assert "Canned Food" not in inventory
+    assert len(inventory) == 0
+    assert inventory.resolve("can") is None
+    assert inventory.resolve("food") is None
+
+
+def test_items_without_charges_are_never_used_up():
+    inventory = Inventory(["Compass"])
+    assert inventory.use_charge("Compass") is False
+    assert inventory.use_charge("Flashlight") is False
+    assert inventory.count("Compass") == 1
+
+
+def test_removing_units_keeps_the_open_unit_charges():
+    inventory = Inventory()
+    inventory.add("First Aid Kit", 2)
+    inventory.use_charge("First Aid Kit")
+
+    assert inventory.remove("First Aid Kit") is True
+    assert (inventory.count("First Aid Kit"), inventory.charges("First Aid Kit")) == (1, 1)
+    assert inventory.remove("First Aid Kit", 2) is False
+    assert inventory.display() == "First Aid Kit (1/2 uses left)"
+
+
+def test_explicit_charges_override_the_registry():
+    inventory = Inventory()
+    inventory.add("Water Bottle", charges=3)
+    inventory.use_charge("Water Bottle")
+    assert inventory.display() == "Water Bottle (2/3 uses left)"
+
+
+def test_resolve_exact_names_ignoring_case_and_spacing():
+    inventory = Inventory(["Water Bottle", "ID Papers"])
+    assert inventory.resolve("  WATER   bottle ") == "Water Bottle"
+    assert inventory.resolve("id papers") == "ID Papers"
+
+
+def test_resolve_prefixes_of_the_name_and_of_later_words():
+    inventory = Inventory(["Water Bottle", "First Aid Kit"])
+    assert inventory.resolve("wat") == "Water Bottle"
+    assert inventory.resolve("bottle") == "Water Bottle"
+    assert inventory.resolve("first aid") == "First Aid Kit"
+    assert inventory.resolve("aid") == "First Aid Kit"
+    assert inventory.resolve("kit") == "First Aid Kit"
+
+
+def test_resolve_registered_aliases_of_held_items():
+    inventory = Inventory(["Water Bottle"])
+    assert inventory.resolve("canteen") == "Water Bottle"
+    # An alias only resolves to an item that is held
+    assert inventory.resolve("medkit") is None
+
+
+def test_shared_prefix_resolves_to_the_earliest_held_item():
+    inventory = Inventory(["Compass", "Canned Food"])
+    assert inventory.resolve("c") == "Compass"
+    inventory.remove("Compass")
+    assert inventory.resolve("c") == "Canned Food"
+
+
+def test_resolve_unknown_text():
+    assert Inventory().resolve("water") is None
+    assert Inventory(["Map"]).resolve("radio") is None
+    assert Inventory(["Map"]).resolve("mapx") is None
@@ -0,0 +1,142 @@
+"""
+Rule engine tests for 'The Line: A Border Journey'
+
+This module checks which events RuleEngine offers, in which order, and
+that a flag change only re-evaluates the rules indexed under that flag.
+"""
+
+import pytest
+
+from character import Character, Migrant
+from events import Event
+from location import Border, Desert
+from rules import Rule, RuleEngine
+
+
+class CountingRule(Rule):
+    """Rule that records every flag it is asked to check."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checked = []
+
+    def flag_met(self, character, flag_name):
+        self.checked.append(flag_name)
+        return super().flag_met(character, flag_name)
+
+
+@pytest.fixture
+def desert():
+    return Desert("Sonoran Desert", "Sand.")
+
+
+@pytest.fixture
+def player():
+    return Character("Ana", "A traveler.")
+
+
+def names(events):
+    return [event.name for event in events]
+
+
+def test_unconditional_rules_fire_in_registration_order(desert, player):
+    engine = RuleEngine()
+    engine.bind(player)
+    for name in ("first", "second", "third"):
+        engine.add_rule(Rule(Event(name, "")), [desert])
+    assert names(engine.eligible_events(desert)) == ["first", "second", "third"]
+
+
+def test_rule_enabled_later_fires_after_the_others(desert, player):
+    engine = RuleEngine()
+    engine.bind(player)
+    engine.add_rule(Rule(Event("gated", ""), flags={"helped": True}), [desert])
+    engine.add_rule(Rule(Event("open", ""), flags={}), [desert])
+    assert names(engine.eligible_events(desert)) == ["open"]
+
+    player.set_flag("helped", True)
+    assert names(engine.eligible_events(desert)) == ["open", "gated"]
+
+    player.set_flag("helped", False)
+    assert names(engine.eligible_events(desert)) == ["open"]
+
+
+def test_every_flag_must_hold_with_its_value(desert, player):
+    engine = RuleEngine()
+    engine.bind(player)
+    engine.add_rule(Rule(Event("both", ""), flags={"helped": True, "reported": False}), [desert])
+    # An unset flag counts as False
+    assert names(engine.eligible_events(desert)) == []
+    player.set_flag("helped", True)
+    assert names(engine.eligible_events(desert)) == ["both"]
+    player.set_flag("reported", True)
+    assert names(engine.eligible_events(desert)) == []
+
+
+def test_flag_change_only_rechecks_rules_indexed_under_it(desert, player):
+    engine = RuleEngine()
+    engine.bind(player)
+    water = engine.add_rule(CountingRule(Event("water", ""), flags={"shared_water": True}), [desert])
+    report = engine.add_rule(CountingRule(Event("report", ""), flags={"reported": True}), [desert])
+    water.checked.clear()
+    report.checked.clear()
+
+    player.set_flag("shared_water", True)
+    assert water.checked == ["shared_water"]
+    assert report.checked == []
+
+    player.set_flag("unrelated", True)
+    assert water.checked == ["shared_water"]
+    assert report.checked == []
+
+
+def test_setting_a_flag_to_its_current_value_rechecks_nothing(desert, player):
+    engine = RuleEngine()
+    player.set_flag("helped", True)
+    engine.bind(player)
+    rule = engine.add_rule(CountingRule(Event("gated", ""), flags={"helped": True}), [desert])
+    rule.checked.clear()
+    player.set_flag("helped", True)
+    assert rule.checked == []
+
+
+def test_bind_rechecks_flags_and_stops_following_the_previous_character(desert, player):
+    engine = RuleEngine()
+    engine.add_rule(Rule(Event("gated", ""), flags={"helped": True}), [desert])
+    other = Character("Bo", "Someone else.")
+    other.set_flag("helped", True)
+
+    engine.bind(player)
+    assert names(engine.eligible_events(desert)) == []
+    engine.bind(other)
+    assert names(engine.eligible_events(desert)) == ["gated"]
+
+    player.set_flag("helped", False)  # No longer observed
+    assert names(engine.eligible_events(desert)) == ["gated"]
+    assert engine.on_flag_changed not in player.flag_observers
+
+
+def test_locations_filter_by_name_and_event_location_types(desert, player):
+    border = Border("Nogales", "A wall.")
+    other_desert = Desert("Cabeza Prieta", "More sand.")
+    engine = RuleEngine()
+    engine.bind(player)
+    engine.add_rule(Rule(Event("anywhere", "")), [desert, border])
+    engine.add_rule(Rule(Event("deserts", "", location_types=[Desert])), [desert, border, other_desert])
+    engine.add_rule(Rule(Event("named", ""), locations=["Cabeza Prieta"]), [desert, other_desert])
+
+    assert names(engine.eligible_events(desert)) == ["anywhere", "deserts"]
+    assert names(engine.eligible_events(border)) == ["anywhere"]
+    assert names(engine.eligible_events(other_desert)) == ["deserts", "named"]
+
+
+def test_stat_ranges_are_checked_when_events_are_picked(desert):
+    migrant = Migrant("Ana", "A traveler.", "Oaxaca", "Work.")
+    engine = RuleEngine()
+    engine.bind(migrant)
+    engine.add_event(Event("thirsty", "", preconditions={"stats": {"water": (None, 30)}}), [desert])
+
+    migrant.water = 80
+    assert engine.pick_event(desert) is None
+    migrant.water = 30
+    assert engine.pick_event(desert).name == "thirsty"
@@ -0,0 +1,359 @@
+"""
+Vector store for 'The Line: A Border Journey'
+
+This module keeps a set of named embedding vectors as one numpy matrix,
+so a query is scored against every entry with a single matrix product
+instead of a Python loop of cosine similarities.
+
+CompactEmbeddings stores a large catalog in a fraction of the memory:
+float16, or int8 with one scale per vector, optionally projected onto
+the catalog's principal directions first. It is a drop-in replacement
+for the {key: vector} dicts of EmbeddingsEngine and is searched without
+expanding the whole catalog back to full precision.
+"""
+
+from collections.abc import MutableMapping
+
+from lazy_imports import load_numpy
+
+
+PRECISIONS = ("float32", "float16", "int8")
+SCAN_BLOCK = 512  # Rows converted to float32 at a time while scoring (stays in cache)
+
+
+class EmbeddingTable:
+    """Named vectors stacked into a matrix for one-shot similarity search."""
+
+    def __init__(self, keys, matrix):
+        """
+        Initialize the table.
+
+        Args:
+            keys (list): Entry keys, one per matrix row
+            matrix (numpy.ndarray): Row vectors; rows are used as given,
+                so unit-length rows give cosine similarities
+        """
+        self.keys = list(keys)
+        self.matrix = matrix
+
+    @classmethod
+    def from_vectors(cls, vectors, dims=None):
+        """Build a table of unit-length rows from {key: vector}.
+
+        Args:
+            vectors (dict): Embedding vectors by key
+            dims (int): Dimensionality to use when vectors is empty
+        """
+        np = load_numpy()
+        keys = list(vectors)
+        if not keys:
+            return cls([], np.zeros((0, dims or 0), dtype=np.float32))
+        matrix = np.asarray([vectors[key] for key in keys], dtype=np.float32)
+        return cls(keys, normalize_rows(matrix))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def to_arrays(self):
+        """Return (metadata, {name: array}) from which from_arrays() rebuilds the table."""
+        return {"keys": self.keys}, {"matrix": self.matrix}
+
+    @classmethod
+    def from_arrays(cls, metadata, arrays):
+        """Rebuild a table around existing arrays (used as they are, not copied)."""
+        return cls(_decode_keys(metadata["keys"]), arrays["matrix"])
+
+    def row(self, key):
+        """Return the row vector stored for a key."""
+        return self.matrix[self.keys.index(key)]
+
+    def scores(self, queries):
+        """Return the similarity of every query vector (one per row) to every row."""
+        np = load_numpy()
+        queries = normalize_rows(np.asarray(queries, dtype=np.float32).reshape(-1, self.matrix.shape[1]))
+        return queries @ self.matrix.T
+
+    def search(self, query, k=1, threshold=None):
+        """Return the k best (key, score) pairs for a query vector, best first.
+
+        Args:
+            query (list): Query vector
+            k (int): Number of results
+            threshold (float): Drop results scoring below this (optional)
+        """
+        return self.search_many([query], k, threshold)[0]
+
+    def search_many(self, queries, k=1, threshold=None):
+        """Search for several query vectors with one matrix product.
+
+        Returns:
+            list: A search() result list per query
+        """
+        np = load_numpy()
+        if not self.keys:
+            return [[] for _ in queries]
+        scores = self.scores(queries)
+        k = min(k, len(self.keys))
+        results = []
+        for row in scores:
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top], kind="stable")]
+            results.append([(self.keys[i], float(row[i])) for i in top
+                            if threshold is None or row[i] >= threshold])
+        return results
+
+
+def _decode_keys(keys):
+    """Turn keys that went through JSON back into hashable keys (lists become tuples)."""
+    return [tuple(key) if isinstance(key, list) else key for key in keys]
+
+
+def normalize_rows(matrix):
+    """Scale every row of a matrix to unit length (zero rows stay zero)."""
+    np = load_numpy()
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class Projection:
+    """Linear map onto the top principal directions of a set of vectors.
+
+    The map is fitted without centering, so dot products between
+    projected unit vectors approximate the original cosine similarities.
+    """
+
+    def __init__(self, components):
+        self.components = components  # (dims, reduced dims)
+
+    @classmethod
+    def fit(cls, matrix, dims, sample=20000, seed=0):
+        """Fit a projection onto dims directions from the rows of matrix."""
+        np = load_numpy()
+        if len(matrix) > sample:
+            matrix = matrix[np.random.default_rng(seed).choice(len(matrix), sample, replace=False)]
+        _, _, right = np.linalg.svd(matrix.astype(np.float32), full_matrices=False)
+        return cls(right[:dims].T.astype(np.float32))
+
+    @property
+    def dims(self):
+        return self.components.shape[1]
+
+    def project(self, matrix):
+        return matrix @ self.components
+
+    def restore(self, matrix):
+        return matrix @ self.components.T
+
+
+class CompactEmbeddings(MutableMapping):
+    """{key: vector} mapping stored as float16 or per-vector-scaled int8 rows."""
+
+    def __init__(self, dims, precision="int8", projection=None):
+        """
+        Initialize an empty mapping.
+
+        Args:
+            dims (int): Dimensionality of the vectors put in
+            precision (str): 'float32', 'float16' or 'int8'
+            projection (Projection): Dimension reduction applied first (optional)
+        """
+        np = load_numpy()
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+        self.dims = dims
+        self.precision = precision
+        self.projection = projection
+        stored_dims = projection.dims if projection else dims
+        # Storage grows geometrically; only the first len(keys) rows are in use
+        self._rows = np.empty((0, stored_dims), dtype=precision)
+        self._scales = np.empty(0, dtype=np.float32)  # Per-row scale (int8 only)
+        self.keys = []
+        self.positions = {}  # key -> row
+
+    @classmethod
+    def from_vectors(cls, vectors, precision="int8", pca_dims=None):
+        """Build a compact copy of {key: vector}.
+
+        Args:
+            vectors (dict): Embedding vectors by key
+            precision (str): 'float32', 'float16' or 'int8'
+            pca_dims (int): Reduce to this many dimensions, fitted on the
+                vectors themselves (only when there are more vectors than that)
+        """
+        np = load_numpy()
+        keys = list(vectors)
+        matrix = np.asarray([vectors[key] for key in keys], dtype=np.float32)
+        dims = matrix.shape[1] if keys else 0
+        matrix = normalize_rows(matrix.reshape(len(keys), dims))
+        projection = None
+        if pca_dims and pca_dims < dims and len(keys) > pca_dims:
+            projection = Projection.fit(matrix, pca_dims)
+        compact = cls(dims, precision, projection)
+        compact._append(keys, matrix)
+        return compact
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    @property
+    def rows(self):
+        """Stored rows in use, one per key."""
+        return self._rows[:len(self.keys)]
+
+    @property
+    def scales(self):
+        """Per-row scales in use (empty unless the precision is int8)."""
+        return self._scales[:len(self.keys)]
+
+    def __getitem__(self, key):
+        """Return the stored vector for a key, expanded back to the original dimensions."""
+        row = self._decode(self.positions[key], self.positions[key] + 1)[0]
+        if self.projection is not None:
+            row = self.projection.restore(row)
+        return row
+
+    def __setitem__(self, key, vector):
+        np = load_numpy()
+        matrix = normalize_rows(np.asarray([vector], dtype=np.float32))
+        if key in self.positions:
+            self._own_rows()
+            row = self.positions[key]
+            encoded, scales = self._encode(matrix)
+            self._rows[row] = encoded[0]
+            if self.precision == "int8":
+                self._scales[row] = scales[0]
+        else:
+            self._append([key], matrix)
+
+    def __delitem__(self, key):
+        self._own_rows()
+        row = self.positions.pop(key)
+        last = len(self.keys) - 1
+        # Move the last row into the gap so storage stays contiguous
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.positions[moved] = row
+            self._rows[row] = self._rows[last]
+            if self.precision == "int8":
+                self._scales[row] = self._scales[last]
+        self.keys.pop()
+
+    def to_arrays(self):
+        """Return (metadata, {name: array}) from which from_arrays() rebuilds the mapping."""
+        arrays = {"rows": self.rows, "scales": self.scales}
+        if self.projection is not None:
+            arrays["components"] = self.projection.components
+        return {"keys": self.keys, "dims": self.dims, "precision": self.precision}, arrays
+
+    @classmethod
+    def from_arrays(cls, metadata, arrays):
+        """Rebuild a mapping around existing arrays (used as they are, not copied).
+
+        Read-only arrays, such as views of shared memory, are copied the
+        first time the mapping is changed.
+        """
+        components = arrays.get("components")
+        compact = cls(metadata["dims"], metadata["precision"],
+                      Projection(components) if components is not None else None)
+        compact.keys = _decode_keys(metadata["keys"])
+        compact.positions = {key: row for row, key in enumerate(compact.keys)}
+        compact._rows = arrays["rows"]
+        compact._scales = arrays["scales"]
+        return compact
+
+    @property
+    def nbytes(self):
+        """Bytes allocated for the stored vectors and scales, including room for inserts."""
+        projection = self.projection.components.nbytes if self.projection else 0
+        return self._rows.nbytes + self._scales.nbytes + projection
+
+    def scores(self, query):
+        """Return the similarity of a query vector to every stored vector."""
+        np = load_numpy()
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        # Normalized before projecting: the reduced query keeps the original scale
+        if self.projection is not None:
+            query = self.projection.project(query)
+        rows = self.rows
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), SCAN_BLOCK):
+            block = rows[start:start + SCAN_BLOCK]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        if self.precision == "int8":
+            scores *= self.scales
+        return scores
+
+    def search(self, query, k=1, threshold=None):
+        """Return the k best (key, score) pairs for a query vector, best first."""
+        np = load_numpy()
+        if not self.keys:
+            return []
+        scores = self.scores(query)
+        k = min(k, len(self.keys))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.keys[i], float(scores[i])) for i in top
+                if threshold is None or scores[i] >= threshold]
+
+    def _own_rows(self):
+        """Copy rows and scales that cannot be written to (shared, read-only views)."""
+        if not self._rows.flags.writeable:
+            self._rows = self._rows.copy()
+        if not self._scales.flags.writeable:
+            self._scales = self._scales.copy()
+
+    def _append(self, keys, matrix):
+        np = load_numpy()
+        encoded, scales = self._encode(matrix)
+        size = len(self.keys)
+        needed = size + len(keys)
+        if needed > len(self._rows):
+            # Doubling keeps n single inserts at O(n) copied rows; a first
+            # batch (from_vectors) gets exactly the room it needs
+            capacity = max(needed, 2 * len(self._rows)) if size else needed
+            grown = np.empty((capacity, self._rows.shape[1]), dtype=self._rows.dtype)
+            grown[:size] = self._rows[:size]
+            self._rows = grown
+            if self.precision == "int8":
+                grown = np.empty(capacity, dtype=np.float32)
+                grown[:size] = self._scales[:size]
+                self._scales = grown
+        else:
+            self._own_rows()
+        self._rows[size:needed] = encoded
+        if self.precision == "int8":
+            self._scales[size:needed] = scales
+        for key in keys:
+            self.positions[key] = len(self.keys)
+            self.keys.append(key)
+
+    def _encode(self, matrix):
+        """Return (stored rows, per-row scales) for unit vectors."""
+        np = load_numpy()
+        if self.projection is not None:
+            matrix = self.projection.project(matrix)
+        if self.precision != "int8":
+            return matrix.astype(self.precision), None
+        scales = np.abs(matrix).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        encoded = np.rint(matrix / scales[:, None]).astype(np.int8)
+        return encoded, scales.astype(np.float32)
+
+    def _decode(self, start, stop):
+        """Return rows start:stop as float32 in the stored dimensions."""
+        np = load_numpy()
+        rows = self._rows[start:stop].astype(np.float32)
+        if self.precision == "int8":
+            rows *= self._scales[start:stop, None]
+        return rows